@@ -48,7 +48,9 @@ resource "aws_ecs_task_definition" "processing" {
       essential = true
       environment = [
         { name = "S3_BUCKET_BRONZE", value = aws_s3_bucket.bronze.bucket },
-        { name = "S3_BUCKET_SILVER", value = aws_s3_bucket.silver.bucket }
+        { name = "S3_BUCKET_SILVER", value = aws_s3_bucket.silver.bucket },
+        { name = "EVENT_SOURCE", value = "sqs" },
+        { name = "SQS_QUEUE_URL", value = aws_sqs_queue.bronze_events.url }
       ]
       logConfiguration = {
         logDriver = "awslogs"
@@ -85,7 +87,11 @@ resource "aws_ecs_task_definition" "frontend" {
       ]
       environment = [
         { name = "S3_BUCKET_BRONZE", value = aws_s3_bucket.bronze.bucket },
-        { name = "S3_BUCKET_SILVER", value = aws_s3_bucket.silver.bucket }
+        { name = "S3_BUCKET_SILVER", value = aws_s3_bucket.silver.bucket },
+        # Start a partir do artefato Gold (1 download) em vez de N JSONs da Silver
+        { name = "S3_BUCKET_GOLD", value = aws_s3_bucket.gold.bucket },
+        { name = "USE_GOLD", value = "true" },
+        { name = "SNAPSHOT_DIR", value = "/tmp/gold" }
       ]
       logConfiguration = {
         logDriver = "awslogs"
@@ -99,3 +105,37 @@ resource "aws_ecs_task_definition" "frontend" {
     }
   ])
 }
+
+# Job Gold: mesma imagem do frontend, roda e morre (agendado pelo EventBridge)
+resource "aws_ecs_task_definition" "gold" {
+  family                   = "arxiv-gold-${var.environment}"
+  requires_compatibilities = ["FARGATE"]
+  network_mode             = "awsvpc"
+  cpu                      = "1024"
+  memory                   = "4096"
+  execution_role_arn       = aws_iam_role.ecs_execution.arn
+  task_role_arn            = aws_iam_role.gold_task.arn # só leitura na Silver e escrita na Gold
+
+  container_definitions = jsonencode([
+    {
+      name      = "gold"
+      image     = "${aws_ecr_repository.frontend.repository_url}:latest"
+      essential = true
+      command   = ["python", "-m", "app.jobs.build_gold"]
+      environment = [
+        { name = "S3_BUCKET_SILVER", value = aws_s3_bucket.silver.bucket },
+        { name = "S3_BUCKET_GOLD", value = aws_s3_bucket.gold.bucket },
+        { name = "INDEX_BACKEND", value = "hnsw" }
+      ]
+      logConfiguration = {
+        logDriver = "awslogs"
+        options = {
+          awslogs-group         = "/ecs/arxiv-gold"
+          awslogs-region        = var.aws_region
+          awslogs-stream-prefix = "ecs"
+          awslogs-create-group  = "true"
+        }
+      }
+    }
+  ])
+}
@@ -35,3 +35,30 @@ resource "aws_scheduler_schedule" "ingestion_daily" {
     mode = "OFF"
   }
 }
+
+resource "aws_scheduler_schedule" "gold_daily" {
+  name = "arxiv-gold-daily-${var.environment}"
+
+  # Depois da ingestão (17h UTC) e do processamento: publica a Gold às 20h UTC
+  schedule_expression = "cron(0 20 ? * MON-FRI *)"
+
+  target {
+    arn      = aws_ecs_cluster.main.arn
+    role_arn = aws_iam_role.eventbridge_role.arn
+
+    ecs_parameters {
+      task_definition_arn = aws_ecs_task_definition.gold.arn
+      launch_type         = "FARGATE"
+
+      network_configuration {
+        assign_public_ip = true
+        subnets          = ["subnet-12345678"] # Placeholder - requer modulo de VPC
+        security_groups  = []
+      }
+    }
+  }
+
+  flexible_time_window {
+    mode = "OFF"
+  }
+}
@@ -39,13 +39,20 @@ resource "aws_iam_policy" "ingestion_s3_policy" {
     Statement = [
       {
         Effect   = "Allow"
-        Action   = ["s3:PutObject", "s3:GetObject", "s3:ListBucket"]
+        Action   = ["s3:PutObject", "s3:GetObject", "s3:ListBucket", "s3:DeleteObject"] # Delete: dead-letter do Processing
         Resource = [
             aws_s3_bucket.bronze.arn,
             "${aws_s3_bucket.bronze.arn}/*",
             aws_s3_bucket.silver.arn,
-            "${aws_s3_bucket.silver.arn}/*"
+            "${aws_s3_bucket.silver.arn}/*",
+            aws_s3_bucket.gold.arn,
+            "${aws_s3_bucket.gold.arn}/*"
         ]
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["sqs:ReceiveMessage", "sqs:DeleteMessage", "sqs:GetQueueAttributes", "sqs:ChangeMessageVisibility"] # Visibility: back-off do retry
+        Resource = [aws_sqs_queue.bronze_events.arn]
       }
     ]
   })
@@ -56,7 +63,47 @@ resource "aws_iam_role_policy_attachment" "ingestion_attach" {
   policy_arn = aws_iam_policy.ingestion_s3_policy.arn
 }
 
-# 3. Role para EventBridge invocar ECS
+# 3. Task Role - Gold (lê a Silver, publica versões na Gold)
+resource "aws_iam_role" "gold_task" {
+  name = "arxiv-gold-task-${var.environment}"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect = "Allow"
+      Principal = { Service = "ecs-tasks.amazonaws.com" }
+      Action = "sts:AssumeRole"
+    }]
+  })
+}
+
+resource "aws_iam_policy" "gold_s3_policy" {
+  name = "arxiv-gold-s3-policy-${var.environment}"
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["s3:GetObject", "s3:ListBucket"]
+        Resource = [aws_s3_bucket.silver.arn, "${aws_s3_bucket.silver.arn}/*"]
+      },
+      {
+        # Get: versão anterior (ponto de partida do delta); sem Delete (versões imutáveis)
+        Effect   = "Allow"
+        Action   = ["s3:PutObject", "s3:GetObject", "s3:ListBucket", "s3:AbortMultipartUpload"]
+        Resource = [aws_s3_bucket.gold.arn, "${aws_s3_bucket.gold.arn}/*"]
+      }
+    ]
+  })
+}
+
+resource "aws_iam_role_policy_attachment" "gold_attach" {
+  role       = aws_iam_role.gold_task.name
+  policy_arn = aws_iam_policy.gold_s3_policy.arn
+}
+
+# 4. Role para EventBridge invocar ECS
 resource "aws_iam_role" "eventbridge_role" {
   name = "arxiv-eventbridge-role-${var.environment}"
 
@@ -79,12 +126,12 @@ resource "aws_iam_policy" "eventbridge_invoke_ecs" {
       {
         Effect = "Allow"
         Action = ["ecs:RunTask"]
-        Resource = [aws_ecs_task_definition.ingestion.arn]
+        Resource = [aws_ecs_task_definition.ingestion.arn, aws_ecs_task_definition.gold.arn]
       },
       {
         Effect = "Allow"
         Action = "iam:PassRole"
-        Resource = [aws_iam_role.ecs_execution.arn, aws_iam_role.ingestion_task.arn]
+        Resource = [aws_iam_role.ecs_execution.arn, aws_iam_role.ingestion_task.arn, aws_iam_role.gold_task.arn]
       }
     ]
   })
@@ -15,3 +15,12 @@ resource "aws_s3_bucket" "silver" {
     Layer = "Silver"
   }
 }
+
+resource "aws_s3_bucket" "gold" {
+  bucket = "arxiv-lake-gold-${var.environment}"
+  force_destroy = true
+
+  tags = {
+    Layer = "Gold"
+  }
+}
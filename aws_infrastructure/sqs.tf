@@ -0,0 +1,36 @@
+# Fila de eventos ObjectCreated do Bronze (consumida pelo Processing em EVENT_SOURCE=sqs)
+resource "aws_sqs_queue" "bronze_events" {
+  name                       = "arxiv-bronze-events-${var.environment}"
+  visibility_timeout_seconds = 300 # Maior que o tempo de um lote de embeddings
+  receive_wait_time_seconds  = 20  # Long polling
+  message_retention_seconds  = 345600
+}
+
+resource "aws_sqs_queue_policy" "bronze_events" {
+  queue_url = aws_sqs_queue.bronze_events.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect    = "Allow"
+      Principal = { Service = "s3.amazonaws.com" }
+      Action    = "sqs:SendMessage"
+      Resource  = aws_sqs_queue.bronze_events.arn
+      Condition = {
+        ArnEquals = { "aws:SourceArn" = aws_s3_bucket.bronze.arn }
+      }
+    }]
+  })
+}
+
+resource "aws_s3_bucket_notification" "bronze_object_created" {
+  bucket = aws_s3_bucket.bronze.id
+
+  queue {
+    queue_arn     = aws_sqs_queue.bronze_events.arn
+    events        = ["s3:ObjectCreated:*"]
+    filter_suffix = ".json"
+  }
+
+  depends_on = [aws_sqs_queue_policy.bronze_events]
+}
@@ -0,0 +1,519 @@
+"""
+Harness de throughput ponta a ponta: ingestão -> processamento -> busca, offline.
+
+Roda os três serviços no mesmo processo, pelo código real de cada um:
+* Ingestão: `IngestionService` + `ArxivScraper` contra páginas geradas a partir
+  da página gravada do arXiv (`fixtures/arxiv_search_page.html`), servidas por
+  um `httpx.MockTransport`; as pausas anti-ban são puladas (e contabilizadas);
+* Processamento: `ProcessingService.process_files` (lotes de EVENT_BATCH_SIZE)
+  com um embedder determinístico por feature hashing (`--model` usa o BERT real);
+* Busca: `SearchEngine.warm_up` (carga da Silver + índices) e buscas pelo
+  caminho normal, com o mesmo embedder nas queries.
+
+O S3 é o moto em memória (`mock_aws`), então nada sai da máquina e o harness
+roda em CI só com CPU. As etapas rodam em sequência, como o pipeline em lote
+(ingestão, depois `process_batch`, depois o start do Frontend). Métricas:
+* `articles_per_minute`: artigos buscáveis por minuto de pipeline completo;
+* `freshness_seconds`: do save no Bronze até o artigo estar buscável (p50/p95/max);
+* `stages`: tempo e throughput de cada etapa, com o detalhamento dos
+  histogramas Prometheus de cada serviço (fetch/parse/save, get/clean/embed/put);
+* `search`: latência das buscas e fração de artigos encontrados pelo próprio resumo.
+
+Uso (da raiz do repositório):
+    python e2e/pipeline_harness.py --articles 2000 --output e2e-report.json
+
+Como o throughput escala quase linearmente com `--articles` nas etapas de
+ingestão e processamento, rodadas em tamanhos crescentes dão a curva para
+dimensionar workers; com `--model` o custo do Transformer entra na conta.
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import importlib
+import json
+import logging
+import os
+import platform
+import re
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from types import ModuleType, SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+from unittest.mock import patch
+import boto3
+import httpx
+import numpy as np
+from bs4 import BeautifulSoup
+from moto import mock_aws
+from prometheus_client import REGISTRY
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SEARCH_PAGE = os.path.join(FIXTURE, "arxiv_search_page.html")
+
+BRONZE, SILVER = "arxiv-bronze", "arxiv-silver"
+FAKE_MODEL_NAME = "e2e-hashing-384"
+
+# Módulos `app*` já importados por serviço: os três serviços usam o pacote
+# `app`, e reimportar registraria as métricas Prometheus duas vezes
+_MODULES: Dict[str, Dict[str, ModuleType]] = {}
+
+
+@contextmanager
+def service_modules(service: str) -> Iterator[None]:
+    """Torna `app` o pacote de `service` (ex.: "processing_service") no bloco."""
+    path = os.path.join(ROOT, service)
+    for name in [n for n in sys.modules if n == "app" or n.startswith("app.")]:
+        del sys.modules[name]
+    sys.modules.update(_MODULES.get(service, {}))
+    sys.path.insert(0, path)
+    try:
+        yield
+    finally:
+        sys.path.remove(path)
+        _MODULES[service] = {
+            name: module
+            for name, module in sys.modules.items()
+            if name == "app" or name.startswith("app.")
+        }
+        for name in _MODULES[service]:
+            del sys.modules[name]
+
+
+@contextmanager
+def overrides(settings, **values) -> Iterator[None]:
+    previous = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+class HashingEmbedder:
+    """
+    Embedder determinístico e barato: bag-of-words com feature hashing.
+
+    Cada token soma ±1 numa das `dim` posições (blake2b do token) e o vetor é
+    normalizado. Textos com as mesmas palavras ficam próximos, então a busca
+    continua significativa sem baixar nem rodar um Transformer.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in re.findall(r"\w+", text.lower()):
+                digest = int.from_bytes(
+                    hashlib.blake2b(token.encode(), digest_size=8).digest(), "little"
+                )
+                vectors[row, digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    # Protocolo do processing_service (EmbedderProtocol)
+    def generate_embedding(self, text: str) -> List[float]:
+        return self.generate_embeddings([text])[0]
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self.embed(texts).tolist()
+
+
+class RecordedArxiv:
+    """
+    Stand-in do arXiv: páginas de busca geradas da página gravada.
+
+    O artigo i reaproveita o HTML do resultado `i % 8` da fixture com um id
+    único e um resumo variado (frase do original + frases sorteadas do
+    conjunto), para que o corpus não seja só cópias exatas.
+    """
+
+    def __init__(self, total: int, seed: int = 42):
+        with open(SEARCH_PAGE, encoding="utf-8") as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+        self.templates = soup.select("li.arxiv-result")
+        self.sentences = [
+            sentence.strip() + "."
+            for item in self.templates
+            for sentence in item.select_one("span.abstract-full")
+            .get_text(" ", strip=True)
+            .split(". ")
+        ]
+        self.total = total
+        self.seed = seed
+        self.requests = 0
+
+    @staticmethod
+    def article_id(i: int) -> str:
+        return f"{2401 + i // 100_000}.{i % 100_000:05d}"
+
+    def render_result(self, i: int) -> str:
+        item = copy.copy(self.templates[i % len(self.templates)])
+        article_id = self.article_id(i)
+        for link in item.select("a[href*='/abs/'], a[href*='/pdf/']"):
+            kind = "abs" if "/abs/" in link["href"] else "pdf"
+            link["href"] = f"https://arxiv.org/{kind}/{article_id}"
+        rng = np.random.default_rng((self.seed, i))
+        abstract = item.select_one("span.abstract-full")
+        first = abstract.get_text(" ", strip=True).split(". ")[0] + "."
+        picked = rng.choice(len(self.sentences), size=3, replace=False)
+        abstract.string = " ".join([first, *(self.sentences[j] for j in picked)])
+        title = item.select_one("p.title")
+        title.string = f"{title.get_text(strip=True)} ({i})"
+        return str(item)
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        start = int(request.url.params.get("start", 0))
+        size = int(request.url.params.get("size", 50))
+        items = "".join(
+            self.render_result(i) for i in range(start, min(start + size, self.total))
+        )
+        return httpx.Response(200, text=f"<ol>{items}</ol>")
+
+
+def percentiles(values: List[float]) -> dict:
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    values = np.asarray(values)
+    return {
+        "p50": round(float(np.percentile(values, 50)), 4),
+        "p95": round(float(np.percentile(values, 95)), 4),
+        "max": round(float(values.max()), 4),
+    }
+
+
+def stage_breakdown(metric: str, stages: List[str], before: dict) -> dict:
+    """Segundos somados por label `stage` desde `before` (histograma Prometheus)."""
+    current = stage_totals(metric, stages)
+    return {stage: round(current[stage] - before[stage], 4) for stage in stages}
+
+
+def stage_totals(metric: str, stages: List[str]) -> dict:
+    return {
+        stage: REGISTRY.get_sample_value(f"{metric}_sum", {"stage": stage}) or 0.0
+        for stage in stages
+    }
+
+
+# Módulos de cada serviço usados pelo harness
+SERVICE_MODULES = {
+    "ingestion_service": [
+        "app.repositories.s3_repository",
+        "app.scrapers.arxiv_scraper",
+        "app.services.ingestion_service",
+    ],
+    "processing_service": [
+        "app.infrastructure.regex_cleaner",
+        "app.infrastructure.s3_repository",
+        "app.services.processor_service",
+    ],
+    "frontend_service": ["app.services.search_engine"],
+}
+
+
+def preload() -> Dict[str, object]:
+    """
+    Importa os serviços antes da medição e devolve o `settings` de cada um.
+
+    torch, transformers e pandas levam segundos para importar; num deploy os
+    serviços já estão de pé quando os artigos chegam, então isso fica de fora.
+    """
+    settings = {}
+    for service, modules in SERVICE_MODULES.items():
+        with service_modules(service):
+            for module in modules:
+                importlib.import_module(module)
+            settings[service] = importlib.import_module("app.core.config").settings
+    return settings
+
+
+def run_ingestion(articles: int, scraped_at: Dict[str, float]) -> dict:
+    with service_modules("ingestion_service"):
+        from app.repositories.s3_repository import S3Repository
+        from app.scrapers import arxiv_scraper
+        from app.services import ingestion_service
+        from app.services.ingestion_service import IngestionService
+        from app.scrapers.arxiv_scraper import ArxivScraper
+
+        arxiv = RecordedArxiv(articles)
+        skipped: List[float] = []
+
+        def client(**kwargs) -> httpx.AsyncClient:
+            return httpx.AsyncClient(
+                transport=httpx.MockTransport(arxiv.handler), **kwargs
+            )
+
+        async def skip_pause(seconds: float) -> None:
+            # Pausa anti-ban: só contabiliza (o arXiv real exigiria esperar)
+            skipped.append(seconds)
+
+        repo = S3Repository()
+        save_json = repo.save_json
+
+        async def save_and_record(key: str, data: dict) -> bool:
+            saved = await save_json(key, data)
+            scraped_at[key.removesuffix(".json")] = time.time()
+            return saved
+
+        repo.save_json = save_and_record
+        stages = ["fetch", "parse", "save"]
+        before = stage_totals("ingestion_stage_seconds", stages)
+        started = time.perf_counter()
+        with patch.object(
+            arxiv_scraper, "httpx", SimpleNamespace(AsyncClient=client)
+        ), patch.object(
+            ingestion_service, "asyncio", SimpleNamespace(sleep=skip_pause)
+        ):
+            asyncio.run(
+                IngestionService(repo, ArxivScraper()).run("e2e", max_results=articles)
+            )
+        seconds = time.perf_counter() - started
+
+    return {
+        "seconds": round(seconds, 4),
+        "articles": len(scraped_at),
+        "articles_per_second": round(len(scraped_at) / seconds, 2),
+        "pages": arxiv.requests,
+        "skipped_pause_seconds": round(sum(skipped), 2),
+        "breakdown": stage_breakdown("ingestion_stage_seconds", stages, before),
+    }
+
+
+def run_processing(embedder, batch_size: Optional[int]) -> dict:
+    with service_modules("processing_service"):
+        from app.core.config import settings
+        from app.infrastructure.regex_cleaner import RegexCleaner
+        from app.infrastructure.s3_repository import S3Repository
+        from app.services.processor_service import ProcessingService
+
+        if embedder is None:
+            from app.infrastructure.bert_embedder import BERTEmbedder
+
+            embedder = BERTEmbedder()  # fora da medição, como no lifespan
+        batch_size = batch_size or settings.EVENT_BATCH_SIZE
+        service = ProcessingService(S3Repository(), RegexCleaner(), embedder)
+        stages = ["get", "clean", "embed", "put"]
+        before = stage_totals("processing_stage_seconds", stages)
+
+        async def drain() -> dict:
+            processed = failed = 0
+            while keys := await service.repo.list_unprocessed_files():
+                progress = 0
+                for start in range(0, len(keys), batch_size):
+                    result = await service.process_files(
+                        keys[start : start + batch_size]
+                    )
+                    progress += result.processed
+                    failed += len(result.failed) + len(result.dead_lettered)
+                processed += progress
+                if not progress:
+                    break  # só restam chaves em back-off
+            return {"processed": processed, "failed": failed}
+
+        started = time.perf_counter()
+        counts = asyncio.run(drain())
+        seconds = time.perf_counter() - started
+
+    return {
+        "seconds": round(seconds, 4),
+        "articles": counts["processed"],
+        "failed": counts["failed"],
+        "articles_per_second": round(counts["processed"] / seconds, 2),
+        "batch_size": batch_size,
+        "breakdown": stage_breakdown("processing_stage_seconds", stages, before),
+    }
+
+
+def run_search(embedder, queries: int, top_k: int, seed: int = 42) -> dict:
+    with service_modules("frontend_service"):
+        from app.core.config import settings
+        from app.services.search_engine import SearchEngine
+
+        with overrides(settings, SNAPSHOT_DIR=None, INDEX_DIR=None, USE_GOLD=False):
+            engine = SearchEngine()
+            # Modelo carregado fora da medição, como no start do serviço
+            if embedder is None:
+                engine.tokenizer, engine.model = engine.load_model()
+            else:
+                engine.tokenizer = SimpleNamespace(do_lower_case=True)
+                engine.model = object()
+                engine.embed_queries = embedder.embed
+
+            started = time.perf_counter()
+            corpus = engine.load_corpus(auto_refresh=False)
+            loaded = time.perf_counter()
+            engine.warm_up(auto_refresh=False)
+            ready = time.perf_counter()
+            searchable_at = time.time()
+
+            snapshot = corpus.snapshot()
+            df = snapshot.df
+            rng = np.random.default_rng(seed)
+            sample = rng.choice(len(df), size=min(queries, len(df)), replace=False)
+            latencies, hits = [], 0
+            for row in sample:
+                t0 = time.perf_counter()
+                results = engine.search(df["summary"].iloc[row], top_k=top_k)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                hits += df["id"].iloc[row] in {r["id"] for r in results}
+
+    return {
+        "seconds": round(ready - started, 4),
+        "rows": len(snapshot),
+        "searchable_at": searchable_at,
+        "ids": df["id"].tolist(),
+        "breakdown": {
+            "load": round(loaded - started, 4),
+            "index": round(ready - loaded, 4),
+        },
+        "queries": len(sample),
+        "latency_ms": percentiles(latencies),
+        "self_hit_rate": round(hits / max(len(sample), 1), 4),
+    }
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def run_pipeline(
+    articles: int = 500,
+    batch_size: Optional[int] = None,
+    queries: int = 100,
+    top_k: int = 5,
+    model: Optional[str] = None,
+    serialization: str = "json",
+) -> dict:
+    """Executa as três etapas sobre um S3 em memória e devolve o relatório."""
+    embedder = None if model else HashingEmbedder()
+    model_name = model or FAKE_MODEL_NAME
+    scraped_at: Dict[str, float] = {}
+
+    env = {
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "AWS_DEFAULT_REGION": "us-east-1",
+    }
+    with patch.dict(os.environ, env), mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        for bucket in (BRONZE, SILVER):
+            s3.create_bucket(Bucket=bucket)
+
+        settings = preload()
+        started = time.perf_counter()
+        # Formato de escrita de Bronze e Silver; os leitores seguem o Content-Type
+        with overrides(
+            settings["ingestion_service"], SERIALIZATION_FORMAT=serialization
+        ):
+            ingestion = run_ingestion(articles, scraped_at)
+        with overrides(
+            settings["processing_service"],
+            MODEL_NAME=model_name,
+            SERIALIZATION_FORMAT=serialization,
+        ):
+            processing = run_processing(embedder, batch_size)
+        with overrides(settings["frontend_service"], MODEL_NAME=model_name):
+            search = run_search(embedder, queries, top_k)
+        total = time.perf_counter() - started
+
+    searchable_at = search.pop("searchable_at")
+    freshness = [searchable_at - scraped_at[i] for i in search.pop("ids")]
+    return {
+        "environment": environment(),
+        "embedder": model_name,
+        "serialization": serialization,
+        "articles": articles,
+        "searchable": search["rows"],
+        "end_to_end_seconds": round(total, 4),
+        "articles_per_minute": round(search["rows"] / total * 60, 1),
+        "freshness_seconds": percentiles(freshness),
+        "stages": {
+            "ingestion": ingestion,
+            "processing": processing,
+            "search": search,
+        },
+    }
+
+
+def print_summary(report: dict) -> None:
+    stages = report["stages"]
+    print(
+        f"{report['searchable']}/{report['articles']} artigos buscáveis em "
+        f"{report['end_to_end_seconds']:.2f}s "
+        f"({report['articles_per_minute']:.0f} artigos/min, {report['embedder']}, "
+        f"{report['serialization']})"
+    )
+    freshness = report["freshness_seconds"]
+    print(f"freshness: p50={freshness['p50']}s p95={freshness['p95']}s")
+    for name, stage in stages.items():
+        breakdown = " ".join(f"{k}={v:.3f}s" for k, v in stage["breakdown"].items())
+        print(f"  {name:<10} {stage['seconds']:>8.3f}s  {breakdown}")
+    print(
+        f"  pausas anti-ban puladas: "
+        f"{stages['ingestion']['skipped_pause_seconds']:.0f}s"
+    )
+    search = stages["search"]
+    print(
+        f"  busca: p50={search['latency_ms']['p50']}ms "
+        f"p95={search['latency_ms']['p95']}ms self_hit={search['self_hit_rate']}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Lote do processamento (padrão: EVENT_BATCH_SIZE)",
+    )
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument(
+        "--model", help="MODEL_NAME real (ex.: sentence-transformers/all-MiniLM-L6-v2)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "msgpack"],
+        default="json",
+        help="SERIALIZATION_FORMAT de Bronze e Silver",
+    )
+    parser.add_argument("--output", help="Arquivo JSON com o relatório completo")
+    parser.add_argument("--verbose", action="store_true", help="Mantém os logs INFO")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        # Os serviços logam cada artigo; no harness isso só custa tempo
+        logging.disable(logging.INFO)
+    report = run_pipeline(
+        args.articles,
+        args.batch_size,
+        args.queries,
+        args.top_k,
+        args.model,
+        args.format,
+    )
+    print_summary(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
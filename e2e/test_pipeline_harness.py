@@ -0,0 +1,46 @@
+from pipeline_harness import HashingEmbedder, RecordedArxiv, run_pipeline
+
+
+def test_recorded_arxiv_pages_have_unique_ids():
+    arxiv = RecordedArxiv(total=20)
+
+    first, second = arxiv.render_result(3), arxiv.render_result(11)
+
+    # Mesmo template (3 % 8 == 11 % 8), ids e resumos diferentes
+    assert RecordedArxiv.article_id(3) in first
+    assert RecordedArxiv.article_id(3) not in second
+    assert first != second
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    embedder = HashingEmbedder()
+
+    a, b = embedder.embed(["quantum error correction", "Quantum error correction"])
+
+    assert a.shape == (384,)
+    assert abs(float(a @ a) - 1.0) < 1e-5
+    assert (a == b).all()
+
+
+def test_pipeline_makes_every_ingested_article_searchable():
+    report = run_pipeline(articles=120, queries=20)
+
+    stages = report["stages"]
+    assert stages["ingestion"]["articles"] == 120
+    assert stages["ingestion"]["pages"] == 3  # 50 + 50 + 20
+    assert stages["processing"]["articles"] == 120
+    assert stages["processing"]["failed"] == 0
+    assert report["searchable"] == 120
+    assert stages["search"]["self_hit_rate"] >= 0.9
+    assert report["articles_per_minute"] > 0
+    assert 0 <= report["freshness_seconds"]["p50"] <= report["end_to_end_seconds"]
+    assert set(stages["processing"]["breakdown"]) == {"get", "clean", "embed", "put"}
+
+
+def test_pipeline_reads_binary_bronze_and_silver():
+    report = run_pipeline(articles=60, queries=10, serialization="msgpack")
+
+    assert report["serialization"] == "msgpack"
+    assert report["stages"]["processing"]["failed"] == 0
+    assert report["searchable"] == 60
+    assert report["stages"]["search"]["self_hit_rate"] >= 0.9
@@ -0,0 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from app.api.routes import router
+from app.core.config import settings
+from app.core.tracing import configure_tracing
+from app.services.query_batcher import QueryBatcher
+from app.services.search_engine import get_search_engine
+
+
+def preload() -> None:
+    """
+    Aquece o engine no processo mestre antes do fork dos workers.
+
+    Com `gunicorn --preload` os workers herdam matriz e índices por
+    copy-on-write: N workers compartilham uma cópia física do corpus em vez de
+    carregar N cópias. A matriz é somente leitura, então as páginas continuam
+    compartilhadas; só os deltas de refresh de cada worker são privados.
+    Threads e conexões não sobrevivem ao fork: o mestre não roda o modelo
+    (cada worker carrega o seu no lifespan), e o cliente S3 e o refresh em
+    background são criados por cada worker.
+    """
+    get_search_engine().warm_up(auto_refresh=False, load_model=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup (por worker: o processador de spans usa uma thread, que não sobrevive ao fork)
+    configure_tracing()
+    engine = get_search_engine()
+    # Cliente S3 do worker (o do mestre, herdado do preload, não é seguro após o fork)
+    engine.reset_s3_client()
+    app.state.engine = engine
+    app.state.ready = False
+    app.state.error = None
+    app.state.batcher = QueryBatcher(
+        engine.query_embeddings,
+        max_batch_size=settings.EMBED_BATCH_MAX_SIZE,
+        max_wait_ms=settings.EMBED_BATCH_WAIT_MS,
+    )
+    app.state.batcher.start()
+
+    async def warm_up():
+        try:
+            # Com preload, corpus e índices já vêm do mestre: carrega só o modelo
+            await asyncio.to_thread(engine.warm_up)
+            engine.corpus.start_auto_refresh(settings.REFRESH_INTERVAL_SECONDS)
+            app.state.ready = True
+        except Exception as e:
+            # Não relança: a falha fica visível no /ready
+            app.state.error = str(e)
+
+    warm_up_task = asyncio.create_task(warm_up())
+    yield
+    # Shutdown
+    warm_up_task.cancel()
+    await app.state.batcher.stop()
+    if engine.corpus is not None:
+        engine.corpus.stop()
+
+
+app = FastAPI(title="Search Service", lifespan=lifespan)
+app.include_router(router)
+
+if settings.SEARCH_API_PRELOAD:
+    preload()
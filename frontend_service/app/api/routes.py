@@ -0,0 +1,131 @@
+import asyncio
+from datetime import date
+from typing import Annotated, List, Literal, Optional
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+from app.core.config import settings
+from app.index.filters import SearchFilters
+from app.services.search_engine import SearchEngine
+
+router = APIRouter()
+
+SearchMode = Literal["vector", "hybrid", "fusion", "lexical"]
+
+
+class RecordsResponse(Response):
+    """JSON via orjson: registros do corpus trazem escalares NumPy e NaN (-> null)."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FilterOptions(BaseModel):
+    top_k: int = Field(5, ge=1, le=100)
+    categories: List[str] = []
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    def filters(self) -> SearchFilters:
+        return SearchFilters(tuple(self.categories), self.start, self.end)
+
+
+class SearchOptions(FilterOptions):
+    mode: Optional[SearchMode] = None
+
+
+class SearchRequest(SearchOptions):
+    query: str = Field(min_length=1)
+
+
+class BatchSearchRequest(SearchOptions):
+    queries: List[str] = Field(min_length=1, max_length=settings.SEARCH_BATCH_MAX)
+
+
+class SimilarRequest(FilterOptions):
+    # Um id: "mais como este"; vários: vizinhos do centróide
+    ids: List[str] = Field(min_length=1, max_length=settings.SEARCH_BATCH_MAX)
+
+
+def get_engine(request: Request) -> SearchEngine:
+    # Engine único do processo, aquecido no lifespan (app/api/main.py)
+    if not request.app.state.ready:
+        raise HTTPException(status_code=503, detail="Modelo/corpus ainda carregando.")
+    return request.app.state.engine
+
+
+def _records(results: List[dict]) -> List[dict]:
+    # O embedding não vai para o cliente: só os metadados e o score
+    return [{k: v for k, v in r.items() if k != "embedding"} for r in results]
+
+
+@router.get("/health", status_code=200)
+def health_check():
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def readiness_check(request: Request):
+    state = request.app.state
+    return RecordsResponse(
+        {"ready": state.ready, "error": state.error},
+        status_code=200 if state.ready else 503,
+    )
+
+
+@router.post("/search")
+async def search(
+    body: SearchRequest,
+    request: Request,
+    engine: Annotated[SearchEngine, Depends(get_engine)],
+):
+    mode = body.mode or settings.SEARCH_MODE
+    vector = None
+    if mode != "lexical":
+        # Requisições concorrentes dividem um único forward pass do modelo
+        vector = await request.app.state.batcher.embed(body.query)
+    results = await asyncio.to_thread(
+        engine.search, body.query, body.top_k, mode, body.filters(), vector
+    )
+    return RecordsResponse({"results": _records(results)})
+
+
+@router.post("/search/batch")
+async def search_batch(
+    body: BatchSearchRequest,
+    engine: Annotated[SearchEngine, Depends(get_engine)],
+):
+    results = await asyncio.to_thread(
+        engine.search_batch, body.queries, body.top_k, body.mode, body.filters()
+    )
+    return RecordsResponse({"results": [_records(r) for r in results]})
+
+
+@router.post("/similar")
+async def similar(
+    body: SimilarRequest,
+    engine: Annotated[SearchEngine, Depends(get_engine)],
+):
+    # Usa os embeddings armazenados: não passa pelo modelo nem pelo batcher
+    try:
+        results = await asyncio.to_thread(
+            engine.similar, body.ids, body.top_k, body.filters()
+        )
+    except KeyError as e:
+        raise HTTPException(
+            status_code=404, detail=f"Artigos fora do corpus: {e.args[0]}"
+        )
+    return RecordsResponse({"results": _records(results)})
+
+
+@router.get("/status")
+async def status(engine: Annotated[SearchEngine, Depends(get_engine)]):
+    return RecordsResponse(await asyncio.to_thread(engine.status))
+
+
+@router.post("/refresh")
+async def refresh(engine: Annotated[SearchEngine, Depends(get_engine)]):
+    # Refresh incremental (delta da Silver) do corpus deste worker
+    return RecordsResponse(await asyncio.to_thread(engine.refresh))
@@ -0,0 +1,98 @@
+from functools import lru_cache
+from typing import Optional
+import numpy as np
+import orjson
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/vnd.msgpack"
+
+# Vetores binários: float32 little-endian, independente da arquitetura
+EMBEDDING_FIELD = "embedding"
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+class Codec:
+    """Formato do corpo dos objetos; o leitor descobre qual pelo Content-Type."""
+
+    name: str
+    content_type: str
+
+    def encode(self, record: dict) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, body: bytes) -> dict:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """JSON compacto (orjson, UTF-8 sem escapes). Também lê o JSON indentado antigo."""
+
+    name = "json"
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, record: dict) -> bytes:
+        return orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def decode(self, body: bytes) -> dict:
+        return orjson.loads(body)
+
+
+class MsgpackCodec(Codec):
+    """
+    MessagePack (`msgpack`, importado só quando usado).
+
+    O embedding vai como bytes float32 crus (`bin`), não como lista de floats:
+    ~4 bytes por dimensão e leitura com `np.frombuffer`, sem parsing.
+    """
+
+    name = "msgpack"
+    content_type = MSGPACK_CONTENT_TYPE
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError(
+                "Objetos msgpack na Silver requerem o pacote `msgpack`."
+            ) from e
+        self._msgpack = msgpack
+
+    def encode(self, record: dict) -> bytes:
+        vector = record.get(EMBEDDING_FIELD)
+        if vector is not None:
+            record = {
+                **record,
+                EMBEDDING_FIELD: np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes(),
+            }
+        return self._msgpack.packb(record)
+
+    def decode(self, body: bytes) -> dict:
+        record = self._msgpack.unpackb(body)
+        vector = record.get(EMBEDDING_FIELD)
+        if isinstance(vector, bytes):
+            # View somente leitura sobre o corpo (o SilverLoader copia para a matriz)
+            record[EMBEDDING_FIELD] = np.frombuffer(vector, dtype=EMBEDDING_DTYPE)
+        return record
+
+
+_CODECS = {codec.name: codec for codec in (JsonCodec, MsgpackCodec)}
+_CONTENT_TYPES = {
+    JSON_CONTENT_TYPE: "json",
+    MSGPACK_CONTENT_TYPE: "msgpack",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+}
+
+
+@lru_cache(maxsize=None)
+def get_codec(name: str) -> Codec:
+    """Codec pelo nome ("json" ou "msgpack"), como no SERIALIZATION_FORMAT do Processing."""
+    if name not in _CODECS:
+        raise ValueError(f"Formato inválido: '{name}' (json | msgpack).")
+    return _CODECS[name]()
+
+
+def codec_for(content_type: Optional[str]) -> Codec:
+    """Codec de leitura; Content-Type ausente ou desconhecido = JSON (objetos legados)."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return get_codec(_CONTENT_TYPES.get(media_type, "json"))
@@ -5,14 +5,15 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     """
     Configurações da aplicação seguindo o padrão '12-Factor App'.
-    
+
     NOTA DE ESTUDO:
     O código usa variáveis de ambiente ("Environment Variables") para decidir onde conectar.
     * Se a variável S3_ENDPOINT existe (no seu PC local), ele usa MinIO.
     * Se ela não existe (na AWS), ele assume que é S3 real (None).
-    
+
     É a mesma chave que abre duas portas diferentes dependendo de onde você está.
     """
+
     USE_S3: bool = True
     S3_ENDPOINT: Optional[str] = None
     S3_BUCKET_BRONZE: str = "arxiv-bronze"
@@ -21,6 +22,76 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION: str = "us-east-1"
     MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # GETs simultâneos ao carregar a Silver (também dimensiona o pool do boto3)
+    LOAD_CONCURRENCY: int = 32
+    # Intervalo do refresh incremental da Silver em background (0 desativa)
+    REFRESH_INTERVAL_SECONDS: float = 300.0
+    # Embeddings de query mantidos em LRU (0 desativa o cache)
+    QUERY_CACHE_SIZE: int = 1024
+    # Snapshot do corpus em disco (matriz .npy via np.memmap + tabela lateral); opcional
+    SNAPSHOT_DIR: Optional[str] = None
+    # Camada Gold: artefatos versionados do job app/jobs/build_gold.py
+    S3_BUCKET_GOLD: str = "arxiv-gold"
+    GOLD_PREFIX: str = "versions/"
+    GOLD_LATEST_KEY: str = "latest.json"
+    # Frontend/API baixam a versão Gold publicada para SNAPSHOT_DIR no start
+    USE_GOLD: bool = False
+    # Manifesto de contagem escrito pela Ingestão/Processamento e TTL do cache local
+    STATS_KEY: str = "_stats/counts.json"
+    STATS_TTL_SECONDS: float = 60.0
+    # Prefixos que a Ingestão/Processamento gravam no Bronze (mesmas variáveis
+    # de lá): fora da contagem paginada quando não há manifesto
+    DEAD_LETTER_PREFIX: str = "dead-letter/"
+    LEASE_PREFIX: str = "_leases/"
+    FULLTEXT_PREFIX: str = "fulltext/"
+
+    # Cliente da API de busca: com URL definida o Streamlit não carrega modelo/corpus
+    SEARCH_API_URL: Optional[str] = None
+    SEARCH_API_TIMEOUT_SECONDS: float = 30.0
+    # API de busca: micro-batching dos embeddings de query e limite do /search/batch
+    EMBED_BATCH_MAX_SIZE: int = 32
+    EMBED_BATCH_WAIT_MS: float = 5.0
+    SEARCH_BATCH_MAX: int = 64
+    # Aquece o engine no import (gunicorn --preload): workers compartilham por fork
+    SEARCH_API_PRELOAD: bool = False
+
+    # Modo de busca: "vector", "lexical" (BM25), "hybrid" (BM25 -> re-rank vetorial) ou "fusion"
+    SEARCH_MODE: str = "vector"
+    # Candidatos BM25 re-ranqueados pelo vetor no modo "hybrid"
+    LEXICAL_CANDIDATES: int = 200
+    # Peso do cosseno na fusão (1 - alpha vai para o BM25 normalizado)
+    FUSION_ALPHA: float = 0.7
+
+    # Índice vetorial: "exact" (força bruta), "hnsw", "ivfpq" ou "pca" (aproximados)
+    INDEX_BACKEND: str = "exact"
+    # Candidatos pedidos ao índice ANN = top_k * fator; depois re-ranking exato
+    INDEX_RERANK_FACTOR: int = 4
+    # Filtros que deixam até N linhas usam força bruta no subconjunto em vez do ANN
+    FILTER_BRUTE_FORCE_MAX: int = 20_000
+    # Diretório para persistir/reaproveitar o índice entre reinícios (opcional)
+    INDEX_DIR: Optional[str] = None
+    HNSW_M: int = 16
+    HNSW_EF_CONSTRUCTION: int = 200
+    HNSW_EF_SEARCH: int = 64
+    # 0: automático (≈ √N listas; nprobe = 2·√nlist, mínimo 8)
+    IVF_NLIST: int = 0
+    IVF_NPROBE: int = 0
+    PQ_M: int = 16
+    # "pca": primeira passada em PCA_COMPONENTS dims (projeção ajustada na Silver)
+    PCA_COMPONENTS: int = 96
+    PCA_FIT_SAMPLE: int = 50_000
+
+    # Quase-duplicatas (LSH SimHash + cosseno exato): só a canônica aparece na busca
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.97
+    DEDUP_BITS: int = 384
+    DEDUP_BANDS: int = 16
+    # Vizinhos comparados por linha em cada banda ordenada (limita baldes grandes)
+    DEDUP_WINDOW: int = 8
+
+    # Tracing (OpenTelemetry): "none" (no-op) | "file" (JSON Lines) | "otlp"
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE: str = "traces-frontend.jsonl"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
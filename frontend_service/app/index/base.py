@@ -0,0 +1,65 @@
+from typing import Optional, Protocol, Tuple
+import numpy as np
+
+
+class VectorIndex(Protocol):
+    """
+    Contrato dos backends de busca vetorial aproximada (ANN).
+
+    Os ids retornados são as posições de inserção (0..N-1), alinhadas às linhas
+    do corpus carregado pelo SearchEngine. Scores são similaridade de cosseno.
+    `allowed` (máscara booleana por id) restringe os resultados durante a busca,
+    não depois dela: um filtro seletivo não esvazia o top-k.
+    """
+
+    kind: str
+
+    def __len__(self) -> int: ...
+
+    def add(self, vectors: np.ndarray) -> None: ...
+
+    def search(
+        self, query: np.ndarray, k: int, allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]: ...
+
+    def save(self, path: str) -> None: ...
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Normaliza (L2) em float32 para que produto interno == cosseno."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def rerank_recall(
+    index: VectorIndex,
+    matrix: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    candidates: int = 40,
+) -> float:
+    """
+    Recall@k do índice contra a força bruta em `matrix` (vetores completos).
+
+    Mede o caminho do SearchEngine: `candidates` linhas do índice re-ranqueadas
+    com a similaridade exata; é o recall que o usuário vê.
+    """
+    hits = 0
+    for query in normalize_rows(queries):
+        truth = top_k(matrix @ query, k)
+        rows, _ = index.search(query, candidates)
+        found = rows[top_k(matrix[rows] @ query, k)]
+        hits += len(np.intersect1d(truth, found))
+    return hits / (k * len(queries)) if len(queries) else 1.0
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Índices dos k maiores scores em ordem decrescente (O(N) + O(k log k))."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
@@ -0,0 +1,91 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from app.index.base import top_k
+
+_NON_LETTERS = re.compile(r"[^a-z\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Mesma normalização do RegexCleaner (Fase 2): minúsculas, só letras, tokens > 2."""
+    if not text:
+        return []
+    return [t for t in _NON_LETTERS.sub("", text.lower()).split() if len(t) > 2]
+
+
+class BM25Index:
+    """
+    Índice invertido em memória com ranking Okapi BM25.
+
+    Postings por termo (linhas + frequências) ficam em listas Python durante
+    a inserção e são congelados em arrays NumPy na primeira consulta ao termo.
+    A busca só toca as postings dos termos da query: o custo é proporcional
+    aos documentos que contêm os termos, não ao tamanho do corpus.
+    Os ids são as posições de inserção, alinhadas às linhas do corpus.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._frozen: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lengths: List[int] = []
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, texts: Iterable[str]) -> None:
+        for text in texts:
+            row = len(self._lengths)
+            tokens = tokenize(text)
+            for term, tf in Counter(tokens).items():
+                rows, freqs = self._postings.setdefault(term, ([], []))
+                rows.append(row)
+                freqs.append(tf)
+                self._frozen.pop(term, None)
+            self._lengths.append(len(tokens))
+            self._total_length += len(tokens)
+        self._length_array = np.asarray(self._lengths, dtype=np.float32)
+
+    def _posting(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        frozen = self._frozen.get(term)
+        if frozen is None:
+            rows, freqs = self._postings[term]
+            frozen = (
+                np.asarray(rows, dtype=np.int64),
+                np.asarray(freqs, dtype=np.float32),
+            )
+            self._frozen[term] = frozen
+        return frozen
+
+    def score(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Linhas que contêm algum termo da query e seus scores BM25 (sem ordenar)."""
+        terms = [t for t in set(tokenize(query)) if t in self._postings]
+        if not terms or not self._lengths:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        n_docs = len(self._lengths)
+        avg_length = self._total_length / n_docs or 1.0
+        all_rows, all_scores = [], []
+        for term in terms:
+            rows, tf = self._posting(term)
+            idf = np.log(1.0 + (n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            norm = self.k1 * (
+                1.0 - self.b + self.b * self._length_array[rows] / avg_length
+            )
+            all_rows.append(rows)
+            all_scores.append(idf * tf * (self.k1 + 1.0) / (tf + norm))
+
+        if len(terms) == 1:
+            return all_rows[0], all_scores[0].astype(np.float32)
+        # Soma as contribuições de cada termo por linha (só sobre as postings)
+        rows, inverse = np.unique(np.concatenate(all_rows), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(all_scores))
+        return rows, scores.astype(np.float32)
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        rows, scores = self.score(query)
+        best = top_k(scores, k)
+        return rows[best], scores[best]
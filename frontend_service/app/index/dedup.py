@@ -0,0 +1,153 @@
+from dataclasses import dataclass
+from typing import List, Optional
+import numpy as np
+
+# Bits ligados de cada byte: distância de Hamming sem desempacotar as assinaturas
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+@dataclass(frozen=True)
+class DuplicateClusters:
+    """
+    Agrupamento de quase-duplicatas: `canonical[i]` é a linha canônica da linha i.
+
+    A canônica de um cluster é a sua menor linha (o artigo visto primeiro),
+    então continua a mesma quando o corpus só recebe linhas anexadas.
+    """
+
+    canonical: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.canonical)
+
+    @property
+    def duplicates(self) -> int:
+        """Linhas escondidas pelo colapso (não canônicas)."""
+        return int((self.canonical != np.arange(len(self))).sum())
+
+    def collapsed_mask(self, n_rows: int) -> Optional[np.ndarray]:
+        """Máscara das linhas canônicas entre as `n_rows` primeiras (None: sem duplicatas)."""
+        canonical = self.canonical[:n_rows]
+        mask = canonical == np.arange(len(canonical))
+        if mask.all():
+            return None
+        return np.pad(mask, (0, n_rows - len(mask)), constant_values=True)
+
+    def groups(self) -> List[np.ndarray]:
+        """Clusters com duas ou mais linhas; a canônica é o primeiro elemento."""
+        order = np.argsort(self.canonical, kind="stable")
+        _, starts, counts = np.unique(
+            self.canonical[order], return_index=True, return_counts=True
+        )
+        return [
+            order[start : start + count]
+            for start, count in zip(starts, counts)
+            if count > 1
+        ]
+
+
+class DuplicateIndex:
+    """
+    Detecção de quase-duplicatas com LSH de hiperplanos aleatórios (SimHash).
+
+    Cada vetor vira uma assinatura de `bits` bits (lado de cada hiperplano),
+    dividida em `bands` bandas. Vetores com cosseno alto concordam em quase
+    todos os bits, então caem na mesma chave de alguma banda com alta
+    probabilidade. Em vez de comparar todos os pares de um balde (quadrático
+    em baldes grandes), as linhas são ordenadas por (banda, banda seguinte) e
+    cada uma só é comparada com as `window` vizinhas da mesma chave:
+    O(n log n * bands) no total. Cada par que colide é filtrado pela distância
+    de Hamming das assinaturas completas (bytes, não floats) e os restantes
+    passam por uma checagem exata do cosseno (`threshold`); os confirmados
+    são unidos (union-find).
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        bits: int = 384,
+        bands: int = 16,
+        threshold: float = 0.97,
+        window: int = 8,
+        seed: int = 0,
+    ):
+        if bits % (8 * bands) or bits // bands > 64:
+            raise ValueError(
+                f"bits={bits} deve se dividir em {bands} bandas de 8 a 64 bits."
+            )
+        self.bands = bands
+        self.threshold = threshold
+        self.window = window
+        # Ângulo de `threshold` em bits esperados diferentes, com folga de 2x
+        angle = np.arccos(np.clip(threshold, -1.0, 1.0)) / np.pi
+        self.max_hamming = int(np.ceil(2 * bits * angle))
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((dim, bits)).astype(np.float32)
+        self._signatures = np.zeros((0, bits // 8), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Assinaturas das linhas anexadas (só as novas são projetadas)."""
+        signatures = np.packbits(np.asarray(vectors) @ self.planes > 0, axis=1)
+        self._signatures = np.concatenate([self._signatures, signatures])
+
+    def _band_keys(self) -> np.ndarray:
+        # (n, bands) uint64: bytes de cada banda lidos como um inteiro
+        n = len(self)
+        band_bytes = self._signatures.shape[1] // self.bands
+        weights = np.uint64(256) ** np.arange(band_bytes - 1, -1, -1, dtype=np.uint64)
+        keys = self._signatures.reshape(n, self.bands, band_bytes).astype(np.uint64)
+        return (keys * weights).sum(axis=2, dtype=np.uint64)
+
+    def candidate_pairs(self) -> np.ndarray:
+        """
+        Pares (a, b), a < b, que colidem em alguma banda dentro da janela e
+        cujas assinaturas diferem em até `max_hamming` bits.
+        """
+        keys = self._band_keys()
+        pairs = [np.zeros((0, 2), dtype=np.int64)]
+        for band in range(self.bands):
+            # Desempate pela banda seguinte: vizinhos prováveis ficam adjacentes
+            order = np.lexsort((keys[:, (band + 1) % self.bands], keys[:, band]))
+            ordered = keys[order, band]
+            for offset in range(1, self.window + 1):
+                same = ordered[offset:] == ordered[:-offset]
+                a, b = order[:-offset][same], order[offset:][same]
+                xor = self._signatures[a] ^ self._signatures[b]
+                close = _POPCOUNT[xor].sum(axis=1) <= self.max_hamming
+                pairs.append(np.stack([a[close], b[close]], axis=1))
+        pairs = np.sort(np.concatenate(pairs), axis=1)
+        # Deduplica os pares como um único inteiro (mais rápido que unique por linha)
+        codes = np.unique(pairs[:, 0] * len(self) + pairs[:, 1])
+        return np.stack([codes // len(self), codes % len(self)], axis=1)
+
+    def clusters(self, matrix: np.ndarray, chunk: int = 65_536) -> DuplicateClusters:
+        """Clusters das linhas indexadas; `matrix` (normalizada) faz a checagem exata."""
+        pairs = self.candidate_pairs()
+        confirmed = []
+        for start in range(0, len(pairs), chunk):
+            a, b = pairs[start : start + chunk].T
+            similarity = np.einsum("ij,ij->i", matrix[a], matrix[b])
+            confirmed.append(pairs[start : start + chunk][similarity >= self.threshold])
+
+        parent = np.arange(len(self))
+
+        def find(row: int) -> int:
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        for a, b in np.concatenate(confirmed) if confirmed else ():
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                # Raiz = menor linha: a canônica não muda com anexações
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+        while True:
+            compressed = parent[parent]
+            if np.array_equal(compressed, parent):
+                break
+            parent = compressed
+        return DuplicateClusters(parent)
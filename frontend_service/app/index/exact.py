@@ -0,0 +1,46 @@
+from typing import Optional, Tuple
+import numpy as np
+from app.index.base import VectorIndex, normalize_rows, top_k
+
+
+class ExactIndex(VectorIndex):
+    """
+    Busca exaustiva (força bruta): um produto matriz-vetor sobre o corpus inteiro.
+
+    Recall 100% por definição. É o fallback quando nenhum índice ANN está
+    configurado ou disponível e a referência para medir o recall dos demais.
+    """
+
+    kind = "exact"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def add(self, vectors: np.ndarray) -> None:
+        self._vectors = np.concatenate([self._vectors, normalize_rows(vectors)])
+
+    def search(
+        self, query: np.ndarray, k: int, allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        rows = (
+            np.arange(len(self._vectors))
+            if allowed is None
+            else np.flatnonzero(allowed)
+        )
+        scores = self._vectors[rows] @ normalize_rows(query)[0]
+        best = top_k(scores, k)
+        return rows[best], scores[best]
+
+    def save(self, path: str) -> None:
+        np.savez(path, kind=self.kind, vectors=self._vectors)
+
+    @classmethod
+    def load(cls, path: str) -> "ExactIndex":
+        with np.load(path) as data:
+            index = cls(data["vectors"].shape[1])
+            index._vectors = data["vectors"]
+        return index
@@ -0,0 +1,111 @@
+from pathlib import Path
+from typing import List, Optional, Sequence
+import numpy as np
+from app.core.config import settings
+from app.index.base import VectorIndex
+from app.index.exact import ExactIndex
+from app.index.hnsw import HNSWIndex
+from app.index.ivfpq import IVFPQIndex
+from app.index.pca import PCAIndex
+
+BACKENDS = {
+    ExactIndex.kind: ExactIndex,
+    HNSWIndex.kind: HNSWIndex,
+    IVFPQIndex.kind: IVFPQIndex,
+    PCAIndex.kind: PCAIndex,
+}
+
+
+def create_index(dim: int, backend: Optional[str] = None) -> VectorIndex:
+    """Instancia o backend configurado (INDEX_BACKEND) com os parâmetros do settings."""
+    backend = backend or settings.INDEX_BACKEND
+    if backend == HNSWIndex.kind:
+        return HNSWIndex(
+            dim,
+            m=settings.HNSW_M,
+            ef_construction=settings.HNSW_EF_CONSTRUCTION,
+            ef_search=settings.HNSW_EF_SEARCH,
+        )
+    if backend == IVFPQIndex.kind:
+        return IVFPQIndex(
+            dim,
+            nlist=settings.IVF_NLIST,
+            nprobe=settings.IVF_NPROBE,
+            pq_m=settings.PQ_M,
+        )
+    if backend == PCAIndex.kind:
+        return PCAIndex(
+            dim,
+            components=settings.PCA_COMPONENTS,
+            fit_sample=settings.PCA_FIT_SAMPLE,
+        )
+    if backend == ExactIndex.kind:
+        return ExactIndex(dim)
+    raise ValueError(f"INDEX_BACKEND desconhecido: {backend}")
+
+
+def load_index(path: str) -> VectorIndex:
+    """Carrega um índice salvo por `VectorIndex.save`, detectando o backend."""
+    with np.load(path) as data:
+        kind = str(data["kind"])
+    return BACKENDS[kind].load(path)
+
+
+def _load_saved(
+    directory: Optional[Path], backend: str, ids: List[str]
+) -> Optional[VectorIndex]:
+    # Índice salvo cujos ids são um prefixo dos atuais (senão, None)
+    if not directory:
+        return None
+    index_path = directory / f"{backend}.npz"
+    ids_path = directory / f"{backend}.ids.txt"
+    if not (index_path.exists() and ids_path.exists()):
+        return None
+    saved = ids_path.read_text().splitlines()
+    if saved != ids[: len(saved)]:
+        return None
+    index = load_index(str(index_path))
+    # Parâmetros de consulta vêm do settings, não do arquivo
+    if isinstance(index, HNSWIndex):
+        index.ef_search = settings.HNSW_EF_SEARCH
+    elif isinstance(index, IVFPQIndex):
+        index.nprobe = settings.IVF_NPROBE
+    return index
+
+
+def build_or_load_index(
+    ids: Sequence[str],
+    vectors: np.ndarray,
+    backend: Optional[str] = None,
+    index_dir: Optional[str] = None,
+    reuse: bool = True,
+    source_dir: Optional[str] = None,
+) -> VectorIndex:
+    """
+    Reutiliza o índice salvo em `source_dir` (somente leitura, ex.: índice de
+    uma versão Gold) ou em `index_dir` (padrão: INDEX_DIR) se os ids dele são
+    um prefixo dos atuais: só as linhas novas são inseridas, em memória. Caso
+    contrário (ou com `reuse=False`, quando vetores de ids já indexados
+    mudaram) constrói um novo e o salva só em `index_dir`, se configurado.
+    """
+    backend = backend or settings.INDEX_BACKEND
+    index_dir = index_dir or settings.INDEX_DIR
+    index_dir = Path(index_dir) if index_dir else None
+
+    ids = list(ids)
+    if reuse:
+        for directory in (Path(source_dir) if source_dir else None, index_dir):
+            index = _load_saved(directory, backend, ids)
+            if index is not None:
+                if len(index) < len(ids):
+                    # Ex.: índice da Gold + delta da Silver aplicado no start
+                    index.add(vectors[len(index) :])
+                return index
+
+    index = create_index(vectors.shape[1], backend)
+    index.add(vectors)
+    if index_dir:
+        index_dir.mkdir(parents=True, exist_ok=True)
+        index.save(str(index_dir / f"{backend}.npz"))
+        (index_dir / f"{backend}.ids.txt").write_text("\n".join(ids))
+    return index
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+# Datas inválidas/ausentes ficam fora de qualquer intervalo
+_NO_DATE = np.iinfo(np.int64).min
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """Filtros da busca: categorias (OU entre elas) e intervalo de datas inclusivo."""
+
+    categories: Tuple[str, ...] = ()
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    @property
+    def active(self) -> bool:
+        return bool(self.categories) or self.start is not None or self.end is not None
+
+
+def _timestamp(day: date) -> int:
+    midnight = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return int(midnight.timestamp()) * 1_000_000_000
+
+
+class FilterIndex:
+    """
+    Índices de filtro pré-computados, alinhados às linhas do corpus.
+
+    * Categorias: um bitmap por categoria (`np.packbits`, 1 bit por linha);
+      vários filtros viram um OU bit a bit sobre bytes, sem tocar nas linhas.
+    * Datas: timestamps em ordem crescente com a permutação das linhas; um
+      intervalo vira duas buscas binárias (`searchsorted`).
+    Os bitmaps e a ordenação são montados sob demanda e invalidados por `add`.
+    """
+
+    def __init__(self):
+        self._rows_by_category: Dict[str, List[int]] = {}
+        self._bitmaps: Dict[str, np.ndarray] = {}
+        self._dates: List[int] = []
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def add(self, categories: Iterable, published: Sequence) -> None:
+        start = len(self._dates)
+        for offset, cats in enumerate(categories):
+            if isinstance(cats, str):
+                cats = [cats]
+            elif not isinstance(cats, (list, tuple, np.ndarray)):
+                cats = ()  # ausente (None/NaN)
+            for category in cats:
+                self._rows_by_category.setdefault(category, []).append(start + offset)
+        timestamps = pd.to_datetime(
+            pd.Series(published, dtype=object),
+            utc=True,
+            errors="coerce",
+            format="ISO8601",
+        )
+        self._dates.extend(_NO_DATE if pd.isna(ts) else ts.value for ts in timestamps)
+        self._bitmaps.clear()
+        self._sorted = None
+
+    def categories(self) -> List[str]:
+        """Categorias por frequência decrescente (opções do filtro na UI)."""
+        return sorted(
+            self._rows_by_category, key=lambda c: -len(self._rows_by_category[c])
+        )
+
+    def _bitmap(self, category: str) -> np.ndarray:
+        bitmap = self._bitmaps.get(category)
+        if bitmap is None:
+            bits = np.zeros(len(self._dates), dtype=bool)
+            bits[self._rows_by_category.get(category, [])] = True
+            bitmap = self._bitmaps[category] = np.packbits(bits)
+        return bitmap
+
+    def _date_order(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._sorted is None:
+            dates = np.asarray(self._dates, dtype=np.int64)
+            order = np.argsort(dates, kind="stable")
+            self._sorted = (dates[order], order)
+        return self._sorted
+
+    def mask(
+        self, filters: Optional[SearchFilters], n_rows: int
+    ) -> Optional[np.ndarray]:
+        """Máscara booleana das linhas [0, n_rows) aceitas; None se não há filtro."""
+        if filters is None or not filters.active:
+            return None
+
+        if filters.categories:
+            packed = np.zeros((len(self._dates) + 7) // 8, dtype=np.uint8)
+            for category in filters.categories:
+                np.bitwise_or(packed, self._bitmap(category), out=packed)
+            mask = np.unpackbits(packed, count=len(self._dates)).astype(bool)
+        else:
+            mask = np.ones(len(self._dates), dtype=bool)
+
+        if filters.start is not None or filters.end is not None:
+            sorted_dates, order = self._date_order()
+            low = _timestamp(filters.start) if filters.start else _NO_DATE + 1
+            lo = np.searchsorted(sorted_dates, low, side="left")
+            if filters.end:
+                # Fim inclusivo: até o último instante do dia
+                hi = np.searchsorted(
+                    sorted_dates, _timestamp(filters.end + timedelta(days=1)), "left"
+                )
+            else:
+                hi = len(sorted_dates)
+            in_range = np.zeros(len(self._dates), dtype=bool)
+            in_range[order[lo:hi]] = True
+            mask &= in_range
+
+        # Índice pode estar à frente do snapshot (refresh concorrente)
+        return mask[:n_rows]
@@ -0,0 +1,211 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.index.base import VectorIndex, normalize_rows
+
+
+class HNSWIndex(VectorIndex):
+    """
+    Hierarchical Navigable Small World (Malkov & Yashunin) em NumPy.
+
+    Grafo em camadas: camadas altas (esparsas) levam rápido à região da query e
+    a camada 0 refina a busca. Parâmetros de recall/latência:
+    * `m`: vizinhos por nó (memória e recall crescem com m);
+    * `ef_construction`: largura da busca na inserção (qualidade do grafo);
+    * `ef_search`: largura da busca na consulta (recall vs latência).
+    Suporta inserções incrementais; distâncias são calculadas em lote por nó
+    visitado, então o custo em Python é proporcional aos nós visitados, não a N.
+    """
+
+    kind = "hnsw"
+
+    def __init__(
+        self,
+        dim: int,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        seed: int = 42,
+    ):
+        self.dim = dim
+        self.m = m
+        self.m_max0 = 2 * m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._level_mult = 1.0 / np.log(max(m, 2))
+        self._rng = np.random.default_rng(seed)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._levels: List[int] = []
+        # _layers[l][nó] = lista de vizinhos do nó na camada l
+        self._layers: List[Dict[int, List[int]]] = []
+        self._entry = -1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, vectors: np.ndarray) -> None:
+        vectors = normalize_rows(vectors)
+        self._ensure_capacity(len(vectors))
+        for vector in vectors:
+            node = self._size
+            self._vectors[node] = vector
+            self._size += 1
+            self._insert(node)
+
+    def search(
+        self, query: np.ndarray, k: int, allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if self._size == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        q = normalize_rows(query)[0]
+        entry = [self._entry]
+        for layer in range(self._levels[self._entry], 0, -1):
+            entry = [self._search_layer(q, entry, 1, layer)[0][1]]
+        # Filtro na camada 0: o grafo inteiro é navegável, mas só ids
+        # permitidos entram no resultado
+        found = self._search_layer(q, entry, max(self.ef_search, k), 0, allowed)[:k]
+
+        ids = np.array([node for _, node in found], dtype=np.int64)
+        scores = np.array([1.0 - dist for dist, _ in found], dtype=np.float32)
+        return ids, scores
+
+    def _ensure_capacity(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed > len(self._vectors):
+            # Crescimento geométrico: inserções incrementais amortizadas O(1)
+            capacity = max(needed, 2 * len(self._vectors), 1024)
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[: self._size] = self._vectors[: self._size]
+            self._vectors = grown
+
+    def _random_level(self) -> int:
+        return int(-np.log(1.0 - self._rng.random()) * self._level_mult)
+
+    def _insert(self, node: int) -> None:
+        level = self._random_level()
+        self._levels.append(level)
+        while len(self._layers) <= level:
+            self._layers.append({})
+        for layer in range(level + 1):
+            self._layers[layer][node] = []
+
+        if self._entry < 0:
+            self._entry = node
+            return
+
+        q = self._vectors[node]
+        top = self._levels[self._entry]
+        entry = [self._entry]
+        for layer in range(top, level, -1):
+            entry = [self._search_layer(q, entry, 1, layer)[0][1]]
+
+        for layer in range(min(level, top), -1, -1):
+            found = self._search_layer(q, entry, self.ef_construction, layer)
+            m_max = self.m_max0 if layer == 0 else self.m
+            neighbors = [n for _, n in found[: self.m]]
+            self._layers[layer][node] = neighbors
+            for neighbor in neighbors:
+                links = self._layers[layer][neighbor]
+                links.append(node)
+                if len(links) > m_max:
+                    self._layers[layer][neighbor] = self._closest(
+                        self._vectors[neighbor], links, m_max
+                    )
+            entry = [n for _, n in found]
+
+        if level > top:
+            self._entry = node
+
+    def _closest(self, q: np.ndarray, candidates: List[int], k: int) -> List[int]:
+        candidates = np.asarray(candidates)
+        sims = self._vectors[candidates] @ q
+        return candidates[np.argsort(-sims)[:k]].tolist()
+
+    def _search_layer(
+        self,
+        q: np.ndarray,
+        entry_points: List[int],
+        ef: int,
+        layer: int,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[Tuple[float, int]]:
+        """Busca gulosa com fila de prioridade; retorna (distância, nó) ordenado."""
+        graph = self._layers[layer]
+        visited = set(entry_points)
+        dists = 1.0 - self._vectors[entry_points] @ q
+
+        candidates = list(zip(dists.tolist(), entry_points))
+        heapq.heapify(candidates)
+        # Max-heap (distância negada) com os ef melhores nós permitidos até agora
+        results = [(-d, n) for d, n in candidates if allowed is None or allowed[n]]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            dist, node = heapq.heappop(candidates)
+            if len(results) >= ef and dist > -results[0][0]:
+                break
+
+            neighbors = [n for n in graph[node] if n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+
+            neighbor_dists = 1.0 - self._vectors[neighbors] @ q
+            worst = -results[0][0] if results else np.inf
+            for d, n in zip(neighbor_dists.tolist(), neighbors):
+                if len(results) < ef or d < worst:
+                    heapq.heappush(candidates, (d, n))
+                    if allowed is not None and not allowed[n]:
+                        continue
+                    heapq.heappush(results, (-d, n))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+                    worst = -results[0][0]
+
+        return sorted((-d, n) for d, n in results)
+
+    def save(self, path: str) -> None:
+        arrays = {
+            "params": np.array(
+                [self.dim, self.m, self.ef_construction, self.ef_search, self._entry]
+            ),
+            "vectors": self._vectors[: self._size],
+            "levels": np.array(self._levels, dtype=np.int32),
+        }
+        # Grafo serializado em formato CSR por camada (nós, offsets, vizinhos)
+        for layer, graph in enumerate(self._layers):
+            nodes = np.fromiter(graph.keys(), dtype=np.int64, count=len(graph))
+            lengths = [len(graph[n]) for n in nodes]
+            arrays[f"nodes_{layer}"] = nodes
+            arrays[f"offsets_{layer}"] = np.concatenate([[0], np.cumsum(lengths)])
+            arrays[f"links_{layer}"] = np.fromiter(
+                (x for n in nodes for x in graph[n]), dtype=np.int64
+            )
+        np.savez(path, kind=self.kind, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "HNSWIndex":
+        with np.load(path) as data:
+            dim, m, ef_construction, ef_search, entry = data["params"].tolist()
+            index = cls(dim, m=m, ef_construction=ef_construction, ef_search=ef_search)
+            index._vectors = data["vectors"].astype(np.float32)
+            index._size = len(index._vectors)
+            index._levels = data["levels"].tolist()
+            index._entry = entry
+            layer = 0
+            while f"nodes_{layer}" in data:
+                nodes = data[f"nodes_{layer}"].tolist()
+                offsets = data[f"offsets_{layer}"]
+                links = data[f"links_{layer}"].tolist()
+                index._layers.append(
+                    {
+                        node: links[offsets[i] : offsets[i + 1]]
+                        for i, node in enumerate(nodes)
+                    }
+                )
+                layer += 1
+        return index
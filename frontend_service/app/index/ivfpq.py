@@ -0,0 +1,206 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from app.index.base import VectorIndex, normalize_rows, top_k
+
+
+def kmeans(
+    vectors: np.ndarray, k: int, iterations: int = 20, seed: int = 42
+) -> np.ndarray:
+    """K-means (Lloyd) em NumPy; retorna os centróides (k x dim)."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _nearest(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=k)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        # Cluster vazio é re-semeado com um ponto aleatório
+        if empty.any():
+            centroids[empty] = vectors[rng.choice(len(vectors), size=empty.sum())]
+    return centroids
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    # argmin ||x - c||² == argmin (||c||² - 2 x·c)
+    distances = (centroids**2).sum(axis=1) - 2.0 * vectors @ centroids.T
+    return distances.argmin(axis=1)
+
+
+class IVFPQIndex(VectorIndex):
+    """
+    Inverted File + Product Quantization (Jégou et al.) em NumPy.
+
+    Os vetores são particionados em `nlist` listas por k-means; cada resíduo
+    (vetor - centróide da lista) é comprimido em `pq_m` bytes por quantização
+    de produto. A busca visita apenas as `nprobe` listas mais próximas e
+    pontua os códigos via tabela de lookup. Parâmetros de recall/latência:
+    * `nlist`: listas do k-means (0: ≈ √N, definido no treino; listas
+      demais para o corpus deixam poucos vetores por lista e derrubam o recall);
+    * `nprobe`: listas visitadas por consulta (recall vs latência; 0: 2·√nlist,
+      no mínimo 8);
+    * `pq_m`: subvetores por código (memória vs precisão; divide `dim`).
+    O treino acontece no primeiro `add` (ou via `train`); inserções seguintes
+    só codificam os novos vetores. Os scores são aproximados: o SearchEngine
+    refaz o ranking exato dos candidatos.
+    """
+
+    kind = "ivfpq"
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: int = 0,
+        nprobe: int = 0,
+        pq_m: int = 16,
+        pq_bits: int = 8,
+        train_sample: int = 20_000,
+        seed: int = 42,
+    ):
+        if dim % pq_m != 0:
+            raise ValueError(f"pq_m={pq_m} deve dividir a dimensão {dim}.")
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.pq_m = pq_m
+        self.pq_ksub = 2**pq_bits
+        self.train_sample = train_sample
+        self.seed = seed
+        self.coarse: Optional[np.ndarray] = None
+        self.codebooks: Optional[np.ndarray] = None  # (pq_m, ksub, dsub)
+        self._lists: List[np.ndarray] = []  # ids por lista
+        self._codes: List[np.ndarray] = []  # códigos uint8 por lista
+        self._size = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self.coarse is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def probes(self) -> int:
+        """Listas visitadas por consulta (`nprobe`, ou automático pelo `nlist`)."""
+        if self.nprobe > 0:
+            return min(self.nprobe, self.nlist)
+        return min(max(8, 2 * int(np.ceil(np.sqrt(self.nlist)))), self.nlist)
+
+    def train(self, vectors: np.ndarray) -> None:
+        vectors = normalize_rows(vectors)
+        if self.nlist <= 0:
+            # Regra usual do IVF: ~√N listas (ex.: 71 para 5 mil vetores)
+            self.nlist = max(1, int(round(np.sqrt(len(vectors)))))
+        rng = np.random.default_rng(self.seed)
+        if len(vectors) > self.train_sample:
+            vectors = vectors[
+                rng.choice(len(vectors), self.train_sample, replace=False)
+            ]
+
+        # Corpus pequeno: não há pontos para tantas listas/centróides
+        self.nlist = min(self.nlist, len(vectors))
+        self.coarse = kmeans(vectors, self.nlist, seed=self.seed)
+        residuals = vectors - self.coarse[_nearest(vectors, self.coarse)]
+
+        dsub = self.dim // self.pq_m
+        ksub = min(self.pq_ksub, len(vectors))
+        self.codebooks = np.stack(
+            [
+                kmeans(residuals[:, j * dsub : (j + 1) * dsub], ksub, seed=self.seed)
+                for j in range(self.pq_m)
+            ]
+        )
+        self._lists = [np.empty(0, dtype=np.int64) for _ in range(self.nlist)]
+        self._codes = [
+            np.empty((0, self.pq_m), dtype=np.uint8) for _ in range(self.nlist)
+        ]
+
+    def add(self, vectors: np.ndarray) -> None:
+        vectors = normalize_rows(vectors)
+        if not self.is_trained:
+            self.train(vectors)
+
+        assignment = _nearest(vectors, self.coarse)
+        codes = self._encode(vectors - self.coarse[assignment])
+        ids = np.arange(self._size, self._size + len(vectors))
+        for lst in np.unique(assignment):
+            mask = assignment == lst
+            self._lists[lst] = np.concatenate([self._lists[lst], ids[mask]])
+            self._codes[lst] = np.concatenate([self._codes[lst], codes[mask]])
+        self._size += len(vectors)
+
+    def _encode(self, residuals: np.ndarray) -> np.ndarray:
+        dsub = self.dim // self.pq_m
+        codes = np.empty((len(residuals), self.pq_m), dtype=np.uint8)
+        for j in range(self.pq_m):
+            codes[:, j] = _nearest(
+                residuals[:, j * dsub : (j + 1) * dsub], self.codebooks[j]
+            )
+        return codes
+
+    def search(
+        self, query: np.ndarray, k: int, allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if self._size == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        q = normalize_rows(query)[0]
+        coarse_scores = self.coarse @ q
+        probes = top_k(coarse_scores, self.probes)
+
+        # Tabela de lookup: produto interno da query com cada centróide do PQ
+        dsub = self.dim // self.pq_m
+        q_sub = q.reshape(self.pq_m, dsub)
+        lut = np.einsum("mkd,md->mk", self.codebooks, q_sub)
+
+        ids, scores = [], []
+        for lst in probes:
+            codes, list_ids = self._codes[lst], self._lists[lst]
+            if allowed is not None:
+                # Filtro aplicado antes de pontuar os códigos da lista
+                keep = allowed[list_ids]
+                codes, list_ids = codes[keep], list_ids[keep]
+            if len(codes) == 0:
+                continue
+            # <q, c + r> = <q, c> + sum_j <q_j, codebook_j[code_j]>
+            approx = coarse_scores[lst] + lut[np.arange(self.pq_m), codes].sum(axis=1)
+            ids.append(list_ids)
+            scores.append(approx)
+
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        ids = np.concatenate(ids)
+        scores = np.concatenate(scores).astype(np.float32)
+        best = top_k(scores, k)
+        return ids[best], scores[best]
+
+    def save(self, path: str) -> None:
+        sizes = np.array([len(ids) for ids in self._lists], dtype=np.int64)
+        np.savez(
+            path,
+            kind=self.kind,
+            params=np.array(
+                [self.dim, self.nlist, self.nprobe, self.pq_m, self.pq_ksub]
+            ),
+            coarse=self.coarse,
+            codebooks=self.codebooks,
+            sizes=sizes,
+            ids=np.concatenate(self._lists),
+            codes=np.concatenate(self._codes),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IVFPQIndex":
+        with np.load(path) as data:
+            dim, nlist, nprobe, pq_m, ksub = data["params"].tolist()
+            index = cls(dim, nlist=nlist, nprobe=nprobe, pq_m=pq_m)
+            index.pq_ksub = ksub
+            index.coarse = data["coarse"]
+            index.codebooks = data["codebooks"]
+            bounds = np.concatenate([[0], np.cumsum(data["sizes"])])
+            ids, codes = data["ids"], data["codes"]
+            index._lists = [ids[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+            index._codes = [codes[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+            index._size = int(bounds[-1])
+        return index
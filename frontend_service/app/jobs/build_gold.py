@@ -0,0 +1,142 @@
+"""
+Job da camada Gold: Silver -> artefatos de busca versionados no bucket Gold.
+
+Roda como task ECS agendada pelo EventBridge (mesma imagem do frontend):
+    python -m app.jobs.build_gold [--backend hnsw]
+
+A execução parte da versão Gold anterior (snapshot) e baixa da Silver só o
+delta (ETags); publica snapshot + índice em `versions/<versão>/` e só então
+troca o ponteiro `latest.json`.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+import boto3
+import numpy as np
+import orjson
+from botocore.config import Config
+from app.core.config import settings
+from app.index.base import normalize_rows, rerank_recall
+from app.index.factory import create_index
+from app.services.corpus import Corpus
+from app.services.gold_store import GoldStore, new_version
+from app.services.silver_loader import SilverLoader
+
+
+def index_recall(index, matrix, sample: int = 200, seed: int = 42) -> float:
+    """
+    Recall@10 do índice publicado contra a busca exata em dimensão completa.
+
+    Queries sintéticas: média de dois artigos do corpus (não coincidem com
+    nenhuma linha, então o próprio artigo não infla o recall).
+    """
+    rng = np.random.default_rng(seed)
+    pairs = rng.integers(0, len(matrix), size=(2, min(sample, len(matrix))))
+    queries = normalize_rows(matrix[pairs[0]] + matrix[pairs[1]])
+    candidates = 10 * settings.INDEX_RERANK_FACTOR
+    return round(rerank_recall(index, matrix, queries, 10, candidates), 4)
+
+
+def build_artifacts(corpus: Corpus, directory: str) -> dict:
+    """
+    Snapshot do corpus + índice vetorial (backend != "exact") em `directory`,
+    mais `duplicates.json` com os clusters de quase-duplicatas (DEDUP_ENABLED).
+    """
+    header = corpus.save_snapshot(directory)
+    metadata = {
+        "model_name": header.model_name,
+        "dim": header.dim,
+        "rows": header.rows,
+        "index_backend": None,
+        "duplicate_rows": 0,
+    }
+    snapshot = corpus.snapshot()
+    if settings.DEDUP_ENABLED and len(snapshot):
+        # Relatório de quase-duplicatas: clusters e o id canônico de cada um
+        ids = snapshot.df["id"].astype(str).tolist()
+        clusters = corpus.duplicates(snapshot)
+        report = [
+            {"canonical": ids[rows[0]], "members": [ids[row] for row in rows]}
+            for rows in clusters.groups()
+        ]
+        (Path(directory) / "duplicates.json").write_bytes(orjson.dumps(report))
+        metadata["duplicate_rows"] = clusters.duplicates
+    if corpus.backend != "exact" and len(snapshot):
+        index = create_index(header.dim, corpus.backend)
+        index.add(snapshot.matrix)
+        # Mesmo layout do INDEX_DIR: o frontend reaproveita sem reconstruir
+        index_dir = Path(directory) / "index"
+        index_dir.mkdir()
+        index.save(str(index_dir / f"{corpus.backend}.npz"))
+        ids = snapshot.df["id"].astype(str).tolist()
+        (index_dir / f"{corpus.backend}.ids.txt").write_text("\n".join(ids))
+        metadata["index_backend"] = corpus.backend
+        metadata["recall_at_10"] = index_recall(index, snapshot.matrix)
+        if hasattr(index, "explained_variance"):
+            metadata["pca_explained_variance"] = index.explained_variance
+    return metadata
+
+
+def run(s3=None, backend: Optional[str] = None) -> dict:
+    s3 = s3 or boto3.client(
+        "s3",
+        endpoint_url=settings.S3_ENDPOINT,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION,
+        config=Config(max_pool_connections=settings.LOAD_CONCURRENCY),
+    )
+    store = GoldStore(
+        s3, settings.S3_BUCKET_GOLD, settings.GOLD_PREFIX, settings.GOLD_LATEST_KEY
+    )
+    store.ensure_bucket()
+    loader = SilverLoader(
+        s3,
+        settings.S3_BUCKET_SILVER,
+        concurrency=settings.LOAD_CONCURRENCY,
+        skip_keys=[settings.STATS_KEY],
+    )
+    corpus = Corpus(loader, backend)
+
+    started = time.perf_counter()
+    # A matriz da versão anterior é um np.memmap: o diretório vive até o publish
+    with tempfile.TemporaryDirectory() as previous:
+        try:
+            local = store.sync_latest(previous)
+            if local:
+                corpus.load_snapshot(local)
+        except Exception as e:
+            # Outro MODEL_NAME/formato, download truncado ou corrompido:
+            # reconstrói do zero a partir da Silver
+            print(f"⚠️ Versão Gold anterior ignorada: {e}")
+        stats = corpus.refresh()
+
+        with tempfile.TemporaryDirectory() as directory:
+            metadata = build_artifacts(corpus, directory)
+            pointer = store.publish(directory, new_version(), metadata)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ Gold {pointer['version']} publicada: {metadata['rows']} artigos "
+        f"({stats['fetched']} baixados da Silver) em {elapsed:.1f}s."
+    )
+    if stats["failed"] or stats["skipped"]:
+        # Falhas de leitura ficam para a próxima versão (o ETag não é aplicado)
+        print(
+            f"⚠️ {stats['failed']} objetos com falha de leitura e "
+            f"{stats['skipped']} sem embedding ficaram fora desta versão."
+        )
+    if metadata.get("recall_at_10") is not None:
+        print(
+            f"   Recall@10 do índice {metadata['index_backend']}: {metadata['recall_at_10']:.3f}"
+        )
+    return pointer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", default=None, help="Padrão: INDEX_BACKEND")
+    run(backend=parser.parse_args().backend)
@@ -1,5 +1,61 @@
 import streamlit as st
-from app.services.search_engine import SearchEngine
+from app.index.filters import SearchFilters
+from app.services.search_client import SearchClient
+from app.core.config import settings
+
+
+@st.cache_resource(show_spinner=False)
+def get_search_backend():
+    """
+    API de busca (SEARCH_API_URL) ou SearchEngine em processo (desenvolvimento).
+
+    Os dois expõem `search`, `similar`, `status` e `refresh`; no modo em processo o corpus
+    é carregado aqui, uma vez, com barra de progresso.
+    """
+    if settings.SEARCH_API_URL:
+        return SearchClient(
+            settings.SEARCH_API_URL, timeout=settings.SEARCH_API_TIMEOUT_SECONDS
+        )
+
+    # Import tardio: o cliente fino não importa torch/transformers
+    from app.core.tracing import configure_tracing
+    from app.services.search_engine import get_search_engine
+
+    configure_tracing()
+    engine = get_search_engine()
+    bar = st.progress(0.0, text="Carregando artigos da Silver...")
+
+    def progress(done: int, total: int):
+        bar.progress(done / total, text=f"Carregando artigos da Silver: {done}/{total}")
+
+    try:
+        engine.load_corpus(progress)
+    finally:
+        bar.empty()
+    return engine
+
+
+def render_results(results, key_prefix: str):
+    for item in results:
+        with st.expander(f"{item['title']} (Score: {item['score']:.4f})"):
+            st.markdown(f"**Categories:** {item['categories']}")
+            st.markdown(f"**Summary:** {item['summary']}")
+            st.caption(f"ID: {item['id']}")
+
+            left, right = st.columns(2)
+            if left.button(
+                "🔎 Artigos similares", key=f"{key_prefix}-sim-{item['id']}"
+            ):
+                st.session_state.similar_ids = [item["id"]]
+            selected = right.checkbox(
+                "Selecionar para similares",
+                value=item["id"] in st.session_state.selected_ids,
+                key=f"{key_prefix}-sel-{item['id']}",
+            )
+            if selected:
+                st.session_state.selected_ids.add(item["id"])
+            else:
+                st.session_state.selected_ids.discard(item["id"])
 
 
 def main():
@@ -8,18 +64,55 @@ def main():
     st.title("📚 ArXiv Semantic Search")
     st.markdown("Busca inteligente em artigos científicos usando BERT embeddings.")
 
+    engine = get_search_backend()
+    status = engine.status()
+    # "Mais como este": ids de origem (um artigo ou a seleção de vários)
+    st.session_state.setdefault("similar_ids", [])
+    st.session_state.setdefault("selected_ids", set())
+
     # Sidebar
     with st.sidebar:
         st.header("Configurações")
         top_k = st.slider("Número de resultados", 1, 20, 5)
+        modes = ["vector", "hybrid", "fusion", "lexical"]
+        mode = st.selectbox(
+            "Modo de busca",
+            modes,
+            index=modes.index(settings.SEARCH_MODE),
+            help="vector: embeddings | hybrid: BM25 -> re-rank vetorial | "
+            "fusion: cosseno + BM25 ponderados | lexical: só BM25",
+        )
+
+        # Filtros: bitmaps de categoria e índice de datas do corpus
+        categories = st.multiselect(
+            "Categorias",
+            status["categories"],
+            help="Artigos em qualquer uma das categorias selecionadas",
+        )
+        period = st.date_input("Publicado entre", value=(), format="YYYY-MM-DD")
+        filters = SearchFilters(
+            categories=tuple(categories),
+            start=period[0] if len(period) > 0 else None,
+            end=period[1] if len(period) > 1 else None,
+        )
+
         if st.button("Reload Data"):
-            st.cache_data.clear()
-            st.success("Cache limpo! Recarregue a busca.")
+            # Refresh incremental: baixa só artigos novos/alterados da Silver
+            stats = engine.refresh()
+            st.success(
+                f"{stats['fetched']} artigos novos/alterados. "
+                f"Corpus com {stats['rows']} artigos."
+            )
 
-    engine = SearchEngine()
-    
-    bronze_count = engine.get_bronze_count()
-    silver_count = engine.get_silver_count()
+        cache = status["query_cache"]
+        st.caption(
+            f"Cache de queries: {cache['hit_rate']:.0%} de acertos "
+            f"({cache['hits']}/{cache['hits'] + cache['misses']}, "
+            f"{cache['size']}/{cache['maxsize']} entradas)"
+        )
+
+    bronze_count = status["bronze"]
+    silver_count = status["silver"]
     
     st.markdown(f":orange[Bronze: {bronze_count}] | :blue[Silver: {silver_count}]")
 
@@ -31,15 +124,37 @@ def main():
 
     if query:
         with st.spinner("Pesquisando..."):
-            results = engine.search(query, top_k=top_k)
+            results = engine.search(query, top_k=top_k, mode=mode, filters=filters)
 
         st.write(f"Encontrados {len(results)} resultados relevantes.")
 
-        for item in results:
-            with st.expander(f"{item['title']} (Score: {item['score']:.4f})"):
-                st.markdown(f"**Categories:** {item['categories']}")
-                st.markdown(f"**Summary:** {item['summary']}")
-                st.caption(f"ID: {item['id']}")
+        excluded = status["excluded_rows"]
+        if excluded:
+            st.warning(
+                f"{excluded} artigos da Silver foram gerados por outro modelo e "
+                f"estão fora do índice (aguardando backfill para {settings.MODEL_NAME})."
+            )
+
+        render_results(results, "search")
+
+    selected = sorted(st.session_state.selected_ids)
+    if selected and st.button(f"🔎 Similares aos {len(selected)} selecionados"):
+        st.session_state.similar_ids = selected
+
+    if st.session_state.similar_ids:
+        # Embeddings armazenados como query: sem passar pelo modelo
+        similar_ids = st.session_state.similar_ids
+        st.subheader(f"Artigos similares a {', '.join(similar_ids)}")
+        try:
+            similar = engine.similar(similar_ids, top_k=top_k, filters=filters)
+        except KeyError:
+            st.error("Artigo(s) não encontrados no corpus atual.")
+            similar = []
+        render_results(similar, "similar")
+        if st.button("Limpar similares"):
+            st.session_state.similar_ids = []
+            st.session_state.selected_ids = set()
+            st.rerun()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Sequence
+import orjson
+from botocore.exceptions import ClientError
+
+
+class BucketCount(NamedTuple):
+    count: int
+    source: str  # "manifest" (escrito pelos serviços) ou "listing" (fallback)
+    updated_at: Optional[datetime] = None
+
+
+class BucketStatsProvider:
+    """
+    Contagem de objetos por bucket sem listar o bucket a cada rerun.
+
+    Lê o manifesto `STATS_KEY` mantido pela Ingestão (Bronze) e pelo
+    Processamento (Silver); sem manifesto, faz uma contagem paginada
+    (`KeyCount` de uma única chamada para em 1.000) que ignora, como os
+    serviços, o manifesto e os `skip_prefixes` (dead-letter, leases, textos
+    completos). O resultado fica em cache
+    por `ttl_seconds`; falhas de S3 devolvem o último valor conhecido (ou 0).
+    """
+
+    def __init__(
+        self,
+        s3,
+        stats_key: str,
+        ttl_seconds: float = 60.0,
+        skip_prefixes: Sequence[str] = (),
+    ):
+        self.s3 = s3
+        self.stats_key = stats_key
+        # Objetos que os serviços gravam nos buckets e que não são artigos
+        self.skip_prefixes = tuple(skip_prefixes)
+        self.ttl_seconds = ttl_seconds
+        self._cache: Dict[str, tuple] = {}  # bucket -> (expira_em, BucketCount)
+        self._lock = threading.Lock()
+
+    def count(self, bucket: str) -> BucketCount:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(bucket)
+            if cached and cached[0] > now:
+                return cached[1]
+
+        try:
+            result = self._read_manifest(bucket) or self._count_pages(bucket)
+        except Exception:
+            return cached[1] if cached else BucketCount(0, "unavailable")
+
+        with self._lock:
+            self._cache[bucket] = (now + self.ttl_seconds, result)
+        return result
+
+    def _read_manifest(self, bucket: str) -> Optional[BucketCount]:
+        try:
+            body = self.s3.get_object(Bucket=bucket, Key=self.stats_key)["Body"].read()
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise
+        manifest = orjson.loads(body)
+        updated_at = manifest.get("updated_at")
+        return BucketCount(
+            int(manifest["count"]),
+            "manifest",
+            datetime.fromisoformat(updated_at) if updated_at else None,
+        )
+
+    def _count_pages(self, bucket: str) -> BucketCount:
+        paginator = self.s3.get_paginator("list_objects_v2")
+        total = sum(
+            1
+            for page in paginator.paginate(Bucket=bucket)
+            for obj in page.get("Contents", [])
+            if obj["Key"] != self.stats_key
+            and not obj["Key"].startswith(self.skip_prefixes)
+        )
+        return BucketCount(total, "listing")
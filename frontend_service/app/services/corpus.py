@@ -0,0 +1,493 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+from app.index.base import VectorIndex, normalize_rows
+from app.index.bm25 import BM25Index
+from app.index.dedup import DuplicateClusters, DuplicateIndex
+from app.index.factory import build_or_load_index
+from app.index.filters import FilterIndex
+from app.services.embedding_snapshot import (
+    SnapshotHeader,
+    read_snapshot,
+    write_snapshot,
+)
+from app.services.silver_loader import ProgressCallback, SilverLoader, SilverObject
+
+
+def compatible_mask(df: pd.DataFrame) -> np.ndarray:
+    """Linhas cujo vetor foi gerado pelo MODEL_NAME atual (legado sem coluna: todas)."""
+    if df.empty or "model_name" not in df.columns:
+        return np.ones(len(df), dtype=bool)
+    return (df["model_name"] == settings.MODEL_NAME).to_numpy()
+
+
+def select_compatible_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mantém apenas vetores gerados pelo mesmo modelo usado para a query.
+
+    Misturar espaços vetoriais de modelos diferentes invalida a similaridade de
+    cosseno, então registros de outro MODEL_NAME ficam fora do índice. Registros
+    legados (sem `model_name`) só são aceitos quando a Silver inteira é legada.
+    O total excluído fica em `df.attrs["excluded_rows"]` para exibição na UI.
+    """
+    mask = compatible_mask(df)
+    if mask.all():
+        df.attrs["excluded_rows"] = 0
+        return df
+
+    compatible = df[mask].reset_index(drop=True)
+    compatible.attrs["excluded_rows"] = len(df) - len(compatible)
+    return compatible
+
+
+def _text_column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[name].fillna("").astype(str)
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def lexical_text(df: pd.DataFrame) -> List[str]:
+    """Texto indexado pelo BM25: título + cleaned_summary (summary em registros legados)."""
+    cleaned = _text_column(df, "cleaned_summary")
+    body = cleaned.where(cleaned != "", _text_column(df, "summary"))
+    return (_text_column(df, "title") + " " + body).tolist()
+
+
+def build_embedding_matrix(df: pd.DataFrame) -> np.ndarray:
+    """
+    Matriz (N x dim) float32, C-contígua e L2-normalizada, montada uma vez por corpus.
+
+    Com vetores unitários a similaridade de cosseno vira um único produto
+    matriz-vetor. A matriz é somente-leitura, então consultas concorrentes a
+    compartilham sem cópia e sem lock.
+    """
+    matrix = np.ascontiguousarray(normalize_rows(np.vstack(df["embedding"].to_numpy())))
+    matrix.setflags(write=False)
+    return matrix
+
+
+@dataclass(frozen=True)
+class CorpusSnapshot:
+    """Versão imutável do corpus vista por uma busca (linha i do df == linha i da matriz)."""
+
+    df: pd.DataFrame
+    matrix: np.ndarray
+    # Versão das linhas existentes (muda quando são alteradas ou removidas)
+    generation: int = 0
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+
+class Corpus:
+    """
+    Corpus da Silver em memória com refresh incremental (delta).
+
+    Cada `refresh` lista a Silver (só chaves, 1.000 por página) e compara o ETag
+    de cada chave com o último aplicado: apenas artigos novos ou alterados são
+    baixados. Novos viram linhas anexadas à matriz (buffer com capacidade
+    dobrada, sem recopiar o corpus) e ao índice ANN. Alterados e apagados da
+    Silver (ou que deixaram de ter vetor compatível) mudam linhas existentes:
+    o refresh escreve em uma cópia do buffer (copy-on-write), compactando as
+    linhas removidas, e os índices incrementais são reconstruídos.
+
+    Buscas leem um `CorpusSnapshot`, trocado atomicamente ao fim do refresh,
+    então nunca veem um corpus pela metade nem uma linha reescrita.
+
+    O DataFrame guarda só metadados: os vetores ficam apenas na matriz. Com
+    `load_snapshot` a matriz é um np.memmap do snapshot em disco (compartilhado
+    entre processos) até o primeiro delta, que a copia para um buffer próprio.
+    """
+
+    def __init__(
+        self,
+        loader: SilverLoader,
+        backend: Optional[str] = None,
+        index_dir: Optional[str] = None,
+    ):
+        self.loader = loader
+        self.backend = backend or settings.INDEX_BACKEND
+        self.index_dir = index_dir  # None: INDEX_DIR do settings
+        # Índice publicado (ex.: versão Gold): só lido, nunca regravado
+        self.index_source: Optional[str] = None
+        self.watermark: Optional[datetime] = None  # maior LastModified aplicado
+        self.last_refresh: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._etags: Dict[str, str] = {}  # chave -> ETag já aplicado
+        self._rows: Dict[str, int] = {}  # chave -> linha na matriz
+        self._excluded: Set[str] = set()  # chaves de outro MODEL_NAME
+        self._buffer = np.zeros((0, 0), dtype=np.float32)
+        self._snapshot = CorpusSnapshot(pd.DataFrame(), self._buffer)
+        self._index: Optional[VectorIndex] = None
+        self._index_generation = -1
+        self._index_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        # Geração do último load_snapshot: o índice salvo ao lado só vale até ela
+        self._base_generation = 0
+        # Incrementa quando linhas existentes mudam: índices só-anexação ficam inválidos
+        self._generation = 0
+        self._lexical: Optional[BM25Index] = None
+        self._lexical_generation = -1
+        self._lexical_lock = threading.Lock()
+        self._filters: Optional[FilterIndex] = None
+        self._filters_generation = -1
+        self._filters_lock = threading.Lock()
+        self._ids: Dict[str, int] = {}  # id do artigo -> linha no snapshot
+        self._ids_rows = 0
+        self._ids_generation = -1
+        self._ids_lock = threading.Lock()
+        self._dedup: Optional[DuplicateIndex] = None
+        self._duplicates: Optional[DuplicateClusters] = None
+        self._dedup_generation = -1
+        self._dedup_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._snapshot.df
+
+    def snapshot(self) -> CorpusSnapshot:
+        return self._snapshot
+
+    def refresh(self, progress: Optional[ProgressCallback] = None) -> dict:
+        """Aplica o delta da Silver desde o último refresh; retorna estatísticas."""
+        with self._refresh_lock:
+            objects = self.loader.list_objects()
+            pending = [o for o in objects if self._etags.get(o.key) != o.etag]
+            # Chaves aplicadas que sumiram da listagem: apagadas da Silver
+            listed = {o.key for o in objects}
+            removed = [key for key in self._etags if key not in listed]
+            delta = pd.DataFrame()
+            if pending:
+                delta = self.loader.load([o.key for o in pending], progress)
+            if pending or removed:
+                self._apply(pending, delta, removed)
+
+            self.last_refresh = datetime.now()
+            self.last_error = None
+            return {
+                "listed": len(objects),
+                "fetched": len(pending),
+                "removed": len(removed),
+                # Falhas de leitura não são aplicadas: voltam no próximo refresh
+                "failed": len(delta.attrs.get("failed", ())),
+                "skipped": len(delta.attrs.get("skipped", ())),
+                "rows": len(self._snapshot),
+                "watermark": self.watermark,
+            }
+
+    def load_snapshot(self, directory: str) -> SnapshotHeader:
+        """
+        Inicia o corpus a partir de um snapshot em disco, sem ler a Silver.
+
+        O `refresh` seguinte baixa só o que mudou depois do snapshot (ETags).
+        Levanta ValueError/OSError se o snapshot for inválido ou de outro modelo.
+        """
+        snapshot = read_snapshot(directory, settings.MODEL_NAME)
+        with self._refresh_lock:
+            self._buffer = snapshot.matrix
+            self._rows = {key: row for row, key in enumerate(snapshot.keys)}
+            self._etags = dict(zip(snapshot.keys, snapshot.etags))
+            self._etags.update(snapshot.excluded)
+            self._excluded = set(snapshot.excluded)
+            self.watermark = snapshot.header.watermark
+            self._generation += 1
+            self._base_generation = self._generation
+
+            df = snapshot.df
+            df.attrs["excluded_rows"] = len(self._excluded)
+            self._snapshot = CorpusSnapshot(df, snapshot.matrix, self._generation)
+        return snapshot.header
+
+    def save_snapshot(self, directory: str) -> SnapshotHeader:
+        """Grava o snapshot atual (matriz + tabela lateral + header) em disco."""
+        with self._refresh_lock:
+            snapshot = self._snapshot
+            keys = [""] * len(snapshot)
+            for key, row in self._rows.items():
+                keys[row] = key
+            etags = [self._etags[key] for key in keys]
+            excluded = {key: self._etags[key] for key in self._excluded}
+            watermark = self.watermark
+        return write_snapshot(
+            directory,
+            snapshot.df,
+            snapshot.matrix,
+            keys,
+            etags,
+            settings.MODEL_NAME,
+            watermark=watermark,
+            excluded=excluded,
+        )
+
+    def _mark_applied(self, obj: SilverObject) -> None:
+        self._etags[obj.key] = obj.etag
+        if obj.last_modified and (
+            not self.watermark or obj.last_modified > self.watermark
+        ):
+            self.watermark = obj.last_modified
+
+    def _apply(
+        self,
+        pending: List[SilverObject],
+        delta: pd.DataFrame,
+        removed: Sequence[str] = (),
+    ) -> None:
+        objects = {obj.key: obj for obj in pending}
+        # Chaves que saem da matriz: apagadas da Silver, sem embedding ou de outro modelo
+        dropped: Set[str] = set(removed)
+        for key in removed:
+            self._etags.pop(key, None)
+            self._excluded.discard(key)
+        # Sem embedding: não rebaixa até mudar o ETag, mas não vira linha
+        for key in delta.attrs.get("skipped", ()):
+            self._mark_applied(objects[key])
+            dropped.add(key)
+
+        appended: List[int] = []  # posições no delta
+        updated: Dict[str, int] = {}  # chave -> posição no delta
+        vectors = np.zeros((0, self._buffer.shape[1]), dtype=np.float32)
+        if not delta.empty:
+            # Linha i do delta -> chave (sem attrs: todas carregadas, na ordem pedida)
+            keys = delta.attrs.get("keys", [obj.key for obj in pending])
+            mask = compatible_mask(delta)
+            vectors = normalize_rows(np.vstack(delta["embedding"].to_numpy()))
+            # Vetores só na matriz: o DataFrame não duplica listas de floats
+            delta = delta.drop(columns="embedding")
+            for i, key in enumerate(keys):
+                self._mark_applied(objects[key])
+                if not mask[i]:
+                    self._excluded.add(key)
+                    dropped.add(key)
+                    continue
+                self._excluded.discard(key)
+                if key in self._rows:
+                    updated[key] = i
+                else:
+                    appended.append(i)
+
+        previous = self._snapshot
+        df = previous.df
+        dropped_rows = [self._rows.pop(key) for key in dropped if key in self._rows]
+        if dropped_rows or updated:
+            # Copy-on-write: snapshots anteriores (buscas em andamento) seguem
+            # lendo o buffer antigo; este refresh escreve em uma cópia
+            keep = np.ones(len(previous), dtype=bool)
+            keep[dropped_rows] = False
+            if dropped_rows:
+                # Compacta a matriz: as linhas seguintes sobem
+                shifted = np.cumsum(keep) - 1
+                self._rows = {key: int(shifted[row]) for key, row in self._rows.items()}
+            df = df[keep].reset_index(drop=True)
+            self._buffer = previous.matrix[keep]
+            # Linhas existentes mudaram: índices só-anexação ficam inválidos
+            self._generation += 1
+
+        start = len(df)
+        self._ensure_capacity(start, start + len(appended), vectors.shape[1])
+        if appended and not self._buffer.flags.writeable:
+            # Matriz mapeada do snapshot (somente leitura)
+            self._buffer = np.array(self._buffer)
+        if appended:
+            self._buffer[start : start + len(appended)] = vectors[appended]
+        for key, i in updated.items():
+            self._buffer[self._rows[key]] = vectors[i]
+        for offset, i in enumerate(appended):
+            self._rows[keys[i]] = start + offset
+
+        df = pd.concat([df, delta.iloc[appended]], ignore_index=True)
+        for key, i in updated.items():
+            for column, value in delta.iloc[i].items():
+                df.at[self._rows[key], column] = value
+        df.attrs["excluded_rows"] = len(self._excluded)
+
+        matrix = self._buffer[: len(df)]
+        matrix.setflags(write=False)
+        self._snapshot = CorpusSnapshot(df, matrix, self._generation)
+
+    def _ensure_capacity(self, used: int, rows: int, dim: int) -> None:
+        if rows <= len(self._buffer):
+            return
+        # Crescimento geométrico: anexar deltas custa O(delta) amortizado
+        grown = np.zeros((max(rows, 2 * len(self._buffer)), dim), dtype=np.float32)
+        if used:
+            grown[:used] = self._buffer[:used]
+        self._buffer = grown
+
+    def sync_index(self) -> None:
+        """
+        Alinha o índice ANN ao snapshot atual, fora do caminho da busca.
+
+        Roda no warm-up e depois de cada refresh: linhas anexadas são
+        inseridas; se linhas existentes mudaram (alteradas/removidas), o índice
+        é reconstruído em paralelo às buscas, que usam a força bruta até a
+        troca. Levanta ValueError se o backend/parâmetros forem inválidos.
+        """
+        if self.backend == "exact":
+            return
+        with self._sync_lock:
+            snapshot = self._snapshot
+            if not len(snapshot):
+                return
+            index = self._index
+            if index is None or self._index_generation != snapshot.generation:
+                ids = snapshot.df["id"].astype(str).tolist()
+                index = build_or_load_index(
+                    ids,
+                    snapshot.matrix,
+                    self.backend,
+                    self.index_dir,
+                    # Vetores alterados desde o snapshot invalidam o índice salvo
+                    reuse=snapshot.generation == self._base_generation,
+                    source_dir=self.index_source,
+                )
+                with self._index_lock:
+                    self._index = index
+                    self._index_generation = snapshot.generation
+            elif len(index) < len(snapshot):
+                with self._index_lock:
+                    index.add(snapshot.matrix[len(index) :])
+
+    def ann_candidates(
+        self,
+        query: np.ndarray,
+        k: int,
+        snapshot: CorpusSnapshot,
+        allowed: Optional[np.ndarray] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Candidatos do índice ANN para o snapshot (None: índice ainda não
+        cobre este snapshot e a busca usa a força bruta).
+
+        A busca nunca constrói nem insere no índice (ver `sync_index`). Linhas
+        anexadas depois do último sync entram direto como candidatas: o
+        re-ranking exato as pontua. `allowed` (máscara das linhas do snapshot)
+        é aplicada dentro do índice.
+        """
+        with self._index_lock:
+            if self._index is None or self._index_generation != snapshot.generation:
+                return None
+            indexed = len(self._index)
+            if allowed is not None and indexed > len(allowed):
+                # Linhas do índice além do snapshot nunca são permitidas
+                allowed = np.pad(allowed, (0, indexed - len(allowed)))
+            rows, _ = self._index.search(query, k, allowed)
+        # Linhas anexadas depois deste snapshot ficam de fora
+        rows = rows[rows < len(snapshot)]
+        if indexed < len(snapshot):
+            pending = np.arange(indexed, len(snapshot))
+            if allowed is not None:
+                pending = pending[allowed[pending]]
+            rows = np.concatenate([rows, pending])
+        return rows
+
+    def lexical_index(self, snapshot: CorpusSnapshot) -> BM25Index:
+        """
+        Índice BM25 sincronizado sob demanda com o snapshot.
+
+        Linhas anexadas são indexadas incrementalmente; se linhas existentes
+        mudaram desde a construção (ex.: backfill), o índice é reconstruído.
+        """
+        with self._lexical_lock:
+            if self._lexical is None or self._lexical_generation != self._generation:
+                self._lexical = BM25Index()
+                self._lexical_generation = self._generation
+            if len(self._lexical) < len(snapshot):
+                self._lexical.add(lexical_text(snapshot.df.iloc[len(self._lexical) :]))
+            return self._lexical
+
+    def filter_index(self, snapshot: CorpusSnapshot) -> FilterIndex:
+        """Bitmaps de categoria e índice de datas, sincronizados como o BM25."""
+        with self._filters_lock:
+            if self._filters is None or self._filters_generation != self._generation:
+                self._filters = FilterIndex()
+                self._filters_generation = self._generation
+            if len(self._filters) < len(snapshot):
+                delta = snapshot.df.iloc[len(self._filters) :]
+                self._filters.add(
+                    _column(delta, "categories").tolist(),
+                    _column(delta, "published").tolist(),
+                )
+            return self._filters
+
+    def duplicates(self, snapshot: CorpusSnapshot) -> DuplicateClusters:
+        """
+        Clusters de quase-duplicatas, sincronizados como o BM25.
+
+        Só as linhas anexadas são projetadas nas assinaturas LSH; os clusters
+        (ordenação por banda + checagem exata) são refeitos quando o corpus muda.
+        """
+        with self._dedup_lock:
+            if (
+                self._dedup is None
+                or self._dedup_generation != self._generation
+                or len(self._dedup.planes) != snapshot.matrix.shape[1]
+            ):
+                self._dedup = DuplicateIndex(
+                    snapshot.matrix.shape[1],
+                    bits=settings.DEDUP_BITS,
+                    bands=settings.DEDUP_BANDS,
+                    threshold=settings.DEDUP_THRESHOLD,
+                    window=settings.DEDUP_WINDOW,
+                )
+                self._duplicates = None
+                self._dedup_generation = self._generation
+            if len(self._dedup) < len(snapshot):
+                self._dedup.add(snapshot.matrix[len(self._dedup) :])
+                self._duplicates = None
+            if self._duplicates is None:
+                self._duplicates = self._dedup.clusters(snapshot.matrix)
+            return self._duplicates
+
+    def rows_for_ids(self, ids: List[str], snapshot: CorpusSnapshot) -> np.ndarray:
+        """
+        Linhas do snapshot dos artigos `ids` (índice id -> linha, sincronizado
+        como o BM25). Levanta KeyError com os ids que não estão no corpus.
+        """
+        with self._ids_lock:
+            if self._ids_generation != self._generation:
+                self._ids, self._ids_rows = {}, 0
+                self._ids_generation = self._generation
+            if self._ids_rows < len(snapshot):
+                delta = snapshot.df["id"].iloc[self._ids_rows :].astype(str)
+                self._ids.update(zip(delta, range(self._ids_rows, len(snapshot))))
+                self._ids_rows = len(snapshot)
+            rows = [self._ids.get(str(i)) for i in ids]
+        missing = [
+            i for i, row in zip(ids, rows) if row is None or row >= len(snapshot)
+        ]
+        if missing:
+            raise KeyError(missing)
+        return np.array(rows, dtype=np.int64)
+
+    def start_auto_refresh(self, interval_seconds: float) -> None:
+        """Refresh incremental periódico em uma thread daemon (0 desativa)."""
+        if interval_seconds <= 0 or self._thread is not None:
+            return
+
+        def loop():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.refresh()
+                    self.sync_index()
+                except Exception as e:
+                    # S3 indisponível: mantém o corpus atual e tenta no próximo ciclo
+                    self.last_error = str(e)
+
+        self._thread = threading.Thread(target=loop, name="silver-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,135 @@
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import numpy as np
+import orjson
+import pandas as pd
+
+SNAPSHOT_FORMAT = "arxiv-embedding-snapshot"
+SNAPSHOT_VERSION = 1
+
+HEADER_FILE = "header.json"
+MATRIX_FILE = "embeddings.npy"
+ROWS_FILE = "rows.json"
+
+
+@dataclass(frozen=True)
+class SnapshotHeader:
+    """Cabeçalho do snapshot: identifica o espaço vetorial e o tamanho da matriz."""
+
+    model_name: str
+    dim: int
+    rows: int
+    created_at: str
+    watermark: Optional[datetime] = None
+    version: int = SNAPSHOT_VERSION
+
+
+@dataclass(frozen=True)
+class EmbeddingSnapshot:
+    header: SnapshotHeader
+    matrix: np.ndarray  # np.memmap somente leitura (rows x dim, float32)
+    df: pd.DataFrame  # metadados: linha i do df == linha i da matriz
+    keys: List[str]  # chave da Silver de cada linha
+    etags: List[str]
+    excluded: Dict[str, str]  # chaves de outro MODEL_NAME -> ETag
+
+
+def _replace(directory: str, name: str, data: bytes) -> None:
+    # Escreve em arquivo temporário + rename: leitores nunca veem arquivo pela metade
+    tmp = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, os.path.join(directory, name))
+
+
+def write_snapshot(
+    directory: str,
+    df: pd.DataFrame,
+    matrix: np.ndarray,
+    keys: List[str],
+    etags: List[str],
+    model_name: str,
+    watermark: Optional[datetime] = None,
+    excluded: Optional[Dict[str, str]] = None,
+) -> SnapshotHeader:
+    """
+    Grava o snapshot do corpus em `directory`:
+    * `embeddings.npy`: matriz float32 normalizada (aberta depois com np.memmap);
+    * `rows.json`: tabela lateral linha -> chave/ETag/metadados (sem embeddings);
+    * `header.json`: formato, modelo, dimensão e linhas, gravado por último.
+    """
+    if not (len(df) == len(matrix) == len(keys) == len(etags)):
+        raise ValueError(
+            "df, matriz, chaves e ETags devem ter o mesmo número de linhas."
+        )
+    os.makedirs(directory, exist_ok=True)
+
+    header = SnapshotHeader(
+        model_name=model_name,
+        dim=int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+        rows=len(matrix),
+        created_at=datetime.now(timezone.utc).isoformat(),
+        watermark=watermark,
+    )
+    tmp = os.path.join(directory, f".{MATRIX_FILE}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+    os.replace(tmp, os.path.join(directory, MATRIX_FILE))
+
+    metadata = df.drop(columns="embedding", errors="ignore")
+    rows = {
+        "keys": keys,
+        "etags": etags,
+        "excluded": excluded or {},
+        "columns": list(metadata.columns),
+        "data": metadata.to_numpy(dtype=object).tolist(),
+    }
+    _replace(
+        directory, ROWS_FILE, orjson.dumps(rows, option=orjson.OPT_SERIALIZE_NUMPY)
+    )
+    _replace(
+        directory,
+        HEADER_FILE,
+        orjson.dumps({"format": SNAPSHOT_FORMAT, **asdict(header)}),
+    )
+    return header
+
+
+def read_snapshot(directory: str, model_name: str) -> EmbeddingSnapshot:
+    """
+    Abre o snapshot sem copiar a matriz: `np.load(mmap_mode="r")` mapeia o
+    arquivo, então processos que abrem o mesmo snapshot compartilham as
+    páginas pelo cache do SO. Levanta ValueError se o snapshot for de outro
+    modelo/formato ou estiver inconsistente (ex.: escrita concorrente).
+    """
+    with open(os.path.join(directory, HEADER_FILE), "rb") as f:
+        raw = orjson.loads(f.read())
+    if raw.pop("format", None) != SNAPSHOT_FORMAT:
+        raise ValueError(f"{directory} não contém um snapshot de embeddings.")
+    if raw.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Versão de snapshot não suportada: {raw.get('version')}.")
+    if raw.get("watermark"):
+        raw["watermark"] = datetime.fromisoformat(raw["watermark"])
+    header = SnapshotHeader(**raw)
+    if header.model_name != model_name:
+        raise ValueError(
+            f"Snapshot gerado por {header.model_name}, esperado {model_name}."
+        )
+
+    matrix = np.load(os.path.join(directory, MATRIX_FILE), mmap_mode="r")
+    with open(os.path.join(directory, ROWS_FILE), "rb") as f:
+        rows = orjson.loads(f.read())
+    if matrix.shape != (header.rows, header.dim) or len(rows["keys"]) != header.rows:
+        raise ValueError(f"Snapshot inconsistente em {directory}.")
+
+    df = pd.DataFrame(rows["data"], columns=rows["columns"])
+    return EmbeddingSnapshot(
+        header=header,
+        matrix=matrix,
+        df=df,
+        keys=rows["keys"],
+        etags=rows["etags"],
+        excluded=rows["excluded"],
+    )
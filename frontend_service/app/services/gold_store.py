@@ -0,0 +1,176 @@
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+import orjson
+from botocore.exceptions import ClientError
+
+# Marcador local com a versão Gold em uso: leitores resolvem o diretório por ele
+VERSION_FILE = "GOLD_VERSION"
+# Subdiretório do SNAPSHOT_DIR com as versões Gold baixadas pelo frontend/API
+GOLD_SUBDIR = "gold"
+
+
+def new_version() -> str:
+    """Versões ordenáveis lexicograficamente: timestamp UTC + sufixo aleatório."""
+    now = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"{now}-{uuid.uuid4().hex[:8]}"
+
+
+def local_version_dir(dest_dir: str) -> Optional[str]:
+    """Diretório da versão Gold apontada pelo marcador de `dest_dir` (ou None)."""
+    try:
+        version = (Path(dest_dir) / VERSION_FILE).read_text().strip()
+    except OSError:
+        return None
+    directory = os.path.join(dest_dir, version)
+    return directory if version and os.path.isdir(directory) else None
+
+
+def _local_files(directory: str) -> List[str]:
+    root = Path(directory)
+    return sorted(
+        str(path.relative_to(root)).replace(os.sep, "/")
+        for path in root.rglob("*")
+        if path.is_file() and not path.name.startswith(".")
+    )
+
+
+class GoldStore:
+    """
+    Camada Gold: artefatos de busca prontos, versionados no bucket Gold.
+
+    Layout:
+    * `versions/<versão>/...`: snapshot (header, matriz, tabela lateral) e
+      índice vetorial de uma execução do job de build; nunca sobrescritos;
+    * `latest.json`: ponteiro para a versão publicada. Um PUT no S3 é atômico,
+      então consumidores veem o ponteiro antigo ou o novo, nunca uma versão
+      pela metade (os artefatos sobem antes do ponteiro).
+    """
+
+    def __init__(
+        self,
+        s3,
+        bucket: str,
+        prefix: str = "versions/",
+        latest_key: str = "latest.json",
+    ):
+        self.s3 = s3
+        self.bucket = bucket
+        self.prefix = prefix
+        self.latest_key = latest_key
+
+    def ensure_bucket(self) -> None:
+        try:
+            self.s3.head_bucket(Bucket=self.bucket)
+        except ClientError:
+            self.s3.create_bucket(Bucket=self.bucket)
+
+    def latest(self) -> Optional[dict]:
+        """Ponteiro publicado (com o ETag, para a troca condicional) ou None."""
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=self.latest_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        pointer = orjson.loads(response["Body"].read())
+        pointer["etag"] = response.get("ETag")
+        return pointer
+
+    def publish(self, local_dir: str, version: str, metadata: dict) -> dict:
+        """
+        Sobe os arquivos de `local_dir` em `versions/<versão>/` e troca o ponteiro.
+
+        A troca é condicional (If-Match no ETag lido / If-None-Match no primeiro
+        publish): dois jobs concorrentes não sobrescrevem o ponteiro um do outro
+        às cegas; o perdedor falha com PreconditionFailed e sua versão fica
+        órfã, sem afetar consumidores.
+        """
+        previous = self.latest()
+        files = _local_files(local_dir)
+        prefix = f"{self.prefix}{version}/"
+        for name in files:
+            # upload_file usa multipart automaticamente para a matriz grande
+            self.s3.upload_file(
+                os.path.join(local_dir, name), self.bucket, prefix + name
+            )
+
+        pointer = {
+            "version": version,
+            "prefix": prefix,
+            "files": files,
+            "published_at": datetime.now(timezone.utc).isoformat(),
+            **metadata,
+        }
+        condition = {"IfMatch": previous["etag"]} if previous else {"IfNoneMatch": "*"}
+        self.s3.put_object(
+            Bucket=self.bucket,
+            Key=self.latest_key,
+            Body=orjson.dumps(pointer),
+            ContentType="application/json",
+            **condition,
+        )
+        return pointer
+
+    def sync_latest(self, dest_dir: str) -> Optional[str]:
+        """
+        Baixa a versão publicada para `dest_dir/<versão>/` e retorna esse diretório.
+
+        Cada versão é baixada em um diretório temporário, renomeado inteiro para
+        `<versão>/`; só então o marcador VERSION_FILE (rename atômico) passa a
+        apontar para ela. Leitores resolvem o marcador uma vez
+        (`local_version_dir`) e leem tudo do mesmo diretório, então nunca
+        misturam arquivos de versões diferentes. Versões antigas são removidas,
+        menos a anterior (um leitor pode estar abrindo-a). Retorna None se não
+        há Gold.
+        """
+        pointer = self.latest()
+        if pointer is None:
+            return None
+
+        version = pointer["version"]
+        target = os.path.join(dest_dir, version)
+        if local_version_dir(dest_dir) == target:
+            return target
+
+        os.makedirs(dest_dir, exist_ok=True)
+        if not os.path.isdir(target):
+            staging = tempfile.mkdtemp(prefix=".gold-", dir=dest_dir)
+            try:
+                for name in pointer["files"]:
+                    path = os.path.join(staging, name)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    self.s3.download_file(self.bucket, pointer["prefix"] + name, path)
+                try:
+                    os.rename(staging, target)
+                except OSError:
+                    # Outro processo publicou a mesma versão localmente antes
+                    if not os.path.isdir(target):
+                        raise
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+        previous = local_version_dir(dest_dir)
+        marker = tempfile.NamedTemporaryFile(
+            "w", prefix=".marker-", dir=dest_dir, delete=False
+        )
+        with marker:
+            marker.write(version)
+        os.replace(marker.name, os.path.join(dest_dir, VERSION_FILE))
+        self._prune(dest_dir, keep={target, previous})
+        return target
+
+    @staticmethod
+    def _prune(dest_dir: str, keep: set) -> None:
+        """Remove versões locais fora de `keep`; ignora temporários (`.`) em uso."""
+        for entry in os.scandir(dest_dir):
+            if (
+                entry.is_dir()
+                and not entry.name.startswith(".")
+                and entry.path not in keep
+            ):
+                shutil.rmtree(entry.path, ignore_errors=True)
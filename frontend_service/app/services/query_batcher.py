@@ -0,0 +1,80 @@
+import asyncio
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+
+EmbedBatch = Callable[[List[str]], np.ndarray]
+
+
+class QueryBatcher:
+    """
+    Micro-batching assíncrono dos embeddings de query.
+
+    Requisições concorrentes entram numa fila; o primeiro item abre uma janela
+    de até `max_wait_ms` (ou `max_batch_size` itens) e o lote inteiro vira um
+    único forward pass, executado fora do event loop. Sob carga o custo do
+    modelo é dividido entre as queries; sem carga, a espera é só a janela.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatch,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+        self.batches = 0  # forward passes executados (observabilidade/testes)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        # Fila criada aqui para pertencer ao event loop da aplicação
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def embed(self, query: str) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, future))
+        return await future
+
+    async def _next_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            queries = [query for query, _ in batch]
+            try:
+                vectors = await asyncio.to_thread(self.embed_batch, queries)
+            except Exception as e:
+                # Falha do lote é repassada a cada requisição, o loop continua
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            for (_, future), vector in zip(batch, vectors):
+                # Requisição cancelada (cliente desconectou) não tem mais quem leia
+                if not future.done():
+                    future.set_result(vector)
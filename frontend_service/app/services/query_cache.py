@@ -0,0 +1,61 @@
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
+
+
+def normalize_query(query: str, lowercase: bool = False) -> str:
+    """
+    Chave canônica da query: Unicode NFKC + espaços colapsados.
+
+    `lowercase` só deve ser usado com tokenizers que já ignoram caixa
+    (ex.: all-MiniLM-L6-v2), senão queries distintas dividiriam o mesmo vetor.
+    """
+    key = " ".join(unicodedata.normalize("NFKC", query).split())
+    return key.casefold() if lowercase else key
+
+
+class QueryEmbeddingCache:
+    """LRU limitado de embeddings de query, thread-safe, com estatísticas de acerto."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        if self.maxsize <= 0:
+            return
+        # Somente-leitura: o mesmo array é devolvido a buscas concorrentes
+        vector.setflags(write=False)
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
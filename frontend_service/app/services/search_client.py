@@ -0,0 +1,68 @@
+from typing import List, Optional
+import requests
+from app.index.filters import SearchFilters
+
+
+def _filter_payload(filters: Optional[SearchFilters]) -> dict:
+    filters = filters or SearchFilters()
+    return {
+        "categories": list(filters.categories),
+        "start": filters.start.isoformat() if filters.start else None,
+        "end": filters.end.isoformat() if filters.end else None,
+    }
+
+
+class SearchClient:
+    """
+    Cliente HTTP da API de busca (app/api), com a mesma interface do SearchEngine
+    usada pela UI: `search`, `similar`, `status` e `refresh`.
+
+    Com SEARCH_API_URL definida o Streamlit vira um cliente fino: nenhuma réplica
+    da UI carrega torch, modelo ou corpus.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        # Sessão reaproveita conexões HTTP entre reruns do Streamlit
+        self.session = requests.Session()
+
+    def _request(self, method: str, path: str, **kwargs):
+        response = self.session.request(
+            method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        mode: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[dict]:
+        payload = {"query": query, "top_k": top_k, "mode": mode}
+        payload.update(_filter_payload(filters))
+        return self._request("POST", "/search", json=payload)["results"]
+
+    def similar(
+        self,
+        ids: List[str],
+        top_k: int = 5,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[dict]:
+        payload = {"ids": list(ids), "top_k": top_k}
+        payload.update(_filter_payload(filters))
+        try:
+            return self._request("POST", "/similar", json=payload)["results"]
+        except requests.HTTPError as e:
+            # Mesmo contrato do SearchEngine.similar: id fora do corpus -> KeyError
+            if e.response is not None and e.response.status_code == 404:
+                raise KeyError(list(ids)) from e
+            raise
+
+    def status(self) -> dict:
+        return self._request("GET", "/status")
+
+    def refresh(self) -> dict:
+        return self._request("POST", "/refresh")
@@ -1,108 +1,485 @@
-import streamlit as st
+import os
 import pandas as pd
 import boto3
-import json
-from io import BytesIO
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+import numpy as np
+from functools import lru_cache
 from transformers import AutoTokenizer, AutoModel
 import torch
+from botocore.config import Config
+from opentelemetry import trace
+from typing import List, Optional
 from app.core.config import settings
+from app.core.tracing import tracer
+from app.index.base import normalize_rows, top_k as top_k_rows
+from app.index.filters import SearchFilters
+from app.services.bucket_stats import BucketStatsProvider
+from app.services.corpus import Corpus, CorpusSnapshot
+from app.services.gold_store import GOLD_SUBDIR, GoldStore, local_version_dir
+from app.services.query_cache import QueryEmbeddingCache, normalize_query
+from app.services.silver_loader import ProgressCallback, SilverLoader
 
 
 class SearchEngine:
+    """
+    Busca sobre o corpus da Silver, sem dependência de UI.
+
+    Usado em processo pelo Streamlit (desenvolvimento local) ou atrás da API de
+    busca (`app/api`), que compartilha um único engine entre as requisições.
+    """
+
     def __init__(self):
-        self.s3 = boto3.client(
+        self.s3 = self._s3_client()
+        self.tokenizer = None
+        self.model = None
+        self.corpus: Optional[Corpus] = None
+        self.query_cache = QueryEmbeddingCache(settings.QUERY_CACHE_SIZE)
+        self.stats = BucketStatsProvider(
+            self.s3,
+            settings.STATS_KEY,
+            ttl_seconds=settings.STATS_TTL_SECONDS,
+            skip_prefixes=(
+                settings.DEAD_LETTER_PREFIX,
+                settings.LEASE_PREFIX,
+                settings.FULLTEXT_PREFIX,
+            ),
+        )
+        # Protegem a inicialização preguiçosa quando há buscas concorrentes
+        self._lock = threading.Lock()
+        self._corpus_lock = threading.Lock()
+
+    @staticmethod
+    def _s3_client():
+        return boto3.client(
             "s3",
             endpoint_url=settings.S3_ENDPOINT,
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             region_name=settings.AWS_REGION,
+            # Pool HTTP do tamanho da concorrência de carga (padrão do botocore: 10)
+            config=Config(max_pool_connections=settings.LOAD_CONCURRENCY),
         )
-        self.tokenizer = None
-        self.model = None
-        self.df = pd.DataFrame()
 
-    @st.cache_resource
-    def load_model(_self):
-        """Carrega o modelo BERT para memória (Singleton)."""
+    def reset_s3_client(self) -> None:
+        """
+        Troca o cliente S3 (e o pool HTTP) por um novo, deste processo.
+
+        Clientes boto3 não são seguros através de fork: depois do preload no
+        mestre do gunicorn, cada worker chama este método antes de usar o S3.
+        """
+        self.s3 = self._s3_client()
+        self.stats.s3 = self.s3
+        if self.corpus is not None:
+            self.corpus.loader.s3 = self.s3
+
+    def load_model(self):
+        """Carrega o modelo BERT para memória."""
         tokenizer = AutoTokenizer.from_pretrained(settings.MODEL_NAME)
         model = AutoModel.from_pretrained(settings.MODEL_NAME)
         return tokenizer, model
 
-    @st.cache_data
-    def load_data(_self):
-        """Baixa TODOS os JSONs da Silver e cria um DataFrame."""
-        # 1. Listar objetos
+    def load_corpus(
+        self, progress: Optional[ProgressCallback] = None, auto_refresh: bool = True
+    ) -> Corpus:
+        """
+        Corpus da Silver (uma vez por engine): carga completa, depois só deltas.
+
+        O refresh em background (REFRESH_INTERVAL_SECONDS) mantém os resultados
+        atualizados sem recarregar tudo. Com SNAPSHOT_DIR, a carga inicial abre
+        o snapshot em disco (np.memmap) e só o delta vem da Silver; se houve
+        delta, o snapshot é regravado para o próximo start. Com USE_GOLD, o
+        snapshot e o índice publicados pelo job Gold (em SNAPSHOT_DIR/gold/<versão>,
+        imutável) substituem o snapshot local e o delta é reaplicado a cada start;
+        o índice da versão só é lido e qualquer reconstrução vai para INDEX_DIR
+        (padrão: SNAPSHOT_DIR/index).
+        """
+        with self._corpus_lock:
+            if self.corpus is not None:
+                return self.corpus
+
+            loader = SilverLoader(
+                self.s3,
+                settings.S3_BUCKET_SILVER,
+                concurrency=settings.LOAD_CONCURRENCY,
+                skip_keys=[settings.STATS_KEY],
+            )
+            snapshot_dir = settings.SNAPSHOT_DIR
+            index_dir = settings.INDEX_DIR
+            if snapshot_dir and not index_dir:
+                # Índice ao lado do snapshot (layout dos artefatos Gold)
+                index_dir = os.path.join(snapshot_dir, "index")
+            corpus = Corpus(loader, index_dir=index_dir)
+            gold_dir = None
+            if snapshot_dir and settings.USE_GOLD:
+                gold_root = os.path.join(snapshot_dir, GOLD_SUBDIR)
+                try:
+                    gold_dir = GoldStore(
+                        self.s3,
+                        settings.S3_BUCKET_GOLD,
+                        settings.GOLD_PREFIX,
+                        settings.GOLD_LATEST_KEY,
+                    ).sync_latest(gold_root)
+                except Exception as e:
+                    # Gold indisponível: última versão baixada, snapshot local ou Silver
+                    corpus.last_error = str(e)
+                    gold_dir = local_version_dir(gold_root)
+            if gold_dir:
+                # Índice publicado junto da versão: só leitura (a versão é
+                # imutável); reconstruções vão para o INDEX_DIR de trabalho
+                corpus.index_source = os.path.join(gold_dir, "index")
+            source_dir = gold_dir or snapshot_dir
+            if source_dir and os.path.isdir(source_dir):
+                try:
+                    corpus.load_snapshot(source_dir)
+                except (OSError, ValueError) as e:
+                    # Snapshot ausente/de outro modelo: carga completa da Silver
+                    corpus.last_error = str(e)
+            try:
+                stats = corpus.refresh(progress)
+                if snapshot_dir and not gold_dir and stats["fetched"]:
+                    corpus.save_snapshot(snapshot_dir)
+            except Exception as e:
+                # Silver indisponível: corpus vazio (ou do snapshot) até o próximo refresh
+                corpus.last_error = str(e)
+
+            if auto_refresh:
+                corpus.start_auto_refresh(settings.REFRESH_INTERVAL_SECONDS)
+            self.corpus = corpus
+            return corpus
+
+    def warm_up(self, auto_refresh: bool = True, load_model: bool = True) -> None:
+        """
+        Carrega modelo, corpus e índices antes da primeira requisição.
+
+        Com `load_model=False` (preload no mestre do gunicorn) só corpus e
+        índices são carregados: o torch não roda antes do fork (pools de
+        threads não sobrevivem a ele) e cada worker aquece o próprio modelo.
+        """
+        if load_model:
+            self.query_embeddings(["warm up"])
+        corpus = self.load_corpus(auto_refresh=auto_refresh)
+        snapshot = corpus.snapshot()
+        corpus.lexical_index(snapshot)
+        corpus.filter_index(snapshot)
+        if settings.DEDUP_ENABLED:
+            corpus.duplicates(snapshot)
         try:
-            response = _self.s3.list_objects_v2(Bucket=settings.S3_BUCKET_SILVER)
-        except Exception:
-            return pd.DataFrame()
+            # Índice ANN pronto antes da primeira busca (HNSW insere nó a nó)
+            corpus.sync_index()
+        except ValueError:
+            pass  # backend inválido: as buscas fazem fallback para a exata
 
-        if "Contents" not in response:
-            return pd.DataFrame()
+    def refresh(self) -> dict:
+        """Refresh incremental sob demanda (botão "Reload Data" / POST /refresh)."""
+        corpus = self.load_corpus()
+        stats = corpus.refresh()
+        try:
+            corpus.sync_index()
+        except ValueError:
+            pass  # backend inválido: as buscas fazem fallback para a exata
+        return stats
 
-        data = []
-        # 2. Ler cada JSON (Para prod, usar Parquet é melhor!)
-        for obj in response["Contents"]:
-            key = obj["Key"]
-            file_obj = _self.s3.get_object(Bucket=settings.S3_BUCKET_SILVER, Key=key)
-            content = json.loads(file_obj["Body"].read())
-            data.append(content)
+    def status(self) -> dict:
+        """Contagens e estado do corpus exibidos no header e na sidebar da UI."""
+        corpus = self.load_corpus()
+        snapshot = corpus.snapshot()
+        return {
+            "bronze": self.get_bronze_count(),
+            "silver": self.get_silver_count(),
+            "rows": len(snapshot),
+            "excluded_rows": snapshot.df.attrs.get("excluded_rows", 0),
+            "duplicate_rows": (
+                corpus.duplicates(snapshot).duplicates if settings.DEDUP_ENABLED else 0
+            ),
+            "categories": corpus.filter_index(snapshot).categories(),
+            "last_refresh": corpus.last_refresh,
+            "last_error": corpus.last_error,
+            "query_cache": self.query_cache.stats(),
+        }
 
-        return pd.DataFrame(data)
+    @property
+    def df(self) -> pd.DataFrame:
+        return self.corpus.df if self.corpus is not None else pd.DataFrame()
 
     def get_bronze_count(self) -> int:
-        """Retorna a contagem de objetos na camada Bronze (sem baixar conteúdo)."""
-        try:
-            response = self.s3.list_objects_v2(Bucket=settings.S3_BUCKET_BRONZE)
-            return response.get("KeyCount", 0)
-        except Exception:
-            return 0
+        """Retorna a contagem de objetos na camada Bronze (manifesto + cache TTL)."""
+        return self.stats.count(settings.S3_BUCKET_BRONZE).count
 
     def get_silver_count(self) -> int:
-        """Retorna a contagem de objetos na camada Silver (sem baixar conteúdo)."""
-        try:
-            response = self.s3.list_objects_v2(Bucket=settings.S3_BUCKET_SILVER)
-            return response.get("KeyCount", 0)
-        except Exception:
-            return 0
+        """Retorna a contagem de objetos na camada Silver (manifesto + cache TTL)."""
+        return self.stats.count(settings.S3_BUCKET_SILVER).count
 
-    def search(self, query: str, top_k: int = 5):
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        mode: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+        query_vector: Optional[np.ndarray] = None,
+    ):
+        """
+        Busca no corpus. Modos (SEARCH_MODE por padrão):
+        * "vector": similaridade de cosseno dos embeddings;
+        * "lexical": só BM25 (título + cleaned_summary), sem inferência;
+        * "hybrid": candidatos BM25 re-ranqueados pelo vetor (vetorial se nenhum termo casar);
+        * "fusion": combinação ponderada (FUSION_ALPHA) de cosseno e BM25 normalizado.
+
+        `filters` (categorias/datas) restringe os candidatos antes da pontuação.
+        `query_vector` é o embedding já calculado (ex.: micro-batch da API).
+        """
+        mode = mode or settings.SEARCH_MODE
+        with tracer.start_as_current_span(
+            "search",
+            attributes={
+                "search.mode": mode,
+                "search.top_k": top_k,
+                "search.filtered": filters is not None,
+                "search.query_vector": query_vector is not None,
+            },
+        ) as span:
+            results = self._search(query, top_k, mode, filters, query_vector)
+            span.set_attribute("search.results", len(results))
+        return results
+
+    def _search(
+        self,
+        query: str,
+        top_k: int,
+        mode: str,
+        filters: Optional[SearchFilters],
+        query_vector: Optional[np.ndarray],
+    ) -> list:
         # Inicializa resources se necessário
-        if self.model is None:
-            self.tokenizer, self.model = self.load_model()
+        self.load_corpus()
 
-        # Recarrega dados se estiver vazio (ou implementa botão de refresh)
-        if self.df.empty:
-            self.df = self.load_data()
+        # Snapshot imutável: um refresh concorrente não altera esta busca
+        snapshot = self.corpus.snapshot()
+        trace.get_current_span().set_attribute("search.corpus_rows", len(snapshot))
+        if snapshot.df.empty:
+            return []
 
-        if self.df.empty:
+        # None = sem filtro; senão, máscara das linhas permitidas
+        allowed = self.corpus.filter_index(snapshot).mask(filters, len(snapshot))
+        allowed = self._collapse_duplicates(snapshot, allowed)
+        if allowed is not None and not allowed.any():
             return []
 
-        # 1. Embed da Query
+        if mode in ("lexical", "hybrid"):
+            lex_rows, lex_scores = self._lexical_scores(query, snapshot, allowed)
+            if mode == "lexical":
+                best = top_k_rows(lex_scores, top_k)
+                return self._to_records(snapshot, lex_rows[best], lex_scores[best])
+            if len(lex_rows):
+                # Só os candidatos lexicais são pontuados com embeddings
+                candidates = lex_rows[
+                    top_k_rows(lex_scores, settings.LEXICAL_CANDIDATES)
+                ]
+                if query_vector is None:
+                    query_vector = self.query_embedding(query)
+                scores = snapshot.matrix[candidates] @ query_vector
+                best = top_k_rows(scores, top_k)
+                return self._to_records(snapshot, candidates[best], scores[best])
+
+        # 1. Embed da Query (normalizado: produto interno == cosseno)
+        query_embedding = (
+            query_vector if query_vector is not None else self.query_embedding(query)
+        )
+        # None = corpus inteiro; senão, candidatos do índice ANN
+        rows = self._vector_candidates(query_embedding, top_k, snapshot, allowed)
+
+        lex_rows = np.empty(0, dtype=np.int64)
+        if mode == "fusion":
+            lex_rows, lex_scores = self._lexical_scores(query, snapshot, allowed)
+            if rows is not None:
+                rows = np.union1d(rows, lex_rows)
+
+        # 2. Similaridade em um único matmul + top-k parcial
+        if rows is None:
+            scores = snapshot.matrix @ query_embedding
+        elif len(rows) > len(snapshot) // 2:
+            # Subconjunto grande (ex.: só duplicatas de fora): o matmul completo
+            # evita copiar quase a matriz inteira com indexação avançada
+            scores = (snapshot.matrix @ query_embedding)[rows]
+        else:
+            # Re-ranking exato só dos candidatos (scores ANN são aproximados)
+            scores = snapshot.matrix[rows] @ query_embedding
+
+        if len(lex_rows):
+            alpha = settings.FUSION_ALPHA
+            positions = lex_rows if rows is None else np.searchsorted(rows, lex_rows)
+            scores *= alpha
+            scores[positions] += (1.0 - alpha) * lex_scores / lex_scores.max()
+
+        best = top_k_rows(scores, top_k)
+        return self._to_records(
+            snapshot, best if rows is None else rows[best], scores[best]
+        )
+
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        mode: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[list]:
+        """Várias buscas com os embeddings das queries em um único forward pass."""
+        mode = mode or settings.SEARCH_MODE
+        if mode == "lexical" or not queries:
+            vectors = [None] * len(queries)
+        else:
+            vectors = self.query_embeddings(queries)
+        return [
+            self.search(query, top_k, mode, filters, vector)
+            for query, vector in zip(queries, vectors)
+        ]
+
+    def similar(
+        self,
+        ids: List[str],
+        top_k: int = 5,
+        filters: Optional[SearchFilters] = None,
+    ) -> list:
+        """
+        "Mais como este": artigos próximos dos artigos `ids`, sem inferência.
+
+        A query é o embedding já armazenado de cada artigo (linha da matriz,
+        achada pelo índice id -> linha); com vários ids, o centróide
+        normalizado. Os próprios artigos de origem ficam fora do resultado.
+        Levanta KeyError com os ids que não estão no corpus.
+        """
+        corpus = self.load_corpus()
+        snapshot = corpus.snapshot()
+        rows = corpus.rows_for_ids(ids, snapshot)
+        centroid = normalize_rows(snapshot.matrix[rows].mean(axis=0, keepdims=True))[0]
+
+        sources = set(snapshot.df["id"].iloc[rows].astype(str))
+        results = self.search(
+            "", top_k + len(sources), "vector", filters, query_vector=centroid
+        )
+        return [r for r in results if str(r["id"]) not in sources][:top_k]
+
+    def _collapse_duplicates(
+        self, snapshot: CorpusSnapshot, allowed: Optional[np.ndarray]
+    ) -> Optional[np.ndarray]:
+        # Quase-duplicatas (LSH + cosseno exato) aparecem só pela linha canônica
+        if not settings.DEDUP_ENABLED:
+            return allowed
+        canonical = self.corpus.duplicates(snapshot).collapsed_mask(len(snapshot))
+        if canonical is None:
+            return allowed
+        return canonical if allowed is None else allowed & canonical
+
+    def _vector_candidates(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        snapshot: CorpusSnapshot,
+        allowed: Optional[np.ndarray] = None,
+    ) -> Optional[np.ndarray]:
+        # Com filtro, a força bruta só percorre as linhas permitidas
+        subset = None if allowed is None else np.flatnonzero(allowed)
+        if settings.INDEX_BACKEND == "exact":
+            return subset
+        if subset is not None and len(subset) <= settings.FILTER_BRUTE_FORCE_MAX:
+            # Filtro seletivo: matmul no subconjunto é exato e mais barato que o ANN
+            return subset
+        candidates = self.corpus.ann_candidates(
+            query_embedding,
+            top_k * settings.INDEX_RERANK_FACTOR,
+            snapshot,
+            allowed,
+        )
+        # Índice ainda não sincronizado ou inválido (ex.: PQ_M não divide a
+        # dimensão): fallback para a busca exata por força bruta
+        return subset if candidates is None else candidates
+
+    def _lexical_scores(
+        self,
+        query: str,
+        snapshot: CorpusSnapshot,
+        allowed: Optional[np.ndarray] = None,
+    ):
+        rows, scores = self.corpus.lexical_index(snapshot).score(query)
+        # Linhas anexadas depois deste snapshot ficam de fora
+        keep = rows < len(snapshot)
+        rows, scores = rows[keep], scores[keep]
+        if allowed is not None:
+            keep = allowed[rows]
+            rows, scores = rows[keep], scores[keep]
+        return rows, scores
+
+    def _cache_key(self, query: str) -> str:
+        with self._lock:
+            if self.model is None:
+                self.tokenizer, self.model = self.load_model()
+
+        lowercase = getattr(self.tokenizer, "do_lower_case", False) is True
+        return normalize_query(query, lowercase=lowercase)
+
+    def query_embedding(self, query: str) -> np.ndarray:
+        """Embedding normalizado da query, servido do LRU quando possível."""
+        key = self._cache_key(query)
+        vector = self.query_cache.get(key)
+        if vector is None:
+            vector = normalize_rows(self.embed_query(key))[0]
+            self.query_cache.put(key, vector)
+        return vector
+
+    def query_embeddings(self, queries: List[str]) -> np.ndarray:
+        """
+        Embeddings normalizados de várias queries (uma linha por query).
+
+        Consultas fora do LRU (sem repetição) são calculadas em um único forward
+        pass: é o caminho do /search/batch e do micro-batching da API.
+        """
+        keys = [self._cache_key(query) for query in queries]
+        vectors = {key: self.query_cache.get(key) for key in dict.fromkeys(keys)}
+        missing = [key for key, vector in vectors.items() if vector is None]
+        if missing:
+            # Só misses do LRU chegam ao modelo: o span mostra o custo real do BERT
+            with tracer.start_as_current_span(
+                "search.embed_queries", attributes={"search.queries": len(missing)}
+            ):
+                embedded = normalize_rows(self.embed_queries(missing))
+            for key, vector in zip(missing, embedded):
+                self.query_cache.put(key, vector)
+                vectors[key] = vector
+        return np.stack([vectors[key] for key in keys])
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return self.embed_queries([query])[0]
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
         inputs = self.tokenizer(
-            query, return_tensors="pt", padding=True, truncation=True, max_length=512
+            queries, return_tensors="pt", padding=True, truncation=True, max_length=512
         )
         with torch.no_grad():
             outputs = self.model(**inputs)
 
-        # Mean Pooling (Mesma lógica da Fase 2)
+        # Mean Pooling (Mesma lógica da Fase 2); padding não entra na média
         embeddings = outputs.last_hidden_state
         attention_mask = inputs["attention_mask"]
         mask_expanded = attention_mask.unsqueeze(-1).expand(embeddings.size()).float()
         sum_embeddings = torch.sum(embeddings * mask_expanded, 1)
         sum_mask = torch.clamp(mask_expanded.sum(1), min=1e-9)
-        query_embedding = (sum_embeddings / sum_mask)[0].numpy()
+        return (sum_embeddings / sum_mask).numpy()
 
-        # 2. Calcular Similaridade (Matrix operation)
-        # Assume que o DF tem coluna 'embedding' como lista de floats
-        doc_embeddings = list(self.df["embedding"].values)
+    def _to_records(
+        self, snapshot: CorpusSnapshot, rows: np.ndarray, scores: np.ndarray
+    ) -> list[dict]:
+        # 3. Copia só as linhas retornadas: o DataFrame do corpus nunca é alterado
+        results = snapshot.df.iloc[rows].copy()
+        results["score"] = scores
+        return results.to_dict("records")
 
-        # Scikit-learn cosine_similarity
-        scores = cosine_similarity([query_embedding], doc_embeddings)[0]
 
-        # 3. Adicionar scores e filtrar
-        self.df["score"] = scores
-        results = self.df.sort_values(by="score", ascending=False).head(top_k)
+@lru_cache(maxsize=1)
+def get_search_engine() -> SearchEngine:
+    """
+    SearchEngine único do processo (cliente S3, modelo, corpus e cache de queries).
 
-        return results.to_dict("records")
+    O Streamlit re-executa `main()` a cada interação e a API atende requisições
+    concorrentes; sem isso cada rerun/requisição criaria um engine vazio e o LRU
+    de queries nunca acertaria.
+    """
+    return SearchEngine()
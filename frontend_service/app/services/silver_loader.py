@@ -0,0 +1,119 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+import numpy as np
+import pandas as pd
+from app.core.codecs import codec_for
+
+# Callback de progresso: (carregados, total)
+ProgressCallback = Callable[[int, int], None]
+
+logger = logging.getLogger(__name__)
+
+
+class SilverObject(NamedTuple):
+    key: str
+    etag: str
+    last_modified: datetime
+
+
+class SilverLoader:
+    """
+    Carrega a camada Silver inteira para um DataFrame colunar.
+
+    * Lista com paginator (`list_objects_v2` sozinho para em 1.000 chaves);
+    * GETs em um pool de threads limitado (clientes boto3 são thread-safe);
+    * Cada objeto é decodificado pelo seu Content-Type (JSON via `orjson` ou
+      msgpack com o vetor em float32 binário) direto para colunas pré-alocadas,
+      com os embeddings em um único array float32 (N x dim) em vez de N listas Python.
+    O callback de progresso roda na thread chamadora (seguro para o Streamlit).
+
+    Um objeto ruim não derruba a carga: falhas de GET/decodificação são logadas
+    com a chave e puladas (`df.attrs["failed"]`), assim como registros sem
+    `embedding` (`df.attrs["skipped"]`). O frame traz só as linhas carregadas e
+    `df.attrs["keys"]` é a chave de cada linha.
+    """
+
+    def __init__(
+        self, s3, bucket: str, concurrency: int = 32, skip_keys: Sequence[str] = ()
+    ):
+        self.s3 = s3
+        self.bucket = bucket
+        self.concurrency = concurrency
+        # Objetos que não são artigos (ex.: manifesto de contagem)
+        self.skip_keys = set(skip_keys)
+
+    def list_objects(self) -> List[SilverObject]:
+        """Chaves com ETag/LastModified (base do refresh incremental)."""
+        paginator = self.s3.get_paginator("list_objects_v2")
+        objects = []
+        for page in paginator.paginate(Bucket=self.bucket):
+            objects.extend(
+                SilverObject(obj["Key"], obj.get("ETag", ""), obj.get("LastModified"))
+                for obj in page.get("Contents", [])
+                if obj["Key"] not in self.skip_keys
+            )
+        return objects
+
+    def list_keys(self) -> List[str]:
+        return [obj.key for obj in self.list_objects()]
+
+    def fetch(self, key: str) -> dict:
+        response = self.s3.get_object(Bucket=self.bucket, Key=key)
+        return codec_for(response.get("ContentType")).decode(response["Body"].read())
+
+    def load(
+        self, keys: List[str], progress: Optional[ProgressCallback] = None
+    ) -> pd.DataFrame:
+        total = len(keys)
+        if not total:
+            return pd.DataFrame()
+
+        # Colunas pré-alocadas: a linha i é sempre a chave i (ordem estável)
+        columns: Dict[str, list] = {}
+        embeddings: Optional[np.ndarray] = None
+        loaded = np.zeros(total, dtype=bool)
+        failed: List[str] = []
+        skipped: List[str] = []
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {
+                pool.submit(self.fetch, key): row for row, key in enumerate(keys)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                row = futures[future]
+                if progress:
+                    progress(done, total)
+                try:
+                    record = future.result()
+                    vector = np.asarray(record.pop("embedding", None), dtype=np.float32)
+                    if vector.ndim != 1 or not vector.size:
+                        # Sem vetor não há linha na matriz (nada de zeros)
+                        logger.warning("Silver %s sem embedding; ignorado", keys[row])
+                        skipped.append(keys[row])
+                        continue
+                    if embeddings is None:
+                        embeddings = np.zeros((total, len(vector)), dtype=np.float32)
+                    embeddings[row] = vector
+                except Exception as e:
+                    logger.warning("Falha ao carregar Silver %s: %s", keys[row], e)
+                    failed.append(keys[row])
+                    continue
+
+                for field, value in record.items():
+                    if field not in columns:
+                        columns[field] = [None] * total
+                    columns[field][row] = value
+                loaded[row] = True
+
+        df = pd.DataFrame(columns, index=range(total))
+        if embeddings is not None:
+            # Cada célula é uma view da linha no array contíguo (sem cópia)
+            df["embedding"] = list(embeddings)
+        if not loaded.all():
+            df = df[loaded].reset_index(drop=True)
+        df.attrs["keys"] = [key for key, ok in zip(keys, loaded) if ok]
+        df.attrs["failed"] = failed
+        df.attrs["skipped"] = skipped
+        return df
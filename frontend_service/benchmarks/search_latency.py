@@ -0,0 +1,65 @@
+"""
+Latência da busca exata por tamanho de corpus (embeddings sintéticos).
+
+Compara o caminho antigo (lista de vetores por query + cosseno + `sort_values`
+no DataFrame inteiro) com a matriz pré-normalizada (um matmul + `argpartition`).
+
+Uso:
+    poetry run python -m benchmarks.search_latency --sizes 1000 10000 100000
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from app.index.base import normalize_rows, top_k
+from app.services.corpus import build_embedding_matrix
+
+
+def legacy_search(df: pd.DataFrame, query: np.ndarray, k: int) -> pd.DataFrame:
+    # Reproduz o SearchEngine.search original (sem scikit-learn)
+    docs = np.asarray(list(df["embedding"].values))
+    docs = docs / np.linalg.norm(docs, axis=1, keepdims=True)
+    scored = df.copy()
+    scored["score"] = docs @ (query / np.linalg.norm(query))
+    return scored.sort_values(by="score", ascending=False).head(k)
+
+
+def matrix_search(matrix: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    scores = matrix @ normalize_rows(query)[0]
+    return top_k(scores, k)
+
+
+def measure(fn, repeats: int) -> float:
+    """Mediana da latência em milissegundos."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'N':>10} | {'legacy (ms)':>12} | {'matrix (ms)':>12} | {'speedup':>8}")
+    for n in args.sizes:
+        vectors = rng.normal(size=(n, args.dim)).astype(np.float32)
+        df = pd.DataFrame({"id": np.arange(n).astype(str), "embedding": list(vectors)})
+        query = rng.normal(size=args.dim).astype(np.float32)
+        matrix = build_embedding_matrix(df)
+
+        legacy = measure(lambda: legacy_search(df, query, args.top_k), args.repeats)
+        fast = measure(lambda: matrix_search(matrix, query, args.top_k), args.repeats)
+        print(f"{n:>10} | {legacy:>12.2f} | {fast:>12.2f} | {legacy / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
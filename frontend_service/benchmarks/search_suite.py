@@ -0,0 +1,246 @@
+"""
+Suite de benchmark da busca: latência, throughput, memória, carga e recall.
+
+Gera corpora sintéticos agrupados (padrão 384 dims, como o all-MiniLM-L6-v2),
+carrega cada um pelo caminho real (`Corpus.refresh` + índice sob demanda) e
+mede `SearchEngine.search` com o embedding da query já calculado (o custo do
+BERT fica fora: é igual para todas as variantes). Para cada tamanho x variante:
+* `load_seconds` / `index_build_seconds`: refresh do corpus / construção do índice;
+* `p50_ms`, `p95_ms`, `p99_ms`, `qps`: latência sequencial e throughput;
+* `qps_threads`: throughput com `--threads` buscas concorrentes;
+* `matrix_mb`, `index_mb`, `peak_rss_mb`: matriz, índice serializado, pico do processo;
+* `recall_at_k`: fração do top-k exato recuperada pela variante.
+
+Os resultados saem em JSON (`--output`) para dimensionar instâncias e comparar
+execuções; a tabela no stdout é só um resumo.
+
+Uso:
+    poetry run python -m benchmarks.search_suite --sizes 10000 100000 1000000 \\
+        --variants exact ivfpq-m16 --output bench.json
+
+HNSW em NumPy insere um vetor por vez: em 1M vetores a construção leva horas.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+from app.index.base import normalize_rows, top_k
+from app.services.corpus import Corpus
+from app.services.search_engine import SearchEngine
+from app.services.silver_loader import SilverObject
+
+# Variante -> overrides do settings (função do tamanho do corpus)
+VARIANTS: Dict[str, Callable[[int], dict]] = {
+    "exact": lambda n: {"INDEX_BACKEND": "exact"},
+    "hnsw": lambda n: {
+        "INDEX_BACKEND": "hnsw",
+        "HNSW_M": 16,
+        "HNSW_EF_CONSTRUCTION": 100,
+        "HNSW_EF_SEARCH": 64,
+    },
+    # Quantização: PQ_M subvetores de 1 byte por vetor (384 dims -> 16 ou 48 bytes)
+    "ivfpq-m16": lambda n: {
+        "INDEX_BACKEND": "ivfpq",
+        "IVF_NLIST": max(16, int(4 * np.sqrt(n))),
+        "IVF_NPROBE": 16,
+        "PQ_M": 16,
+    },
+    "ivfpq-m48": lambda n: {
+        "INDEX_BACKEND": "ivfpq",
+        "IVF_NLIST": max(16, int(4 * np.sqrt(n))),
+        "IVF_NPROBE": 16,
+        "PQ_M": 48,
+    },
+    # Redução de dimensão: primeira passada em 64/128 dims + re-ranking completo
+    "pca-64": lambda n: {"INDEX_BACKEND": "pca", "PCA_COMPONENTS": 64},
+    "pca-128": lambda n: {"INDEX_BACKEND": "pca", "PCA_COMPONENTS": 128},
+}
+
+
+class SyntheticSilver:
+    """Loader em memória no lugar da Silver: sem rede, mesmo caminho do Corpus."""
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+
+    def list_objects(self) -> List[SilverObject]:
+        return [SilverObject(f"{i}.json", "v1", None) for i in range(len(self.vectors))]
+
+    def load(self, keys, progress=None) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "id": [key.removesuffix(".json") for key in keys],
+                "model_name": settings.MODEL_NAME,
+                "embedding": list(self.vectors),
+            }
+        )
+
+
+def synthetic_corpus(n: int, dim: int, clusters: int = 100, seed: int = 42):
+    # Agrupados imitam tópicos de embeddings reais melhor que ruído uniforme
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 100_000):
+        stop = min(start + 100_000, n)
+        labels = rng.integers(0, clusters, size=stop - start)
+        noise = rng.normal(scale=0.6, size=(stop - start, dim)).astype(np.float32)
+        vectors[start:stop] = centers[labels] + noise
+    return vectors
+
+
+@contextmanager
+def overrides(values: dict):
+    previous = {key: getattr(settings, key) for key in values}
+    for key, value in values.items():
+        setattr(settings, key, value)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            setattr(settings, key, value)
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB; macOS, bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def index_mb(corpus: Corpus) -> float:
+    if corpus._index is None:
+        return 0.0
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.npz")
+        corpus._index.save(path)
+        return os.path.getsize(path) / 1e6
+
+
+def run_variant(
+    name: str, vectors: np.ndarray, queries: np.ndarray, args: argparse.Namespace
+) -> dict:
+    n = len(vectors)
+    # INDEX_DIR=None: cada variante constrói o índice (sem reaproveitar do disco)
+    with overrides({**VARIANTS[name](n), "INDEX_DIR": None}):
+        started = time.perf_counter()
+        corpus = Corpus(SyntheticSilver(vectors))
+        corpus.refresh()
+        load_seconds = time.perf_counter() - started
+        snapshot = corpus.snapshot()
+
+        started = time.perf_counter()
+        corpus.sync_index()  # constrói o índice (como o warm-up)
+        build_seconds = time.perf_counter() - started
+
+        with patch("app.services.search_engine.boto3"):
+            engine = SearchEngine()
+        engine.corpus = corpus
+
+        def search(q):
+            return engine.search("", top_k=args.top_k, mode="vector", query_vector=q)
+
+        # Verdade: top-k exato sobre a matriz normalizada
+        truth = [set(top_k(snapshot.matrix @ q, args.top_k).tolist()) for q in queries]
+
+        latencies, hits = [], 0
+        for q, expected in zip(queries, truth):
+            start = time.perf_counter()
+            results = search(q)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += len(expected & {int(r["id"]) for r in results})
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(search, queries))
+        threaded_seconds = time.perf_counter() - started
+
+        corpus.stop()
+        return {
+            "variant": name,
+            "n": n,
+            "dim": vectors.shape[1],
+            "top_k": args.top_k,
+            "queries": len(queries),
+            "settings": VARIANTS[name](n),
+            "load_seconds": round(load_seconds, 4),
+            "index_build_seconds": round(build_seconds, 4),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 4),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 4),
+            "qps": round(len(queries) / (sum(latencies) / 1000), 2),
+            "qps_threads": round(len(queries) / threaded_seconds, 2),
+            "threads": args.threads,
+            "matrix_mb": round(snapshot.matrix.nbytes / 1e6, 2),
+            "index_mb": round(index_mb(corpus), 2),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "recall_at_k": round(hits / (args.top_k * len(queries)), 4),
+        }
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument(
+        "--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS)
+    )
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--output", help="Arquivo JSON com os resultados")
+    args = parser.parse_args(argv)
+
+    report = {"environment": environment(), "results": []}
+    print(
+        f"{'variante':>10} | {'N':>9} | {'p50 ms':>8} | {'p99 ms':>8} | "
+        f"{'qps':>8} | {'recall':>6} | {'carga s':>8} | {'índice MB':>9}"
+    )
+    for n in args.sizes:
+        vectors = synthetic_corpus(n, args.dim)
+        rng = np.random.default_rng(7)
+        # Queries = pontos do corpus perturbados (vizinhos reais existem)
+        picks = vectors[rng.choice(n, size=args.queries)]
+        noise = rng.normal(scale=0.3, size=picks.shape).astype(np.float32)
+        queries = normalize_rows(picks + noise)
+        for name in args.variants:
+            result = run_variant(name, vectors, queries, args)
+            report["results"].append(result)
+            print(
+                f"{name:>10} | {n:>9} | {result['p50_ms']:>8.2f} | "
+                f"{result['p99_ms']:>8.2f} | {result['qps']:>8.1f} | "
+                f"{result['recall_at_k']:>6.3f} | "
+                f"{result['load_seconds'] + result['index_build_seconds']:>8.2f} | "
+                f"{result['index_mb']:>9.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
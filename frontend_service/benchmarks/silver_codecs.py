@@ -0,0 +1,82 @@
+"""
+Tamanho e custo de (de)serialização de registros da Silver por formato.
+
+Compara o JSON indentado antigo (`model_dump_json(indent=2)` + `json.loads`)
+com o JSON compacto via orjson e o msgpack com o embedding em float32 binário.
+
+Uso:
+    poetry run python -m benchmarks.silver_codecs --records 2000 --dim 384
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+from app.core.codecs import Codec, get_codec
+
+
+class LegacyJsonCodec(Codec):
+    # Reproduz o formato gravado antes do codec (stdlib, indentado)
+    name = "json-indent (legado)"
+    content_type = "application/json"
+
+    def encode(self, record: dict) -> bytes:
+        return json.dumps(record, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def decode(self, body: bytes) -> dict:
+        return json.loads(body)
+
+
+def make_records(n: int, dim: int) -> list:
+    rng = np.random.default_rng(42)
+    return [
+        {
+            "id": f"2401.{i:05d}",
+            "title": f"Paper {i} on quantum error correction",
+            "summary": "Surface codes and decoders for noisy qubits. " * 20,
+            "cleaned_summary": "surface codes decoders noisy qubits " * 20,
+            "embedding": rng.normal(size=dim).astype(np.float32).tolist(),
+            "categories": ["quant-ph", "cs.IT"],
+            "published": "2024-01-01T00:00:00",
+            "model_name": "sentence-transformers/all-MiniLM-L6-v2",
+            "cleaner_version": "regex-v1",
+        }
+        for i in range(n)
+    ]
+
+
+def measure(fn, items) -> float:
+    """Microssegundos por registro."""
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    records = make_records(args.records, args.dim)
+    codecs = [LegacyJsonCodec(), get_codec("json")]
+    try:
+        codecs.append(get_codec("msgpack"))
+    except ImportError:
+        print("msgpack não instalado: formato binário fora da comparação.")
+
+    print(
+        f"{'formato':>22} | {'bytes/registro':>14} | "
+        f"{'encode (µs)':>11} | {'decode (µs)':>11}"
+    )
+    for codec in codecs:
+        bodies = [codec.encode(record) for record in records]
+        size = sum(len(body) for body in bodies) / len(bodies)
+        encode = measure(codec.encode, records)
+        decode = measure(codec.decode, bodies)
+        print(f"{codec.name:>22} | {size:>14.0f} | {encode:>11.1f} | {decode:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
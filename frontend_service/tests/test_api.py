@@ -0,0 +1,115 @@
+import time
+from unittest.mock import Mock, patch
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from tests.test_search import corpus_from_records
+
+RECORDS = [
+    {
+        "id": "1",
+        "title": "Quantum annealing",
+        "summary": "Optimization hardware",
+        "embedding": [1.0, 0.0, 0.0],
+        "categories": ["quant-ph"],
+        "published": "2024-01-10",
+    },
+    {
+        "id": "2",
+        "title": "Protein folding",
+        "summary": "Structure prediction",
+        "embedding": [0.0, 1.0, 0.0],
+        "categories": ["q-bio"],
+        "published": "2024-02-10",
+    },
+]
+
+
+@pytest.fixture
+def client():
+    from app.api.main import app
+    from app.services.search_engine import SearchEngine
+
+    with patch("app.services.search_engine.boto3"):
+        engine = SearchEngine()
+    engine.tokenizer, engine.model = Mock(), Mock()
+    engine.corpus = corpus_from_records(RECORDS)
+    # "protein..." aponta para o artigo 2; qualquer outra query para o 1
+    engine.embed_queries = Mock(
+        side_effect=lambda queries: np.array(
+            [[0.0, 1.0, 0.0] if "protein" in q else [1.0, 0.0, 0.0] for q in queries]
+        )
+    )
+
+    with patch("app.api.main.get_search_engine", return_value=engine):
+        with TestClient(app) as client:
+            for _ in range(100):
+                if client.get("/ready").status_code == 200:
+                    break
+                time.sleep(0.01)
+            client.engine = engine
+            yield client
+
+
+def test_search_returns_records_without_embeddings(client):
+    response = client.post("/search", json={"query": "protein", "top_k": 1})
+
+    assert response.status_code == 200
+    [record] = response.json()["results"]
+    assert record["id"] == "2"
+    assert "embedding" not in record
+    assert record["score"] == pytest.approx(1.0)
+
+
+def test_search_applies_filters(client):
+    response = client.post(
+        "/search",
+        json={"query": "protein", "top_k": 2, "categories": ["quant-ph"]},
+    )
+
+    assert [r["id"] for r in response.json()["results"]] == ["1"]
+
+
+def test_batch_search_embeds_all_queries_in_one_call(client):
+    client.engine.embed_queries.reset_mock()
+
+    response = client.post(
+        "/search/batch", json={"queries": ["protein x", "quantum y"], "top_k": 1}
+    )
+
+    results = response.json()["results"]
+    assert [r[0]["id"] for r in results] == ["2", "1"]
+    client.engine.embed_queries.assert_called_once_with(["protein x", "quantum y"])
+
+
+def test_similar_skips_model_and_unknown_ids_return_404(client):
+    client.engine.embed_queries.reset_mock()
+
+    response = client.post("/similar", json={"ids": ["1"], "top_k": 5})
+
+    assert [r["id"] for r in response.json()["results"]] == ["2"]
+    client.engine.embed_queries.assert_not_called()
+    assert client.post("/similar", json={"ids": ["9"]}).status_code == 404
+
+
+def test_status_and_validation(client):
+    status = client.get("/status").json()
+
+    assert status["rows"] == 2
+    assert status["categories"] == ["quant-ph", "q-bio"]
+    assert client.post("/search", json={"query": ""}).status_code == 422
+
+
+def test_preload_leaves_model_and_s3_client_to_each_worker(client):
+    from app.api.main import preload
+
+    engine = client.engine
+    # Lifespan do worker: cliente S3 próprio em todos os que o usam
+    assert engine.corpus.loader.s3 is engine.s3 is engine.stats.s3
+
+    engine.query_embeddings = Mock()
+    with patch("app.api.main.get_search_engine", return_value=engine):
+        preload()
+
+    # O torch não roda no mestre antes do fork
+    engine.query_embeddings.assert_not_called()
@@ -0,0 +1,44 @@
+import numpy as np
+from app.index.bm25 import BM25Index, tokenize
+
+
+def test_tokenize_matches_regex_cleaner_normalization():
+    assert tokenize("Multi-Agent RL, in 2024!") == ["multiagent"]
+
+
+def test_rare_term_outranks_common_terms():
+    index = BM25Index()
+    index.add(
+        [
+            "neural networks for vision",
+            "neural networks for transformers",
+            "neural networks quantum annealing",
+        ]
+    )
+
+    rows, scores = index.search("neural quantum", k=3)
+
+    assert rows[0] == 2
+    assert scores[0] > scores[1]
+
+
+def test_score_only_touches_matching_rows():
+    index = BM25Index()
+    index.add(["graph learning", "protein folding", "graph protein"])
+
+    rows, _ = index.score("graph")
+
+    assert sorted(rows.tolist()) == [0, 2]
+    assert index.score("unknown")[0].size == 0
+
+
+def test_incremental_add_indexes_new_rows():
+    index = BM25Index()
+    index.add(["first document"])
+    index.search("document", k=1)  # congela a posting do termo
+    index.add(["second document"])
+
+    rows, _ = index.score("document")
+
+    assert sorted(rows.tolist()) == [0, 1]
+    assert np.isfinite(index.search("second", 1)[1]).all()
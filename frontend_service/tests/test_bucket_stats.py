@@ -0,0 +1,72 @@
+from io import BytesIO
+from unittest.mock import Mock, patch
+from botocore.exceptions import ClientError
+from app.services.bucket_stats import BucketStatsProvider
+
+STATS_KEY = "_stats/counts.json"
+
+
+def no_such_key(**kwargs):
+    raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+
+
+def test_reads_count_from_manifest_without_listing():
+    s3 = Mock()
+    s3.get_object.return_value = {
+        "Body": BytesIO(b'{"count": 12345, "updated_at": "2024-05-01T10:00:00+00:00"}')
+    }
+    provider = BucketStatsProvider(s3, STATS_KEY)
+
+    result = provider.count("arxiv-silver")
+
+    assert result.count == 12345 and result.source == "manifest"
+    s3.get_paginator.assert_not_called()
+
+
+def test_falls_back_to_paginated_count_beyond_1000_keys():
+    s3 = Mock()
+    s3.get_object.side_effect = no_such_key
+    s3.get_paginator.return_value.paginate.return_value = [
+        {"Contents": [{"Key": f"{i}.json"} for i in range(1000)]},
+        {"Contents": [{"Key": "1000.json"}]},
+        # Dead-letter, leases e textos completos não são artigos
+        {
+            "Contents": [
+                {"Key": "dead-letter/7.json"},
+                {"Key": "_leases/8.json"},
+                {"Key": "fulltext/9.pdf"},
+            ]
+        },
+    ]
+    provider = BucketStatsProvider(
+        s3, STATS_KEY, skip_prefixes=("dead-letter/", "_leases/", "fulltext/")
+    )
+
+    result = provider.count("arxiv-bronze")
+
+    assert result.count == 1001 and result.source == "listing"
+
+
+def test_results_are_cached_until_ttl_expires():
+    s3 = Mock()
+    s3.get_object.side_effect = lambda **kwargs: {"Body": BytesIO(b'{"count": 1}')}
+    provider = BucketStatsProvider(s3, STATS_KEY, ttl_seconds=60)
+
+    with patch("app.services.bucket_stats.time.monotonic", side_effect=[0, 30, 61]):
+        provider.count("b")
+        provider.count("b")
+        provider.count("b")
+
+    assert s3.get_object.call_count == 2
+
+
+def test_s3_failure_returns_last_known_count():
+    s3 = Mock()
+    s3.get_object.side_effect = [
+        {"Body": BytesIO(b'{"count": 7}')},
+        ClientError({"Error": {"Code": "AccessDenied"}}, "GetObject"),
+    ]
+    provider = BucketStatsProvider(s3, STATS_KEY, ttl_seconds=0)
+
+    assert provider.count("b").count == 7
+    assert provider.count("b").count == 7
@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+from app.services.corpus import Corpus
+from app.services.silver_loader import SilverObject
+
+
+class FakeSilver:
+    """Silver em memória: {chave: (etag, registro)}; conta os GETs feitos."""
+
+    def __init__(self):
+        self.objects = {}
+        self.fetched = []
+        self.broken = set()  # chaves cujo GET falha
+
+    def put(self, article_id, embedding, etag="v1", model=None):
+        record = {"id": article_id, "embedding": embedding}
+        if model:
+            record["model_name"] = model
+        self.objects[f"{article_id}.json"] = (etag, record)
+
+    def loader(self):
+        loader = Mock()
+        loader.list_objects.side_effect = lambda: [
+            SilverObject(key, etag, datetime(2024, 1, 1) + timedelta(minutes=i))
+            for i, (key, (etag, _)) in enumerate(sorted(self.objects.items()))
+        ]
+
+        def load(keys, progress=None):
+            self.fetched.extend(keys)
+            loaded = [k for k in keys if k not in self.broken]
+            df = pd.DataFrame([self.objects[k][1] for k in loaded])
+            df.attrs.update(keys=loaded, failed=[k for k in keys if k in self.broken])
+            return df
+
+        loader.load.side_effect = load
+        return loader
+
+
+def test_refresh_fetches_only_new_and_changed_articles():
+    silver = FakeSilver()
+    silver.put("a", [1.0, 0.0])
+    silver.put("b", [0.0, 1.0])
+    corpus = Corpus(silver.loader(), backend="exact")
+    corpus.refresh()
+    before = corpus.snapshot()
+
+    silver.fetched.clear()
+    silver.put("b", [1.0, 1.0], etag="v2")  # alterado
+    silver.put("c", [0.0, 3.0])  # novo
+    stats = corpus.refresh()
+
+    assert sorted(silver.fetched) == ["b.json", "c.json"]
+    assert stats["fetched"] == 2 and stats["rows"] == 3
+    assert list(corpus.df["id"]) == ["a", "b", "c"]
+    np.testing.assert_allclose(corpus.snapshot().matrix[1], [0.7071068] * 2, rtol=1e-6)
+    np.testing.assert_allclose(corpus.snapshot().matrix[2], [0.0, 1.0])
+    # Snapshot anterior continua consistente para buscas em andamento
+    assert len(before) == 2 and len(before.matrix) == 2
+    # Copy-on-write: a linha alterada não é reescrita sob o snapshot antigo
+    np.testing.assert_allclose(before.matrix[1], [0.0, 1.0])
+
+
+def test_refresh_without_changes_downloads_nothing():
+    silver = FakeSilver()
+    silver.put("a", [1.0, 0.0])
+    corpus = Corpus(silver.loader(), backend="exact")
+    corpus.refresh()
+    silver.fetched.clear()
+
+    stats = corpus.refresh()
+
+    assert silver.fetched == [] and stats["fetched"] == 0
+    assert corpus.watermark == datetime(2024, 1, 1)
+
+
+def test_refresh_skips_vectors_from_other_models():
+    silver = FakeSilver()
+    silver.put("a", [1.0, 0.0], model=settings.MODEL_NAME)
+    silver.put("b", [0.0, 1.0], model="old-model")
+    corpus = Corpus(silver.loader(), backend="exact")
+
+    corpus.refresh()
+
+    assert list(corpus.df["id"]) == ["a"]
+    assert corpus.df.attrs["excluded_rows"] == 1
+
+
+def test_ann_index_receives_appended_rows():
+    silver = FakeSilver()
+    rng = np.random.default_rng(0)
+    for i in range(50):
+        silver.put(f"{i:03d}", rng.normal(size=8).tolist())
+    corpus = Corpus(silver.loader(), backend="hnsw")
+    corpus.refresh()
+    # A busca nunca constrói o índice: sem sync, força bruta (None)
+    assert corpus.ann_candidates(np.ones(8), 1, corpus.snapshot()) is None
+    corpus.sync_index()
+
+    silver.put("new", [5.0] * 8)
+    corpus.refresh()
+    # Linha anexada depois do sync já é candidata (re-ranking exato)
+    rows = corpus.ann_candidates(np.ones(8), 1, corpus.snapshot())
+    assert "new" in corpus.df["id"][rows].tolist()
+
+    corpus.sync_index()
+    rows = corpus.ann_candidates(np.ones(8), 1, corpus.snapshot())
+    assert corpus.df["id"][rows[0]] == "new"
+
+
+def test_ann_index_is_rebuilt_when_rows_change():
+    silver = FakeSilver()
+    rng = np.random.default_rng(0)
+    for i in range(50):
+        silver.put(f"{i:03d}", rng.normal(size=8).tolist())
+    corpus = Corpus(silver.loader(), backend="hnsw")
+    corpus.refresh()
+    corpus.sync_index()
+
+    silver.put("007", [-5.0] * 8, etag="v2")  # vetor reprocessado
+    corpus.refresh()
+    # Índice desatualizado não é consultado até o próximo sync
+    assert corpus.ann_candidates(-np.ones(8), 1, corpus.snapshot()) is None
+
+    corpus.sync_index()
+    rows = corpus.ann_candidates(-np.ones(8), 1, corpus.snapshot())
+    assert corpus.df["id"][rows[0]] == "007"
+
+
+def test_failed_objects_are_retried_on_next_refresh():
+    silver = FakeSilver()
+    silver.put("a", [1.0, 0.0])
+    silver.put("b", [0.0, 1.0])
+    silver.broken.add("b.json")
+    corpus = Corpus(silver.loader(), backend="exact")
+
+    stats = corpus.refresh()
+    assert stats["failed"] == 1 and list(corpus.df["id"]) == ["a"]
+
+    silver.broken.clear()
+    silver.fetched.clear()
+    stats = corpus.refresh()
+
+    assert silver.fetched == ["b.json"]
+    assert list(corpus.df["id"]) == ["a", "b"]
+
+
+def test_refresh_drops_deleted_and_incompatible_articles():
+    silver = FakeSilver()
+    for i, vector in enumerate([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [2.0, 1.0]]):
+        silver.put(str(i), vector)
+    corpus = Corpus(silver.loader(), backend="hnsw")
+    corpus.refresh()
+    corpus.sync_index()
+    before = corpus.snapshot()
+
+    del silver.objects["1.json"]  # apagado da Silver
+    silver.put("2", [1.0, 1.0], etag="v2", model="old-model")  # reprocessado
+    stats = corpus.refresh()
+    snapshot = corpus.snapshot()
+
+    assert stats["removed"] == 1
+    assert list(corpus.df["id"]) == ["0", "3"]
+    np.testing.assert_allclose(snapshot.matrix[1], [0.8944272, 0.4472136], rtol=1e-6)
+    assert corpus.df.attrs["excluded_rows"] == 1
+    assert list(corpus.rows_for_ids(["3"], snapshot)) == [1]
+    # Índice ANN reconstruído: nenhuma linha aponta para o artigo apagado
+    corpus.sync_index()
+    rows = corpus.ann_candidates(np.array([0.0, 1.0]), 2, snapshot)
+    assert sorted(rows) == [0, 1]
+    assert list(before.df["id"]) == ["0", "1", "2", "3"]
+
+    silver.fetched.clear()
+    corpus.refresh()
+    assert silver.fetched == []
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from app.index.base import normalize_rows
+from app.index.dedup import DuplicateIndex
+
+
+@pytest.fixture
+def corpus_with_duplicates():
+    rng = np.random.default_rng(0)
+    base = normalize_rows(rng.normal(size=(2000, 64)).astype(np.float32))
+    # Linhas 2000.. são cópias levemente perturbadas das linhas 0, 10, 20, ...
+    sources = np.arange(0, 500, 10)
+    noise = rng.normal(scale=0.02, size=(len(sources), 64)).astype(np.float32)
+    copies = normalize_rows(base[sources] + noise)
+    return np.vstack([base, copies]), sources
+
+
+def test_clusters_map_near_duplicates_to_first_row(corpus_with_duplicates):
+    matrix, sources = corpus_with_duplicates
+    index = DuplicateIndex(matrix.shape[1])
+    index.add(matrix)
+
+    clusters = index.clusters(matrix)
+
+    copies = np.arange(2000, 2000 + len(sources))
+    assert (clusters.canonical[copies] == sources).all()
+    assert clusters.duplicates == len(sources)
+    assert [list(group) for group in clusters.groups()][0] == [0, 2000]
+    mask = clusters.collapsed_mask(len(matrix))
+    assert not mask[copies].any() and mask[:2000].all()
+
+
+def test_candidate_pairs_grow_linearly_not_quadratically(corpus_with_duplicates):
+    matrix, _ = corpus_with_duplicates
+    index = DuplicateIndex(matrix.shape[1], bands=16, window=4)
+    index.add(matrix)
+
+    pairs = index.candidate_pairs()
+
+    # No máximo `window` vizinhos por linha em cada banda
+    assert len(pairs) <= len(matrix) * 16 * 4
+    assert len(pairs) < len(matrix) * (len(matrix) - 1) // 2 // 100
+
+
+def test_incremental_add_keeps_canonical_rows(corpus_with_duplicates):
+    matrix, sources = corpus_with_duplicates
+    index = DuplicateIndex(matrix.shape[1])
+    index.add(matrix[:2000])
+    assert index.clusters(matrix[:2000]).collapsed_mask(2000) is None
+
+    index.add(matrix[2000:])
+
+    assert (index.clusters(matrix).canonical[2000:] == sources).all()
@@ -0,0 +1,79 @@
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+from app.core.config import settings
+from app.services.corpus import Corpus
+from app.services.embedding_snapshot import read_snapshot, write_snapshot
+from tests.test_corpus import FakeSilver
+
+
+def test_round_trip_maps_matrix_read_only(tmp_path):
+    df = pd.DataFrame({"id": ["a", "b"], "categories": [["cs.AI"], None]})
+    matrix = np.eye(2, dtype=np.float32)
+    write_snapshot(str(tmp_path), df, matrix, ["a.json", "b.json"], ["e1", "e2"], "m")
+
+    snapshot = read_snapshot(str(tmp_path), "m")
+
+    assert isinstance(snapshot.matrix, np.memmap)
+    assert not snapshot.matrix.flags.writeable
+    np.testing.assert_array_equal(snapshot.matrix, matrix)
+    assert snapshot.header.dim == 2 and snapshot.header.rows == 2
+    assert snapshot.df["categories"].tolist() == [["cs.AI"], None]
+    assert snapshot.keys == ["a.json", "b.json"]
+
+
+def test_snapshot_of_another_model_or_inconsistent_is_rejected(tmp_path):
+    df = pd.DataFrame({"id": ["a"]})
+    write_snapshot(str(tmp_path), df, np.ones((1, 2)), ["a.json"], ["e1"], "m")
+
+    with pytest.raises(ValueError, match="esperado"):
+        read_snapshot(str(tmp_path), "outro-modelo")
+
+    header = orjson.loads((tmp_path / "header.json").read_bytes())
+    header["rows"] = 5
+    (tmp_path / "header.json").write_bytes(orjson.dumps(header))
+    with pytest.raises(ValueError, match="inconsistente"):
+        read_snapshot(str(tmp_path), "m")
+
+
+def test_corpus_starts_from_snapshot_and_refreshes_only_the_delta(tmp_path):
+    silver = FakeSilver()
+    silver.put("a", [1.0, 0.0], model=settings.MODEL_NAME)
+    silver.put("b", [0.0, 1.0], model=settings.MODEL_NAME)
+    silver.put("x", [1.0, 1.0], model="outro-modelo")
+    source = Corpus(silver.loader(), backend="exact")
+    source.refresh()
+    source.save_snapshot(str(tmp_path))
+
+    silver.fetched.clear()
+    silver.put("c", [0.0, 2.0], model=settings.MODEL_NAME)
+    corpus = Corpus(silver.loader(), backend="exact")
+    corpus.load_snapshot(str(tmp_path))
+    assert "embedding" not in corpus.df.columns
+    assert corpus.df.attrs["excluded_rows"] == 1
+    stats = corpus.refresh()
+
+    assert silver.fetched == ["c.json"]
+    assert stats["rows"] == 3
+    assert list(corpus.df["id"]) == ["a", "b", "c"]
+    np.testing.assert_allclose(corpus.snapshot().matrix[2], [0.0, 1.0])
+
+
+def test_update_of_snapshot_row_copies_mapped_matrix(tmp_path):
+    silver = FakeSilver()
+    silver.put("a", [1.0, 0.0])
+    source = Corpus(silver.loader(), backend="exact")
+    source.refresh()
+    source.save_snapshot(str(tmp_path))
+
+    silver.put("a", [0.0, 1.0], etag="v2")
+    corpus = Corpus(silver.loader(), backend="exact")
+    corpus.load_snapshot(str(tmp_path))
+    corpus.refresh()
+
+    np.testing.assert_allclose(corpus.snapshot().matrix[0], [0.0, 1.0])
+    # O arquivo mapeado não é alterado pelo delta
+    np.testing.assert_allclose(
+        read_snapshot(str(tmp_path), settings.MODEL_NAME).matrix[0], [1.0, 0.0]
+    )
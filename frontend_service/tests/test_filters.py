@@ -0,0 +1,56 @@
+from datetime import date
+import numpy as np
+from app.index.filters import FilterIndex, SearchFilters
+
+
+def make_index():
+    index = FilterIndex()
+    index.add(
+        [["cs.AI", "cs.LG"], ["cs.CL"], "cs.AI", None],
+        ["2024-01-10", "2024-02-01T12:00:00Z", "2024-03-05", None],
+    )
+    return index
+
+
+def test_no_active_filter_returns_none():
+    assert make_index().mask(SearchFilters(), 4) is None
+    assert make_index().mask(None, 4) is None
+
+
+def test_categories_are_combined_with_or():
+    index = make_index()
+
+    mask = index.mask(SearchFilters(categories=("cs.LG", "cs.CL")), 4)
+
+    assert mask.tolist() == [True, True, False, False]
+    assert index.categories()[0] == "cs.AI"
+
+
+def test_date_range_is_inclusive_and_skips_missing_dates():
+    index = make_index()
+
+    mask = index.mask(SearchFilters(start=date(2024, 2, 1), end=date(2024, 2, 1)), 4)
+    assert mask.tolist() == [False, True, False, False]
+
+    mask = index.mask(SearchFilters(start=date(2024, 1, 15)), 4)
+    assert mask.tolist() == [False, True, True, False]
+
+
+def test_category_and_date_filters_intersect():
+    index = make_index()
+
+    filters = SearchFilters(categories=("cs.AI",), end=date(2024, 2, 28))
+
+    assert index.mask(filters, 4).tolist() == [True, False, False, False]
+
+
+def test_incremental_add_invalidates_bitmaps_and_mask_is_truncated():
+    index = make_index()
+    index.mask(SearchFilters(categories=("cs.AI",)), 4)
+
+    index.add([["cs.AI"]], ["2024-04-01"])
+    mask = index.mask(SearchFilters(categories=("cs.AI",)), 5)
+
+    assert np.flatnonzero(mask).tolist() == [0, 2, 4]
+    # Snapshot mais antigo que o índice só vê as próprias linhas
+    assert len(index.mask(SearchFilters(categories=("cs.AI",)), 3)) == 3
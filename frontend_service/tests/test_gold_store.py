@@ -0,0 +1,197 @@
+import io
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+import numpy as np
+import orjson
+import pytest
+from botocore.exceptions import ClientError
+from app.core.config import settings
+from app.jobs.build_gold import run
+from app.services.corpus import Corpus
+from app.services.gold_store import VERSION_FILE, GoldStore, local_version_dir
+
+
+class FakeS3:
+    """S3 em memória com ETag por objeto e PUT condicional (If-Match/If-None-Match)."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.downloads = 0
+
+    def _error(self, code):
+        return ClientError({"Error": {"Code": code}}, "op")
+
+    def head_bucket(self, Bucket):
+        if Bucket not in self.buckets:
+            raise self._error("404")
+
+    def create_bucket(self, Bucket):
+        self.buckets.setdefault(Bucket, {})
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None, IfNoneMatch=None, **_):
+        current = self.buckets[Bucket].get(Key)
+        if IfNoneMatch == "*" and current is not None:
+            raise self._error("PreconditionFailed")
+        if IfMatch is not None and (current is None or current[0] != IfMatch):
+            raise self._error("PreconditionFailed")
+        etag = f'"{len(self.buckets[Bucket])}-{hash(Body)}"'
+        self.buckets[Bucket][Key] = (etag, bytes(Body))
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.buckets.get(Bucket, {}):
+            raise self._error("NoSuchKey")
+        etag, body = self.buckets[Bucket][Key]
+        return {"Body": io.BytesIO(body), "ETag": etag}
+
+    def upload_file(self, Filename, Bucket, Key):
+        with open(Filename, "rb") as f:
+            self.put_object(Bucket, Key, f.read())
+
+    def download_file(self, Bucket, Key, Filename):
+        if Key not in self.buckets.get(Bucket, {}):
+            raise self._error("404")
+        self.downloads += 1
+        with open(Filename, "wb") as f:
+            f.write(self.buckets[Bucket][Key][1])
+
+    def get_paginator(self, name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, **_):
+                contents = [
+                    {"Key": k, "ETag": e, "LastModified": datetime(2024, 1, 1)}
+                    for k, (e, _) in sorted(fake.buckets[Bucket].items())
+                ]
+                return [{"Contents": contents}]
+
+        return Paginator()
+
+
+def put_article(s3, article_id, embedding):
+    record = {
+        "id": article_id,
+        "title": f"Paper {article_id}",
+        "embedding": embedding,
+        "model_name": settings.MODEL_NAME,
+    }
+    s3.put_object(settings.S3_BUCKET_SILVER, f"{article_id}.json", orjson.dumps(record))
+
+
+@pytest.fixture
+def s3():
+    s3 = FakeS3()
+    s3.create_bucket(settings.S3_BUCKET_SILVER)
+    rng = np.random.default_rng(0)
+    for i in range(50):
+        put_article(s3, f"a{i}", rng.normal(size=8).tolist())
+    return s3
+
+
+def gold(s3):
+    return GoldStore(s3, settings.S3_BUCKET_GOLD)
+
+
+def test_job_publishes_versioned_artifacts_and_flips_pointer(s3):
+    pointer = run(s3=s3, backend="hnsw")
+
+    latest = gold(s3).latest()
+    assert latest["version"] == pointer["version"]
+    assert latest["rows"] == 50 and latest["index_backend"] == "hnsw"
+    keys = s3.buckets[settings.S3_BUCKET_GOLD]
+    for name in ("header.json", "embeddings.npy", "rows.json", "index/hnsw.npz"):
+        assert f"{pointer['prefix']}{name}" in keys
+
+
+def test_consumer_downloads_once_and_reuses_published_index(s3, tmp_path, monkeypatch):
+    run(s3=s3, backend="hnsw")
+    store = gold(s3)
+
+    local = store.sync_latest(str(tmp_path))
+    downloads = s3.downloads
+    assert store.sync_latest(str(tmp_path)) == local == local_version_dir(str(tmp_path))
+    assert s3.downloads == downloads  # versão já local: nada é baixado
+
+    monkeypatch.setattr(
+        "app.index.factory.create_index",
+        lambda *a, **k: pytest.fail("índice publicado deveria ser reaproveitado"),
+    )
+    corpus = Corpus(Mock(), backend="hnsw", index_dir=f"{local}/index")
+    corpus.load_snapshot(local)
+    corpus.sync_index()
+    snapshot = corpus.snapshot()
+
+    rows = corpus.ann_candidates(snapshot.matrix[3], 5, snapshot)
+
+    assert 3 in rows.tolist()
+
+
+def test_second_run_downloads_only_the_silver_delta(s3):
+    first = run(s3=s3, backend="exact")
+    put_article(s3, "new", [1.0] * 8)
+    fetched = []
+    original = s3.get_object
+
+    def tracking_get_object(Bucket, Key):
+        if Bucket == settings.S3_BUCKET_SILVER:
+            fetched.append(Key)
+        return original(Bucket, Key)
+
+    s3.get_object = tracking_get_object
+    second = run(s3=s3, backend="exact")
+
+    assert fetched == ["new.json"]
+    assert second["rows"] == 51 and second["version"] != first["version"]
+
+
+def test_concurrent_publish_does_not_overwrite_pointer_blindly(s3, tmp_path):
+    store = gold(s3)
+    store.ensure_bucket()
+    (tmp_path / "header.json").write_text("{}")
+    store.publish(str(tmp_path), "v1", {})
+
+    stale = store.latest()
+    store.publish(str(tmp_path), "v2", {})
+    store.latest = lambda: stale  # outro job leu o ponteiro antes da troca
+
+    with pytest.raises(ClientError):
+        store.publish(str(tmp_path), "v3", {})
+    assert gold(s3).latest()["version"] == "v2"
+
+
+def test_new_version_is_swapped_in_whole_and_old_ones_pruned(s3, tmp_path):
+    store = gold(s3)
+    run(s3=s3, backend="hnsw")
+    first = Path(store.sync_latest(str(tmp_path)))
+    run(s3=s3, backend="exact")
+    second = Path(store.sync_latest(str(tmp_path)))
+
+    # Cada versão no próprio diretório: o índice HNSW da anterior não vaza
+    assert (tmp_path / VERSION_FILE).read_text() == second.name
+    assert (first / "index").is_dir() and not (second / "index").exists()
+
+    run(s3=s3, backend="exact")
+    third = Path(store.sync_latest(str(tmp_path)))
+
+    # A anterior fica (um leitor pode estar abrindo-a); as demais são removidas
+    assert {p.name for p in tmp_path.iterdir() if p.is_dir()} == {
+        second.name,
+        third.name,
+    }
+
+
+@pytest.mark.parametrize("damage", ["truncate", "delete"])
+def test_job_rebuilds_from_silver_when_previous_version_is_unreadable(s3, damage):
+    first = run(s3=s3, backend="exact")
+    objects = s3.buckets[settings.S3_BUCKET_GOLD]
+    key = f"{first['prefix']}embeddings.npy"
+    if damage == "truncate":
+        etag, body = objects[key]
+        objects[key] = (etag, body[: len(body) // 2])
+    else:
+        del objects[key]
+
+    second = run(s3=s3, backend="exact")
+
+    assert second["rows"] == 50 and second["version"] != first["version"]
@@ -0,0 +1,181 @@
+import numpy as np
+import pytest
+from app.index.base import normalize_rows, rerank_recall, top_k
+from app.index.exact import ExactIndex
+from app.index.hnsw import HNSWIndex
+from app.index.ivfpq import IVFPQIndex
+from app.index.pca import PCAIndex
+from app.index.factory import build_or_load_index, load_index
+
+
+def clustered_corpus(n=2000, dim=32, clusters=20, seed=0):
+    # Dados agrupados imitam embeddings reais (tópicos) melhor que ruído uniforme
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    return (centers[labels] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def recall_at_k(index, corpus, queries, k=10, candidates=10):
+    exact = ExactIndex(corpus.shape[1])
+    exact.add(corpus)
+    hits = 0
+    for q in queries:
+        truth = set(exact.search(q, k)[0].tolist())
+        hits += len(truth & set(index.search(q, candidates)[0].tolist()))
+    return hits / (k * len(queries))
+
+
+def test_top_k_returns_sorted_best_rows():
+    scores = np.array([0.1, 0.9, 0.5, 0.7])
+
+    assert top_k(scores, 2).tolist() == [1, 3]
+    assert top_k(scores, 10).tolist() == [1, 3, 2, 0]
+
+
+# IVF-PQ pontua códigos comprimidos: o recall é medido sobre os candidatos
+# (top_k * INDEX_RERANK_FACTOR) que o SearchEngine re-ranqueia de forma exata.
+@pytest.mark.parametrize(
+    "index,candidates,min_recall",
+    [
+        (HNSWIndex(32, m=8, ef_construction=64, ef_search=64), 10, 0.9),
+        (IVFPQIndex(32, nlist=16, nprobe=4, pq_m=8, pq_bits=6), 40, 0.75),
+    ],
+    ids=["hnsw", "ivfpq"],
+)
+def test_ann_recall_against_brute_force(index, candidates, min_recall):
+    corpus = clustered_corpus()
+    rng = np.random.default_rng(1)
+    queries = corpus[rng.choice(len(corpus), 20)] + 0.3 * rng.normal(size=(20, 32))
+
+    index.add(corpus)
+
+    assert len(index) == len(corpus)
+    assert recall_at_k(index, corpus, queries, candidates=candidates) >= min_recall
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        ExactIndex(32),
+        HNSWIndex(32, m=8, ef_construction=64, ef_search=32),
+        IVFPQIndex(32, nlist=16, nprobe=4, pq_m=8, pq_bits=6),
+        PCAIndex(32, components=12),
+    ],
+    ids=["exact", "hnsw", "ivfpq", "pca"],
+)
+def test_filtered_search_only_returns_allowed_rows(index):
+    corpus = clustered_corpus()
+    index.add(corpus)
+    # Filtro seletivo (~5% das linhas): o top-k não pode esvaziar
+    allowed = np.zeros(len(corpus), dtype=bool)
+    allowed[::20] = True
+
+    rows, _ = index.search(corpus[7], 10, allowed)
+
+    assert len(rows) == 10
+    assert allowed[rows].all()
+
+
+def test_hnsw_incremental_insert_finds_new_vectors():
+    corpus = clustered_corpus(n=500)
+    index = HNSWIndex(32, m=8, ef_construction=64)
+    index.add(corpus[:300])
+    index.add(corpus[300:])
+
+    rows, scores = index.search(corpus[450], k=1)
+
+    assert rows[0] == 450
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        ExactIndex(32),
+        HNSWIndex(32, m=8, ef_construction=32),
+        IVFPQIndex(32, nlist=8, pq_m=4),
+        PCAIndex(32, components=12),
+    ],
+    ids=["exact", "hnsw", "ivfpq", "pca"],
+)
+def test_save_and_load_round_trip(index, tmp_path):
+    corpus = clustered_corpus(n=300)
+    index.add(corpus)
+    path = tmp_path / f"{index.kind}.npz"
+
+    index.save(str(path))
+    restored = load_index(str(path))
+
+    query = normalize_rows(corpus[7])
+    assert restored.kind == index.kind
+    assert len(restored) == len(index)
+    assert restored.search(query, 5)[0].tolist() == index.search(query, 5)[0].tolist()
+
+
+def test_pca_reranked_recall_close_to_full_dimension():
+    # Espectro decrescente, como embeddings reais: poucas direções dominam
+    rng = np.random.default_rng(2)
+    corpus = normalize_rows(rng.normal(size=(2000, 64)) * 0.85 ** np.arange(64))
+    queries = corpus[rng.choice(len(corpus), 30)] + 0.05 * rng.normal(size=(30, 64))
+    index = PCAIndex(64, components=16)
+
+    index.add(corpus[:1500])
+    index.add(corpus[1500:])  # delta projetado com a base já ajustada
+
+    assert 0.5 < index.explained_variance < 1.0
+    assert rerank_recall(index, corpus, queries, k=10, candidates=40) >= 0.9
+    assert rerank_recall(ExactIndex(64), corpus, queries) == 0.0  # vazio
+
+
+def test_ivfpq_default_lists_scale_with_corpus_size():
+    # Sem tópicos marcados (pior caso): 256 listas em 5 mil vetores derrubam o recall
+    rng = np.random.default_rng(3)
+    corpus = normalize_rows(rng.normal(size=(5000, 32))).astype(np.float32)
+    queries = corpus[rng.choice(len(corpus), 30)] + 0.1 * rng.normal(size=(30, 32))
+    auto = IVFPQIndex(32, pq_m=8, pq_bits=6)
+    fixed = IVFPQIndex(32, nlist=256, nprobe=8, pq_m=8, pq_bits=6)
+
+    auto.add(corpus)
+    fixed.add(corpus)
+
+    assert (auto.nlist, auto.probes) == (71, 18)
+    recall = recall_at_k(auto, corpus, queries, candidates=40)
+    assert recall >= 0.7
+    assert recall > recall_at_k(fixed, corpus, queries, candidates=40)
+
+
+def test_ivfpq_rejects_dim_not_divisible_by_pq_m():
+    with pytest.raises(ValueError):
+        IVFPQIndex(30, pq_m=16)
+
+
+def test_saved_index_covering_a_prefix_of_ids_is_extended(tmp_path):
+    corpus = clustered_corpus(n=300)
+    ids = [str(i) for i in range(300)]
+    build_or_load_index(ids[:200], corpus[:200], "hnsw", str(tmp_path))
+
+    index = build_or_load_index(ids, corpus, "hnsw", str(tmp_path))
+
+    assert len(index) == 300
+    assert index.search(corpus[250], 1)[0].tolist() == [250]
+
+
+def test_published_index_is_only_read(tmp_path):
+    corpus = clustered_corpus(n=300)
+    ids = [str(i) for i in range(300)]
+    published, scratch = tmp_path / "gold" / "index", tmp_path / "scratch"
+    build_or_load_index(ids[:200], corpus[:200], "hnsw", str(published))
+    files = {p.name: p.read_bytes() for p in published.iterdir()}
+
+    extended = build_or_load_index(
+        ids, corpus, "hnsw", str(scratch), source_dir=str(published)
+    )
+    # Vetores já indexados mudaram: reconstrução vai só para o diretório de trabalho
+    rebuilt = build_or_load_index(
+        ids, corpus, "hnsw", str(scratch), reuse=False, source_dir=str(published)
+    )
+
+    assert len(extended) == len(rebuilt) == 300
+    assert {p.name: p.read_bytes() for p in published.iterdir()} == files
+    assert (scratch / "hnsw.npz").exists()
@@ -0,0 +1,45 @@
+import asyncio
+import numpy as np
+from app.services.query_batcher import QueryBatcher
+
+
+def test_concurrent_queries_share_one_forward_pass():
+    calls = []
+
+    def embed_batch(queries):
+        calls.append(list(queries))
+        return np.array([[float(len(q))] for q in queries])
+
+    async def scenario():
+        batcher = QueryBatcher(embed_batch, max_batch_size=8, max_wait_ms=50)
+        batcher.start()
+        vectors = await asyncio.gather(*(batcher.embed("q" * n) for n in (1, 2, 3)))
+        await batcher.stop()
+        return vectors
+
+    vectors = asyncio.run(scenario())
+
+    assert calls == [["q", "qq", "qqq"]]
+    assert [v[0] for v in vectors] == [1.0, 2.0, 3.0]
+
+
+def test_batch_is_capped_and_errors_reach_every_caller():
+    calls = []
+
+    def embed_batch(queries):
+        calls.append(len(queries))
+        raise RuntimeError("modelo indisponível")
+
+    async def scenario():
+        batcher = QueryBatcher(embed_batch, max_batch_size=2, max_wait_ms=50)
+        batcher.start()
+        results = await asyncio.gather(
+            *(batcher.embed(str(i)) for i in range(3)), return_exceptions=True
+        )
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert calls == [2, 1]
+    assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,32 @@
+import numpy as np
+from app.services.query_cache import QueryEmbeddingCache, normalize_query
+
+
+def test_normalize_query_collapses_whitespace_and_optionally_case():
+    assert normalize_query("  LLMs   in\tHealthcare ") == "LLMs in Healthcare"
+    assert normalize_query("LLMs in Healthcare", lowercase=True) == "llms in healthcare"
+
+
+def test_lru_evicts_least_recently_used_and_tracks_hit_rate():
+    cache = QueryEmbeddingCache(maxsize=2)
+    cache.put("a", np.zeros(2))
+    cache.put("b", np.ones(2))
+    cache.get("a")  # "a" passa a ser o mais recente
+    cache.put("c", np.ones(2))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 1,
+        "hit_rate": 2 / 3,
+        "size": 2,
+        "maxsize": 2,
+    }
+
+
+def test_cached_vectors_are_read_only():
+    cache = QueryEmbeddingCache()
+    cache.put("q", np.zeros(3))
+
+    assert not cache.get("q").flags["WRITEABLE"]
@@ -4,6 +4,20 @@ import pandas as pd
 from app.services.search_engine import SearchEngine
 
 
+def corpus_from_records(records):
+    from app.services.corpus import Corpus
+    from app.services.silver_loader import SilverObject
+
+    loader = Mock()
+    loader.list_objects.return_value = [
+        SilverObject(f"{r['id']}.json", "etag", None) for r in records
+    ]
+    loader.load.return_value = pd.DataFrame(records)
+    corpus = Corpus(loader)
+    corpus.refresh()
+    return corpus
+
+
 @pytest.fixture
 def mock_s3_data():
     return [
@@ -35,10 +49,10 @@ def test_search_engine_logic(
     mock_s3_client = Mock()
     mock_boto.client.return_value = mock_s3_client
 
-    # Simula listagem de arquivos
-    mock_s3_client.list_objects_v2.return_value = {
-        "Contents": [{"Key": "1.json"}, {"Key": "2.json"}]
-    }
+    # Simula listagem de arquivos (paginada)
+    mock_s3_client.get_paginator.return_value.paginate.return_value = [
+        {"Contents": [{"Key": "1.json"}, {"Key": "2.json"}]}
+    ]
 
     # Simula retorno do conteúdo dos arquivos (streaming body)
     def get_object_side_effect(Bucket, Key):
@@ -74,10 +88,7 @@ def test_search_engine_logic(
 
     # 2. Execução
     engine = SearchEngine()
-    # Force load (bypass streamlit cache decoration issues in raw test if needed,
-    # but mocks handle imports usually. If @st.cache fails in test, mock st)
-    with patch("app.services.search_engine.st"):
-        results = engine.search("fake query", top_k=2)
+    results = engine.search("fake query", top_k=2)
 
     # 3. Asserts
     assert len(results) == 2
@@ -88,3 +99,296 @@ def test_search_engine_logic(
     # Paper B [0,1,0] deve ter score baixo com query [1,0,0] (Ortogonal = 0.0)
     assert results[1]["id"] == "2"
     assert results[1]["score"] < 0.1
+
+
+def test_select_compatible_rows_refuses_mixed_models():
+    from app.services.corpus import select_compatible_rows
+    from app.core.config import settings
+
+    df = pd.DataFrame(
+        [
+            {"id": "1", "embedding": [1.0], "model_name": settings.MODEL_NAME},
+            {"id": "2", "embedding": [1.0], "model_name": "old-model"},
+            {"id": "3", "embedding": [1.0], "model_name": None},
+        ]
+    )
+
+    result = select_compatible_rows(df)
+
+    assert list(result["id"]) == ["1"]
+    assert result.attrs["excluded_rows"] == 2
+
+
+def test_select_compatible_rows_keeps_fully_legacy_silver():
+    from app.services.corpus import select_compatible_rows
+
+    df = pd.DataFrame([{"id": "1", "embedding": [1.0]}])
+
+    assert list(select_compatible_rows(df)["id"]) == ["1"]
+
+
+@patch("app.services.search_engine.boto3")
+def test_search_with_ann_backend_does_not_mutate_cached_df(
+    mock_boto, mock_s3_data, monkeypatch
+):
+    import numpy as np
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "INDEX_BACKEND", "hnsw")
+    engine = SearchEngine()
+    engine.model = Mock()
+    engine.corpus = corpus_from_records(mock_s3_data)
+    engine.embed_query = lambda query: np.array([0.0, 1.0, 0.0])
+
+    results = engine.search("fake query", top_k=1)
+
+    assert [r["id"] for r in results] == ["2"]
+    assert results[0]["score"] > 0.9
+    assert "score" not in engine.corpus.df.columns
+
+
+def test_build_embedding_matrix_is_normalized_and_read_only():
+    import numpy as np
+    from app.services.corpus import build_embedding_matrix
+
+    df = pd.DataFrame({"id": ["1", "2"], "embedding": [[3.0, 4.0], [0.0, 2.0]]})
+
+    matrix = build_embedding_matrix(df)
+
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert not matrix.flags["WRITEABLE"]
+    np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0, rtol=1e-6)
+
+
+@patch("app.services.search_engine.boto3")
+def test_concurrent_exact_searches_share_read_only_state(mock_boto, mock_s3_data):
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+
+    engine = SearchEngine()
+    engine.model = Mock()
+    engine.corpus = corpus_from_records(mock_s3_data)
+    queries = {"a": np.array([1.0, 0.1, 0.0]), "b": np.array([0.1, 1.0, 0.0])}
+    engine.embed_query = lambda query: queries[query]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda q: engine.search(q, top_k=1), ["a", "b"] * 50))
+
+    assert all(
+        r[0]["id"] == ("1" if i % 2 == 0 else "2") for i, r in enumerate(results)
+    )
+    assert "score" not in engine.corpus.df.columns
+
+
+@patch("app.services.search_engine.boto3")
+def test_repeated_query_reuses_cached_embedding(mock_boto, mock_s3_data):
+    import numpy as np
+
+    engine = SearchEngine()
+    engine.model = Mock()
+    engine.corpus = corpus_from_records(mock_s3_data)
+    engine.embed_query = Mock(return_value=np.array([1.0, 0.0, 0.0]))
+
+    engine.search("fake  query", top_k=1)
+    results = engine.search("fake query", top_k=1)
+
+    engine.embed_query.assert_called_once_with("fake query")
+    assert results[0]["id"] == "1"
+    assert engine.query_cache.stats()["hits"] == 1
+
+
+@pytest.fixture
+def lexical_records():
+    return [
+        {
+            "id": "1",
+            "title": "Quantum annealing",
+            "cleaned_summary": "optimization hardware",
+            "embedding": [1.0, 0.0, 0.0],
+        },
+        {
+            "id": "2",
+            "title": "Quantum error correction",
+            "cleaned_summary": "surface codes",
+            "embedding": [0.0, 1.0, 0.0],
+        },
+        {
+            "id": "3",
+            "title": "Protein folding",
+            "cleaned_summary": "structure prediction",
+            "embedding": [0.0, 0.9, 0.4],
+        },
+    ]
+
+
+@patch("app.services.search_engine.boto3")
+def test_lexical_mode_skips_model_inference(mock_boto, lexical_records):
+    engine = SearchEngine()
+    engine.corpus = corpus_from_records(lexical_records)
+    engine.load_model = Mock()
+
+    results = engine.search("surface codes", top_k=3, mode="lexical")
+
+    assert [r["id"] for r in results] == ["2"]
+    engine.load_model.assert_not_called()
+
+
+@patch("app.services.search_engine.boto3")
+def test_search_records_span_with_mode_and_result_count(mock_boto, lexical_records):
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    engine = SearchEngine()
+    engine.corpus = corpus_from_records(lexical_records)
+
+    with patch("app.services.search_engine.tracer", provider.get_tracer("test")):
+        engine.search("surface codes", top_k=3, mode="lexical")
+
+    [span] = exporter.get_finished_spans()
+    assert span.name == "search"
+    assert span.attributes["search.mode"] == "lexical"
+    assert span.attributes["search.results"] == 1
+    assert span.attributes["search.corpus_rows"] == len(lexical_records)
+
+
+@patch("app.services.search_engine.boto3")
+def test_hybrid_mode_reranks_lexical_candidates_by_vector(mock_boto, lexical_records):
+    import numpy as np
+
+    engine = SearchEngine()
+    engine.model = Mock()
+    engine.corpus = corpus_from_records(lexical_records)
+    engine.embed_query = Mock(return_value=np.array([0.0, 1.0, 0.0]))
+
+    results = engine.search("quantum", top_k=3, mode="hybrid")
+
+    # Só os artigos com o termo são candidatos; o vetor decide a ordem
+    assert [r["id"] for r in results] == ["2", "1"]
+
+
+@patch("app.services.search_engine.boto3")
+def test_fusion_mode_boosts_keyword_matches(mock_boto, lexical_records, monkeypatch):
+    import numpy as np
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "FUSION_ALPHA", 0.5)
+    engine = SearchEngine()
+    engine.model = Mock()
+    engine.corpus = corpus_from_records(lexical_records)
+    engine.embed_query = Mock(return_value=np.array([0.0, 1.0, 0.0]))
+
+    vector = engine.search("protein", top_k=1, mode="vector")
+    fusion = engine.search("protein", top_k=1, mode="fusion")
+
+    assert vector[0]["id"] == "2"
+    assert fusion[0]["id"] == "3"
+
+
+@pytest.mark.parametrize("mode", ["vector", "lexical", "fusion"])
+@patch("app.services.search_engine.boto3")
+def test_filters_restrict_results_in_every_mode(mock_boto, lexical_records, mode):
+    import numpy as np
+    from datetime import date
+    from app.index.filters import SearchFilters
+
+    for record, published in zip(
+        lexical_records, ["2023-05-01", "2024-02-01", "2024-03-01"]
+    ):
+        record["categories"] = (
+            ["quant-ph"] if "Quantum" in record["title"] else ["q-bio"]
+        )
+        record["published"] = published
+    engine = SearchEngine()
+    engine.model = Mock()
+    engine.corpus = corpus_from_records(lexical_records)
+    engine.embed_query = Mock(return_value=np.array([0.0, 1.0, 0.0]))
+
+    filters = SearchFilters(categories=("quant-ph",), end=date(2023, 12, 31))
+    results = engine.search("quantum", top_k=3, mode=mode, filters=filters)
+
+    assert [r["id"] for r in results] == ["1"]
+    assert (
+        engine.search(
+            "quantum", top_k=3, mode=mode, filters=SearchFilters(categories=("none",))
+        )
+        == []
+    )
+
+
+@patch("app.services.search_engine.boto3")
+def test_filtered_ann_search_uses_subset_below_brute_force_threshold(
+    mock_boto, mock_s3_data, monkeypatch
+):
+    import numpy as np
+    from app.core.config import settings
+    from app.index.filters import SearchFilters
+
+    monkeypatch.setattr(settings, "INDEX_BACKEND", "hnsw")
+    engine = SearchEngine()
+    engine.model = Mock()
+    engine.corpus = corpus_from_records(mock_s3_data)
+    engine.corpus.ann_candidates = Mock()
+    engine.embed_query = Mock(return_value=np.array([1.0, 0.0, 0.0]))
+
+    results = engine.search(
+        "query", top_k=2, filters=SearchFilters(categories=("cs.CL",))
+    )
+
+    engine.corpus.ann_candidates.assert_not_called()
+    assert all("cs.CL" in r["categories"] for r in results)
+
+
+@patch("app.services.search_engine.boto3")
+def test_similar_uses_stored_embeddings_without_model(mock_boto, lexical_records):
+    engine = SearchEngine()
+    engine.corpus = corpus_from_records(lexical_records)
+    engine.load_model = Mock()
+
+    results = engine.similar(["2"], top_k=2)
+
+    # O próprio artigo fica de fora; o vizinho mais próximo do vetor de 2 é o 3
+    assert [r["id"] for r in results] == ["3", "1"]
+    engine.load_model.assert_not_called()
+
+
+@patch("app.services.search_engine.boto3")
+def test_similar_to_several_articles_uses_centroid(mock_boto, lexical_records):
+    lexical_records.append({"id": "4", "title": "Mixed", "embedding": [0.7, 0.7, 0.0]})
+    engine = SearchEngine()
+    engine.corpus = corpus_from_records(lexical_records)
+
+    results = engine.similar(["1", "2"], top_k=1)
+
+    assert [r["id"] for r in results] == ["4"]
+    with pytest.raises(KeyError):
+        engine.similar(["1", "missing"])
+
+
+@patch("app.services.search_engine.boto3")
+def test_near_duplicates_collapse_to_canonical_article(mock_boto, lexical_records):
+    import numpy as np
+
+    lexical_records.append(
+        {
+            "id": "1v2",
+            "title": "Quantum annealing revisited",
+            "cleaned_summary": "optimization hardware",
+            "embedding": [0.999, 0.01, 0.0],
+        }
+    )
+    engine = SearchEngine()
+    engine.model = Mock()
+    engine.corpus = corpus_from_records(lexical_records)
+    engine.embed_query = Mock(return_value=np.array([1.0, 0.0, 0.0]))
+
+    for mode in ("vector", "lexical", "fusion"):
+        results = engine.search("quantum annealing", top_k=3, mode=mode)
+        assert "1v2" not in [r["id"] for r in results]
+        assert results[0]["id"] == "1"
@@ -0,0 +1,115 @@
+import json
+from io import BytesIO
+from unittest.mock import Mock
+import numpy as np
+from app.services.silver_loader import SilverLoader
+
+
+def make_s3(pages, objects):
+    s3 = Mock()
+    s3.get_paginator.return_value.paginate.return_value = pages
+    s3.get_object.side_effect = lambda Bucket, Key: {
+        "Body": BytesIO(json.dumps(objects[Key]).encode("utf-8"))
+    }
+    return s3
+
+
+def test_load_reads_every_page_into_columns_in_key_order():
+    objects = {
+        f"{i}.json": {"id": str(i), "title": f"Paper {i}", "embedding": [float(i), 1.0]}
+        for i in range(5)
+    }
+    # Sem paginator, só a primeira página (1.000 chaves no S3) seria lida
+    pages = [
+        {"Contents": [{"Key": "0.json"}, {"Key": "1.json"}, {"Key": "2.json"}]},
+        {"Contents": [{"Key": "3.json"}, {"Key": "4.json"}]},
+    ]
+    loader = SilverLoader(make_s3(pages, objects), "silver", concurrency=4)
+    progress = []
+
+    keys = loader.list_keys()
+    df = loader.load(keys, lambda done, total: progress.append((done, total)))
+
+    assert keys == [f"{i}.json" for i in range(5)]
+    assert list(df["id"]) == ["0", "1", "2", "3", "4"]
+    assert df["embedding"][3].dtype == np.float32
+    np.testing.assert_array_equal(df["embedding"][3], [3.0, 1.0])
+    assert progress[-1] == (5, 5) and len(progress) == 5
+
+
+def test_load_fills_missing_fields_with_none():
+    objects = {
+        "a.json": {"id": "a", "embedding": [1.0], "model_name": "m"},
+        "b.json": {"id": "b", "embedding": [2.0]},
+    }
+    loader = SilverLoader(make_s3([], objects), "silver")
+
+    df = loader.load(["a.json", "b.json"])
+
+    assert df["model_name"][0] == "m"
+    assert df["model_name"].isna()[1]
+
+
+def test_load_without_keys_returns_empty_frame():
+    loader = SilverLoader(make_s3([{}], {}), "silver")
+
+    assert loader.list_keys() == []
+    assert loader.load([]).empty
+
+
+def test_load_mixes_legacy_json_and_msgpack_objects():
+    from app.core.codecs import get_codec
+
+    msgpack = get_codec("msgpack")
+    vector = np.array([0.25, -1.5, 3.0], dtype=np.float32)
+    bodies = {
+        # JSON indentado de antes do codec, sem Content-Type explícito
+        "old.json": ({"id": "old", "embedding": [1.0, 2.0, 3.0]}, None),
+        "new.json": ({"id": "new", "embedding": vector}, msgpack),
+    }
+    s3 = Mock()
+
+    def get_object(Bucket, Key):
+        record, codec = bodies[Key]
+        if codec is None:
+            return {"Body": BytesIO(json.dumps(record, indent=2).encode("utf-8"))}
+        return {
+            "Body": BytesIO(codec.encode(record)),
+            "ContentType": codec.content_type,
+        }
+
+    s3.get_object.side_effect = get_object
+    loader = SilverLoader(s3, "silver")
+
+    df = loader.load(["old.json", "new.json"])
+
+    assert list(df["id"]) == ["old", "new"]
+    np.testing.assert_array_equal(df["embedding"][0], [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(df["embedding"][1], vector)
+
+
+def test_load_skips_unreadable_objects_and_records_without_embedding():
+    objects = {
+        "a.json": {"id": "a", "embedding": [1.0, 0.0]},
+        "novec.json": {"id": "novec"},
+        "c.json": {"id": "c", "embedding": [0.0, 1.0]},
+    }
+    s3 = make_s3([], objects)
+    get_object = s3.get_object.side_effect
+
+    def flaky(Bucket, Key):
+        if Key == "broken.json":
+            raise ValueError("corpo truncado")
+        return get_object(Bucket, Key)
+
+    s3.get_object.side_effect = flaky
+    loader = SilverLoader(s3, "silver")
+
+    df = loader.load(["a.json", "broken.json", "novec.json", "c.json"])
+
+    # Um objeto ruim não aborta a carga nem vira um vetor de zeros
+    assert list(df["id"]) == ["a", "c"]
+    assert df.attrs["keys"] == ["a.json", "c.json"]
+    assert df.attrs["failed"] == ["broken.json"]
+    assert df.attrs["skipped"] == ["novec.json"]
+    np.testing.assert_array_equal(df["embedding"][1], [0.0, 1.0])
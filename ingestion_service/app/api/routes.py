@@ -1,4 +1,8 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.core.config import settings
+from app.core.rate_limit import arxiv_rate_limiter
+from app.services.fulltext_service import FullTextService
 from app.services.ingestion_service import IngestionService
 from app.repositories.s3_repository import S3Repository
 from app.scrapers.arxiv_scraper import ArxivScraper
@@ -6,11 +10,30 @@ from app.scrapers.arxiv_scraper import ArxivScraper
 router = APIRouter()
 
 
+def build_ingestion_service() -> IngestionService:
+    repository = S3Repository()
+    fulltext = (
+        FullTextService(repository, arxiv_rate_limiter)
+        if settings.PDF_ENABLED
+        else None
+    )
+    return IngestionService(
+        repository=repository,
+        scraper=ArxivScraper(rate_limiter=arxiv_rate_limiter),
+        fulltext=fulltext,
+    )
+
+
 @router.get("/health", status_code=200)
 def health_check():
     return {"status": "ok"}
 
 
+@router.get("/metrics")
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @router.post("/ingest")
 async def ingest(
     query: str = Query("cs.CL", description="Termo de busca no arXiv"),
@@ -18,7 +41,7 @@ async def ingest(
         50, description="Máximo de artigos a ingerir (paginação automática)"
     ),
 ):
-    service = IngestionService(repository=S3Repository(), scraper=ArxivScraper())
+    service = build_ingestion_service()
     await service.run(query=query, max_results=max_results)
     return {
         "status": "ok",
@@ -0,0 +1,77 @@
+from functools import lru_cache
+from typing import Optional
+import orjson
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/vnd.msgpack"
+
+
+class Codec:
+    """Formato do corpo dos objetos; o leitor descobre qual pelo Content-Type."""
+
+    name: str
+    content_type: str
+
+    def encode(self, record: dict) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, body: bytes) -> dict:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """JSON compacto (orjson, UTF-8 sem escapes). Também lê o JSON indentado antigo."""
+
+    name = "json"
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, record: dict) -> bytes:
+        return orjson.dumps(record)
+
+    def decode(self, body: bytes) -> dict:
+        return orjson.loads(body)
+
+
+class MsgpackCodec(Codec):
+    """MessagePack: binário, sem parsing de texto (`msgpack` importado só se usado)."""
+
+    name = "msgpack"
+    content_type = MSGPACK_CONTENT_TYPE
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError(
+                "SERIALIZATION_FORMAT=msgpack requer o pacote `msgpack`."
+            ) from e
+        self._msgpack = msgpack
+
+    def encode(self, record: dict) -> bytes:
+        return self._msgpack.packb(record)
+
+    def decode(self, body: bytes) -> dict:
+        return self._msgpack.unpackb(body)
+
+
+_CODECS = {codec.name: codec for codec in (JsonCodec, MsgpackCodec)}
+_CONTENT_TYPES = {
+    JSON_CONTENT_TYPE: "json",
+    MSGPACK_CONTENT_TYPE: "msgpack",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+}
+
+
+@lru_cache(maxsize=None)
+def get_codec(name: str) -> Codec:
+    """Codec de escrita (SERIALIZATION_FORMAT): "json" (padrão) ou "msgpack"."""
+    if name not in _CODECS:
+        raise ValueError(f"SERIALIZATION_FORMAT inválido: '{name}' (json | msgpack).")
+    return _CODECS[name]()
+
+
+def codec_for(content_type: Optional[str]) -> Codec:
+    """Codec de leitura; Content-Type ausente ou desconhecido = JSON (objetos legados)."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return get_codec(_CONTENT_TYPES.get(media_type, "json"))
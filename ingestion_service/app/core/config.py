@@ -13,4 +13,30 @@ class Settings(BaseSettings):
     RUN_ON_STARTUP: bool = False
     SEARCH_QUERY: str = "Machine Learning"
 
+    # Formato dos objetos do Bronze: "json" (orjson compacto) | "msgpack" (binário)
+    SERIALIZATION_FORMAT: str = "json"
+
+    # Tracing (OpenTelemetry): "none" (no-op) | "file" (JSON Lines) | "otlp"
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE: str = "traces-ingestion.jsonl"
+
+    # Manifesto de contagem do bucket (lido pelo Frontend no lugar de listar tudo)
+    STATS_KEY: str = "_stats/counts.json"
+
+    # Prefixos que o Processing grava no Bronze (mesmas variáveis do serviço):
+    # fora da contagem de artigos, como na listagem de pendentes de lá
+    DEAD_LETTER_PREFIX: str = "dead-letter/"
+    LEASE_PREFIX: str = "_leases/"
+
+    # Intervalo mínimo entre requisições ao arXiv (páginas e PDFs), por processo
+    ARXIV_MIN_INTERVAL_SECONDS: float = 3.0
+
+    # Etapa opcional de texto completo: FULLTEXT_PREFIX<id>.pdf e <id>.txt no Bronze
+    PDF_ENABLED: bool = False
+    FULLTEXT_PREFIX: str = "fulltext/"
+    PDF_CONCURRENCY: int = 4  # downloads simultâneos
+    PDF_EXTRACT_WORKERS: int = 2  # processos de extração de texto
+    PDF_PART_SIZE: int = 8 * 1024 * 1024  # parte do multipart (mínimo do S3: 5 MiB)
+    PDF_MAX_BYTES: int = 50 * 1024 * 1024
+
 settings = Settings()
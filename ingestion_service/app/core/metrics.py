@@ -0,0 +1,41 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets cobrem desde puts rápidos no MinIO até páginas lentas do arXiv
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+STAGE_SECONDS = Histogram(
+    "ingestion_stage_seconds",
+    "Duração de cada etapa da ingestão.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+# Filhos pré-resolvidos: evita o lookup de labels no caminho quente
+FETCH_SECONDS = STAGE_SECONDS.labels(stage="fetch")
+PARSE_SECONDS = STAGE_SECONDS.labels(stage="parse")
+SAVE_SECONDS = STAGE_SECONDS.labels(stage="save")
+PDF_DOWNLOAD_SECONDS = STAGE_SECONDS.labels(stage="pdf_download")
+PDF_EXTRACT_SECONDS = STAGE_SECONDS.labels(stage="pdf_extract")
+
+ARTICLES_INGESTED = Counter(
+    "ingestion_articles_total", "Artigos persistidos na camada Bronze."
+)
+SAVE_ERRORS = Counter(
+    "ingestion_save_errors_total", "Falhas ao persistir objetos no Bronze."
+)
+ARXIV_RATE_LIMITED = Counter(
+    "ingestion_arxiv_rate_limited_total", "Respostas HTTP 429 do arXiv."
+)
+ARXIV_HTTP_ERRORS = Counter(
+    "ingestion_arxiv_http_errors_total", "Respostas HTTP de erro do arXiv.", ["status"]
+)
+PDFS_STORED = Counter(
+    "ingestion_pdfs_total", "PDFs gravados no Bronze com o texto extraído."
+)
+PDF_BYTES = Counter("ingestion_pdf_bytes_total", "Bytes de PDF enviados ao Bronze.")
+PDF_ERRORS = Counter(
+    "ingestion_pdf_errors_total", "Falhas no download, upload ou extração de PDFs."
+)
+
+IN_FLIGHT_REQUESTS = Gauge(
+    "ingestion_http_requests_in_flight", "Requisições HTTP em andamento na API."
+)
@@ -0,0 +1,29 @@
+import asyncio
+import time
+from typing import Callable
+from app.core.config import settings
+
+
+class RateLimiter:
+    """
+    Espaça o início das requisições em pelo menos `interval` segundos.
+
+    Cada chamada reserva o próximo horário livre antes de dormir, então
+    corrotinas concorrentes formam uma fila, sem lock e sem rajadas.
+    """
+
+    def __init__(self, interval: float, clock: Callable[[], float] = time.monotonic):
+        self.interval = interval
+        self.clock = clock
+        self._next_slot = float("-inf")
+
+    async def acquire(self) -> None:
+        now = self.clock()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# Um por processo: páginas de busca e downloads de PDF dividem o mesmo limite do arXiv
+arxiv_rate_limiter = RateLimiter(settings.ARXIV_MIN_INTERVAL_SECONDS)
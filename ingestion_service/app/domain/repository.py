@@ -1,7 +1,25 @@
-from typing import Protocol, Dict, Any
+from typing import AsyncIterator, Protocol, Dict, Any
 
 
 class RepositoryProtocol(Protocol):
-    async def save_json(self, key: str, data: Dict[str, Any]) -> None:
-        """Salva um dicionário como JSON no repositório."""
+    async def save_json(self, key: str, data: Dict[str, Any]) -> bool:
+        """Salva um dicionário no repositório (JSON ou o formato configurado); False se falhou."""
+        ...
+
+    async def exists(self, key: str) -> bool:
+        """Indica se o objeto já existe (HEAD)."""
+        ...
+
+    async def upload_stream(
+        self, key: str, chunks: AsyncIterator[bytes], content_type: str, part_size: int
+    ) -> int:
+        """Grava um stream sem carregá-lo inteiro em memória; devolve os bytes gravados."""
+        ...
+
+    async def save_text(self, key: str, text: str, metadata: Dict[str, str]) -> None:
+        """Salva um texto UTF-8 com metadata."""
+        ...
+
+    async def update_stats(self) -> int:
+        """Reconta os objetos do repositório e grava o manifesto de contagem."""
         ...
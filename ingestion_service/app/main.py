@@ -1,22 +1,22 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from contextlib import asynccontextmanager
-from app.api.routes import router
+from app.api.routes import build_ingestion_service, router
 from app.core.storage import initialize_buckets
 from app.core.config import settings
-from app.services.ingestion_service import IngestionService
-from app.repositories.s3_repository import S3Repository
-from app.scrapers.arxiv_scraper import ArxivScraper
+from app.core.metrics import IN_FLIGHT_REQUESTS
+from app.core.tracing import configure_tracing
 import asyncio
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    configure_tracing()
     initialize_buckets()
     
     if settings.RUN_ON_STARTUP:
         print("🚀 RUN_ON_STARTUP=True. Iniciando Job de Ingestão...")
-        service = IngestionService(repository=S3Repository(), scraper=ArxivScraper())
+        service = build_ingestion_service()
         # Roda em background para não bloquear o startup do Uvicorn (opcional, mas bom pra healthcheck)
         asyncio.create_task(service.run(query=settings.SEARCH_QUERY, max_results=50))
     
@@ -31,4 +31,11 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+@app.middleware("http")
+async def track_in_flight_requests(request: Request, call_next):
+    with IN_FLIGHT_REQUESTS.track_inprogress():
+        return await call_next(request)
+
+
 app.include_router(router)
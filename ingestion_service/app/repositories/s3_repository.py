@@ -1,8 +1,15 @@
 import json
 import boto3
+from botocore.exceptions import ClientError
+from opentelemetry import trace
 import asyncio
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List
+from app.core.codecs import get_codec
 from app.core.config import settings
 from app.core.logger import logger
+from app.core.metrics import SAVE_ERRORS, SAVE_SECONDS
+from app.core.tracing import inject_context, tracer
 
 
 class S3Repository:
@@ -15,16 +22,166 @@ class S3Repository:
             region_name=settings.AWS_REGION,
         )
         self.bucket = settings.S3_BUCKET_NAME
+        # Formato do Bronze; o Content-Type diz ao Processing como ler cada objeto
+        self.codec = get_codec(settings.SERIALIZATION_FORMAT)
 
-    async def save_json(self, key: str, data: dict):
+    async def save_json(self, key: str, data: dict) -> bool:
+        """Grava o objeto; False (erro logado e contado) se o upload falhou."""
+        with tracer.start_as_current_span(
+            "s3.put_object",
+            attributes={"aws.s3.bucket": self.bucket, "aws.s3.key": key},
+        ) as span:
+            try:
+                with SAVE_SECONDS.time():
+                    await asyncio.to_thread(
+                        self.client.put_object,
+                        Bucket=self.bucket,
+                        Key=key,
+                        Body=self.codec.encode(data),
+                        ContentType=self.codec.content_type,
+                        # traceparent no metadata: o processamento liga seus spans a este
+                        Metadata=inject_context({}),
+                    )
+                logger.info(f"Objeto salvo com sucesso: {key}")
+                return True
+            except Exception as e:
+                SAVE_ERRORS.inc()
+                span.record_exception(e)
+                span.set_status(trace.StatusCode.ERROR, str(e))
+                logger.error(f"Erro ao salvar objeto {key}: {e}")
+                return False
+
+    async def exists(self, key: str) -> bool:
         try:
+            await asyncio.to_thread(
+                self.client.head_object, Bucket=self.bucket, Key=key
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+            raise
+        return True
+
+    async def upload_stream(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str,
+        part_size: int,
+    ) -> int:
+        """
+        Multipart upload a partir de um stream; devolve o total de bytes.
+
+        Só a parte corrente (~`part_size`, mínimo de 5 MiB no S3 exceto a última)
+        fica em memória. Em erro o upload é abortado: nenhum objeto parcial fica
+        visível e as partes já enviadas são descartadas.
+        """
+        with tracer.start_as_current_span(
+            "s3.multipart_upload",
+            attributes={"aws.s3.bucket": self.bucket, "aws.s3.key": key},
+        ) as span:
+            upload = await asyncio.to_thread(
+                self.client.create_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                ContentType=content_type,
+                Metadata=inject_context({}),
+            )
+            upload_id = upload["UploadId"]
+            parts: List[Dict] = []
+            buffer = bytearray()
+            size = 0
+            try:
+                async for chunk in chunks:
+                    buffer += chunk
+                    size += len(chunk)
+                    if len(buffer) >= part_size:
+                        await self._upload_part(key, upload_id, parts, bytes(buffer))
+                        buffer.clear()
+                if buffer or not parts:
+                    await self._upload_part(key, upload_id, parts, bytes(buffer))
+                await asyncio.to_thread(
+                    self.client.complete_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+            except BaseException:
+                await asyncio.to_thread(
+                    self.client.abort_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                )
+                raise
+            span.set_attribute("s3.parts", len(parts))
+            span.set_attribute("s3.bytes", size)
+        return size
+
+    async def _upload_part(
+        self, key: str, upload_id: str, parts: List[Dict], body: bytes
+    ) -> None:
+        number = len(parts) + 1
+        response = await asyncio.to_thread(
+            self.client.upload_part,
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=body,
+        )
+        parts.append({"PartNumber": number, "ETag": response["ETag"]})
+
+    async def save_text(self, key: str, text: str, metadata: Dict[str, str]) -> None:
+        with tracer.start_as_current_span(
+            "s3.put_object",
+            attributes={"aws.s3.bucket": self.bucket, "aws.s3.key": key},
+        ):
             await asyncio.to_thread(
                 self.client.put_object,
                 Bucket=self.bucket,
                 Key=key,
-                Body=json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"),
-                ContentType="application/json",
+                Body=text.encode("utf-8"),
+                ContentType="text/plain; charset=utf-8",
+                Metadata=inject_context(metadata),
             )
-            logger.info(f"Objeto salvo com sucesso: {key}")
-        except Exception as e:
-            logger.error(f"Erro ao salvar objeto {key}: {e}")
+
+    async def update_stats(self) -> int:
+        # Contagem paginada (KeyCount de uma única chamada para em 1.000)
+        def count() -> int:
+            paginator = self.client.get_paginator("list_objects_v2")
+            return sum(
+                1
+                for page in paginator.paginate(Bucket=self.bucket)
+                for obj in page.get("Contents", [])
+                # Dead-letter, leases, PDFs e textos completos não são artigos
+                if obj["Key"] != settings.STATS_KEY
+                and not obj["Key"].startswith(
+                    (
+                        settings.DEAD_LETTER_PREFIX,
+                        settings.LEASE_PREFIX,
+                        settings.FULLTEXT_PREFIX,
+                    )
+                )
+            )
+
+        with tracer.start_as_current_span(
+            "s3.update_stats", attributes={"aws.s3.bucket": self.bucket}
+        ) as span:
+            total = await asyncio.to_thread(count)
+            span.set_attribute("s3.objects", total)
+        manifest = {
+            "count": total,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "writer": "ingestion",
+        }
+        await asyncio.to_thread(
+            self.client.put_object,
+            Bucket=self.bucket,
+            Key=settings.STATS_KEY,
+            Body=json.dumps(manifest).encode("utf-8"),
+            ContentType="application/json",
+        )
+        logger.info(f"Manifesto de contagem atualizado: {total} objetos.")
+        return total
@@ -2,57 +2,94 @@ import asyncio
 import httpx
 from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from app.domain.article import Article, Author
 from app.core.logger import logger
+from app.core.rate_limit import RateLimiter
+from app.core.tracing import tracer
+from app.core.metrics import (
+    ARXIV_HTTP_ERRORS,
+    ARXIV_RATE_LIMITED,
+    FETCH_SECONDS,
+    PARSE_SECONDS,
+)
 
 
 class ArxivScraper:
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None):
+        # Limite compartilhado com os downloads de PDF (mesmo host)
+        self.rate_limiter = rate_limiter
+
     async def fetch_articles(
         self, query: str, max_results: int, start: int = 0
     ) -> List[Article]:
 
-        url = (
-            "https://arxiv.org/search/"
-            f"?query={query}"
-            "&searchtype=all"
-            "&abstracts=show"
-            "&order=-announced_date_first"
-            f"&size={max_results}"
-            f"&start={start}"
-        )
-
-        headers = {
-            "User-Agent": "IngestionService/1.0 (contact: admin@example.com)"
-        }
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, headers=headers)
-
-        # ===============================
-        # Tratamento correto de erros HTTP
-        # ===============================
-
-        if response.status_code == 429:
-            logger.error(
-                "Rate limit do arXiv atingido (HTTP 429). "
-                "Aguardando antes de nova tentativa."
+        with tracer.start_as_current_span(
+            "arxiv.fetch_articles",
+            attributes={
+                "arxiv.query": query,
+                "arxiv.start": start,
+                "arxiv.size": max_results,
+            },
+        ) as span:
+            url = (
+                "https://arxiv.org/search/"
+                f"?query={query}"
+                "&searchtype=all"
+                "&abstracts=show"
+                "&order=-announced_date_first"
+                f"&size={max_results}"
+                f"&start={start}"
             )
-            await asyncio.sleep(5) # Espera 5 segundos antes de nova tentativa, para evitar bloqueios. 
-            raise RuntimeError("ARXIV_RATE_LIMIT")
 
-        if response.status_code != 200:
-            logger.error(
-                f"Erro HTTP ao acessar arXiv: {response.status_code}"
-            )
-            raise RuntimeError(f"ARXIV_HTTP_{response.status_code}")
+            headers = {
+                "User-Agent": "IngestionService/1.0 (contact: admin@example.com)"
+            }
+
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+
+            with FETCH_SECONDS.time():
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    response = await client.get(url, headers=headers)
+            span.set_attribute("http.response.status_code", response.status_code)
+
+            # ===============================
+            # Tratamento correto de erros HTTP
+            # ===============================
+
+            if response.status_code == 429:
+                ARXIV_RATE_LIMITED.inc()
+                logger.error(
+                    "Rate limit do arXiv atingido (HTTP 429). "
+                    "Aguardando antes de nova tentativa."
+                )
+                await asyncio.sleep(5) # Espera 5 segundos antes de nova tentativa, para evitar bloqueios. 
+                raise RuntimeError("ARXIV_RATE_LIMIT")
+
+            if response.status_code != 200:
+                ARXIV_HTTP_ERRORS.labels(status=str(response.status_code)).inc()
+                logger.error(
+                    f"Erro HTTP ao acessar arXiv: {response.status_code}"
+                )
+                raise RuntimeError(f"ARXIV_HTTP_{response.status_code}")
 
-        # ===============================
-        # Parse do HTML
-        # ===============================
+            # ===============================
+            # Parse do HTML
+            # ===============================
 
-        soup = BeautifulSoup(response.text, "html.parser")
+            with PARSE_SECONDS.time():
+                articles = self._parse_results(
+                    response.text, query, max_results, start
+                )
+            span.set_attribute("arxiv.articles", len(articles))
+            return articles
+
+    def _parse_results(
+        self, html: str, query: str, max_results: int, start: int
+    ) -> List[Article]:
+        soup = BeautifulSoup(html, "html.parser")
         results = soup.select("li.arxiv-result")[:max_results]
 
         if not results:
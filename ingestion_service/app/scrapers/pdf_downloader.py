@@ -0,0 +1,48 @@
+from typing import AsyncIterator, Optional
+import httpx
+from app.core.logger import logger
+from app.core.metrics import ARXIV_HTTP_ERRORS, ARXIV_RATE_LIMITED
+from app.core.rate_limit import RateLimiter
+
+HEADERS = {"User-Agent": "IngestionService/1.0 (contact: admin@example.com)"}
+CHUNK_SIZE = 64 * 1024
+
+
+class PdfDownloader:
+    """GET em streaming dos PDFs do arXiv: o arquivo nunca fica inteiro em memória."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.max_bytes = max_bytes
+
+    async def stream(self, url: str) -> AsyncIterator[bytes]:
+        """Pedaços de até CHUNK_SIZE bytes; use com `contextlib.aclosing`."""
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+
+        async with self.client.stream("GET", url, headers=HEADERS) as response:
+            if response.status_code == 429:
+                ARXIV_RATE_LIMITED.inc()
+                raise RuntimeError("ARXIV_RATE_LIMIT")
+            if response.status_code != 200:
+                ARXIV_HTTP_ERRORS.labels(status=str(response.status_code)).inc()
+                raise RuntimeError(f"ARXIV_HTTP_{response.status_code}")
+
+            received = 0
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                # O arXiv responde HTML (200) enquanto gera o PDF de alguns artigos
+                if not received and not chunk.startswith(b"%PDF-"):
+                    logger.warning(f"Resposta de {url} não é um PDF.")
+                    raise ValueError("NOT_A_PDF")
+                received += len(chunk)
+                if self.max_bytes and received > self.max_bytes:
+                    raise ValueError(f"PDF_TOO_LARGE (> {self.max_bytes} bytes)")
+                yield chunk
+            if not received:
+                raise ValueError("NOT_A_PDF")
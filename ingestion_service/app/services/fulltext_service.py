@@ -0,0 +1,170 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
+from typing import AsyncIterator, BinaryIO, Callable, List, Optional, Tuple
+import httpx
+from pydantic import BaseModel
+from app.domain.article import Article
+from app.domain.repository import RepositoryProtocol
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import (
+    PDF_BYTES,
+    PDF_DOWNLOAD_SECONDS,
+    PDF_ERRORS,
+    PDF_EXTRACT_SECONDS,
+    PDFS_STORED,
+)
+from app.core.rate_limit import RateLimiter
+from app.core.tracing import tracer
+from app.scrapers.pdf_downloader import PdfDownloader
+from app.services.pdf_text import extract_text
+
+
+class FullTextResult(BaseModel):
+    stored: int = 0
+    # Texto já extraído em uma ingestão anterior
+    skipped: int = 0
+    failed: List[str] = []
+    bytes: int = 0
+
+
+async def _spool(chunks: AsyncIterator[bytes], file: BinaryIO) -> AsyncIterator[bytes]:
+    # Cópia em disco para a extração; o upload segue pedaço a pedaço
+    async for chunk in chunks:
+        file.write(chunk)
+        yield chunk
+
+
+class FullTextService:
+    """
+    Etapa opcional do Bronze: PDF completo e texto extraído de cada artigo.
+
+    * `submit` agenda os PDFs de uma página em background (sobrepõe a pausa
+      anti-ban); no máximo `concurrency` downloads simultâneos, sob o rate limit
+      compartilhado com o scraper;
+    * o PDF vai em streaming para `FULLTEXT_PREFIX<id>.pdf` (multipart) e para
+      um arquivo temporário, sem ficar inteiro em memória;
+    * a extração (pypdf) roda em um pool de processos e o texto vai para
+      `FULLTEXT_PREFIX<id>.txt`, entrada do processamento de textos longos;
+    * `drain` espera os downloads pendentes e libera o pool.
+    Artigos com o `.txt` já gravado são pulados.
+    """
+
+    def __init__(
+        self,
+        repository: RepositoryProtocol,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[int] = None,
+        extract_workers: Optional[int] = None,
+        part_size: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        prefix: Optional[str] = None,
+        client_factory: Callable[..., httpx.AsyncClient] = httpx.AsyncClient,
+    ):
+        self.repo = repository
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency or settings.PDF_CONCURRENCY
+        self.extract_workers = extract_workers or settings.PDF_EXTRACT_WORKERS
+        self.part_size = part_size or settings.PDF_PART_SIZE
+        self.max_bytes = max_bytes or settings.PDF_MAX_BYTES
+        self.prefix = prefix or settings.FULLTEXT_PREFIX
+        self.client_factory = client_factory
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._tasks: List[Tuple[str, asyncio.Task]] = []
+        self._downloader: Optional[PdfDownloader] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, articles: List[Article]) -> None:
+        for article in articles:
+            if article.pdf_link:
+                task = asyncio.create_task(self._ingest_one(article))
+                self._tasks.append((article.id, task))
+
+    async def drain(self) -> FullTextResult:
+        tasks, self._tasks = self._tasks, []
+        outcomes = await asyncio.gather(
+            *(task for _, task in tasks), return_exceptions=True
+        )
+        result = FullTextResult()
+        for (article_id, _), outcome in zip(tasks, outcomes):
+            if isinstance(outcome, BaseException):
+                PDF_ERRORS.inc()
+                logger.warning(f"Falha no texto completo de {article_id}: {outcome}")
+                result.failed.append(article_id)
+            elif outcome is None:
+                result.skipped += 1
+            else:
+                result.stored += 1
+                result.bytes += outcome
+        await self.close()
+        return result
+
+    async def close(self) -> None:
+        if self._downloader:
+            await self._downloader.client.aclose()
+            self._downloader = None
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_downloader(self) -> PdfDownloader:
+        if self._downloader is None:
+            client = self.client_factory(
+                timeout=60.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.concurrency),
+            )
+            self._downloader = PdfDownloader(client, self.rate_limiter, self.max_bytes)
+        return self._downloader
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: fork de um processo com threads (boto3, to_thread) não é seguro
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.extract_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def _ingest_one(self, article: Article) -> Optional[int]:
+        pdf_key = f"{self.prefix}{article.id}.pdf"
+        text_key = f"{self.prefix}{article.id}.txt"
+        with tracer.start_as_current_span(
+            "fulltext.ingest", attributes={"arxiv.id": article.id}
+        ) as span:
+            fd, path = tempfile.mkstemp(suffix=".pdf")
+            try:
+                with os.fdopen(fd, "wb") as spool:
+                    # Vaga no pool de downloads só durante a rede; a extração fica fora
+                    async with self._semaphore:
+                        if await self.repo.exists(text_key):
+                            return None
+                        with PDF_DOWNLOAD_SECONDS.time():
+                            stream = self._get_downloader().stream(article.pdf_link)
+                            async with aclosing(stream) as chunks:
+                                size = await self.repo.upload_stream(
+                                    pdf_key,
+                                    _spool(chunks, spool),
+                                    "application/pdf",
+                                    self.part_size,
+                                )
+                with PDF_EXTRACT_SECONDS.time():
+                    text, pages = await asyncio.get_running_loop().run_in_executor(
+                        self._get_pool(), extract_text, path
+                    )
+            finally:
+                os.unlink(path)
+
+            await self.repo.save_text(
+                text_key, text, {"pages": str(pages), "pdf-key": pdf_key}
+            )
+            span.set_attribute("pdf.bytes", size)
+            span.set_attribute("pdf.pages", pages)
+        PDFS_STORED.inc()
+        PDF_BYTES.inc(size)
+        logger.info(f"Texto completo salvo: {text_key} ({pages} páginas, {size} bytes)")
+        return size
@@ -1,64 +1,109 @@
 from app.domain.repository import RepositoryProtocol
 from app.domain.scraper import ScraperProtocol
 from app.core.logger import logger
+from app.core.metrics import ARTICLES_INGESTED
+from app.core.tracing import tracer
+from app.services.fulltext_service import FullTextService
 import random
 import asyncio
 from datetime import datetime
+from typing import Optional
 
 
 class IngestionService:
-    def __init__(self, repository: RepositoryProtocol, scraper: ScraperProtocol):
+    def __init__(
+        self,
+        repository: RepositoryProtocol,
+        scraper: ScraperProtocol,
+        fulltext: Optional[FullTextService] = None,
+    ):
         self.repo = repository
         self.scraper = scraper
+        # Etapa opcional de PDFs (PDF_ENABLED)
+        self.fulltext = fulltext
 
     async def run(self, query: str, max_results: int = 50):
         logger.info(
             f"Iniciando ingestão de até {max_results} artigos para query='{query}'..."
         )
 
-        collected_count = 0
-        start = 0
+        collected_count = 0  # artigos gravados no Bronze
+        start = 0  # artigos recebidos do arXiv (cursor da paginação)
         batch_size = 50  # Padrão do arXiv
 
-        while collected_count < max_results:
-            # Garante que não pede mais do que o batch permite ou o que falta
-            logger.info(f"Buscando página iniciando em {start}...")
+        try:
+            while start < max_results:
+                # Um span por página (fetch, parse e saves como filhos); a pausa
+                # anti-ban fica fora dele para o trace mostrar só trabalho real
+                with tracer.start_as_current_span(
+                    "ingestion.page",
+                    attributes={"arxiv.query": query, "arxiv.start": start},
+                ) as span:
+                    # Garante que não pede mais do que o batch permite ou o que falta
+                    logger.info(f"Buscando página iniciando em {start}...")
 
-            # Limita a busca ao tamanho do batch
-            articles = await self.scraper.fetch_articles(query, batch_size, start=start)
+                    # Limita a busca ao tamanho do batch
+                    articles = await self.scraper.fetch_articles(
+                        query, batch_size, start=start
+                    )
 
-            if not articles:
-                logger.info("Nenhum artigo retornado. Encerrando busca.")
-                break
+                    if not articles:
+                        logger.info("Nenhum artigo retornado. Encerrando busca.")
+                        break
 
-            count_saved = 0
-            for article in articles:
-                payload = {
-                    "ingestion_timestamp": datetime.now().isoformat(),
-                    "ingestion_source": "arxiv_html",
-                    "search_query": query,
-                    "article_data": article.model_dump(mode="json"),
-                }
-                await self.repo.save_json(f"{article.id}.json", payload)
-                count_saved += 1
+                    count_saved = 0
+                    for article in articles:
+                        payload = {
+                            "ingestion_timestamp": datetime.now().isoformat(),
+                            "ingestion_source": "arxiv_html",
+                            "search_query": query,
+                            "article_data": article.model_dump(mode="json"),
+                        }
+                        # Falhas de upload não contam como ingeridas
+                        if await self.repo.save_json(f"{article.id}.json", payload):
+                            count_saved += 1
 
-            collected_count += count_saved
-            start += len(articles)
+                    if self.fulltext:
+                        self.fulltext.submit(articles)
 
-            logger.info(
-                f"Página processada. Coletados: {collected_count}/{max_results}"
-            )
+                    collected_count += count_saved
+                    ARTICLES_INGESTED.inc(count_saved)
+                    start += len(articles)
+                    span.set_attribute("ingestion.articles", len(articles))
+                    span.set_attribute("ingestion.saved", count_saved)
 
-            # Se veio menos artigos que o batch, significa que acabou a fonte
-            if len(articles) < batch_size:
-                break
+                logger.info(
+                    f"Página processada. Gravados: {count_saved}/{len(articles)} "
+                    f"(total {collected_count}, recebidos {start}/{max_results})"
+                )
 
-            # Anti-Ban: Pausa se ainda não acabou
-            if collected_count < max_results:
-                wait_time = random.uniform(80.0, 90.0)
+                # Se veio menos artigos que o batch, significa que acabou a fonte
+                if len(articles) < batch_size:
+                    break
+
+                # Anti-Ban: Pausa se ainda não acabou
+                if start < max_results:
+                    wait_time = random.uniform(80.0, 90.0)
+                    logger.info(
+                        f"Aguardando {wait_time:.2f}s para próxima página (Anti-Ban)..."
+                    )
+                    await asyncio.sleep(wait_time)
+        finally:
+            # PDFs baixam em background durante a paginação; espera os pendentes
+            if self.fulltext:
+                with tracer.start_as_current_span("ingestion.fulltext_drain") as span:
+                    pdfs = await self.fulltext.drain()
+                    span.set_attribute("ingestion.pdfs", pdfs.stored)
                 logger.info(
-                    f"Aguardando {wait_time:.2f}s para próxima página (Anti-Ban)..."
+                    f"Texto completo: {pdfs.stored} PDFs gravados, "
+                    f"{pdfs.skipped} já existentes, {len(pdfs.failed)} falhas."
                 )
-                await asyncio.sleep(wait_time)
 
         logger.info(f"Ingestão concluída. Total coletado: {collected_count}")
+
+        # Uma recontagem por execução mantém o header do Frontend sem listar o bucket
+        if collected_count:
+            try:
+                await self.repo.update_stats()
+            except Exception as e:
+                logger.warning(f"Falha ao atualizar o manifesto de contagem: {e}")
@@ -0,0 +1,16 @@
+from typing import Tuple
+
+
+def extract_text(path: str) -> Tuple[str, int]:
+    """
+    Texto de um PDF em disco e o número de páginas.
+
+    Roda nos processos do ProcessPoolExecutor: o parsing é CPU-bound e, no
+    processo da API, seguraria o GIL e o event loop durante os downloads.
+    """
+    # Import tardio: só os processos de extração carregam o pypdf
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    pages = [page.extract_text() or "" for page in reader.pages]
+    return "\n\n".join(pages).strip(), len(pages)
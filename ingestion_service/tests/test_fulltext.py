@@ -0,0 +1,215 @@
+import asyncio
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import boto3
+import pytest
+from moto import mock_aws
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter
+from app.domain.article import Article
+from app.repositories.s3_repository import S3Repository
+from app.services.fulltext_service import FullTextService
+
+
+def make_pdf(text: str, padding: int = 0) -> bytes:
+    """PDF mínimo de uma página com `text`; `padding` infla o arquivo (multipart)."""
+    content = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R"
+        b" /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    if padding:
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (padding, b"0" * padding)
+        )
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(pdf)
+
+
+class ArxivPdfStub:
+    """Servidor HTTP local no lugar de arxiv.org/pdf; mede downloads simultâneos."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests.append(self.path)
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    time.sleep(0.05)  # sobreposição visível entre downloads
+                    status, content_type, body = stub.routes.get(
+                        self.path, (404, "text/plain", b"not found")
+                    )
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    for i in range(0, len(body), 16 * 1024):
+                        self.wfile.write(body[i : i + 16 * 1024])
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+SMALL_PDF = make_pdf("Quantum surface codes")
+LARGE_PDF = make_pdf("Transformer scaling laws", padding=200 * 1024)
+
+
+@pytest.fixture
+def stub():
+    server = ArxivPdfStub(
+        {
+            "/pdf/2401.00001": (200, "application/pdf", SMALL_PDF),
+            "/pdf/2401.00002": (200, "application/pdf", LARGE_PDF),
+            "/pdf/2401.00003": (200, "text/html", b"<html>PDF sendo gerado</html>"),
+        }
+    )
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def s3():
+    # Partes mínimas de 5 MiB só fazem sentido no S3 real
+    with mock_aws(), patch("moto.s3.models.S3_UPLOAD_PART_MIN_SIZE", 1024):
+        with patch.object(settings, "S3_ENDPOINT", None):
+            client = boto3.client("s3", region_name="us-east-1")
+            client.create_bucket(Bucket=settings.S3_BUCKET_NAME)
+            yield client
+
+
+def article(article_id, stub):
+    return Article(
+        id=article_id,
+        title="Paper",
+        authors=[],
+        summary="Abstract",
+        published="2024-01-01T00:00:00",
+        updated="2024-01-01T00:00:00",
+        categories=["cs.AI"],
+        link=f"{stub.url}/abs/{article_id}",
+        pdf_link=f"{stub.url}/pdf/{article_id}",
+    )
+
+
+def service(repo, **overrides):
+    options = dict(
+        rate_limiter=RateLimiter(0.0),
+        concurrency=2,
+        extract_workers=1,
+        part_size=64 * 1024,
+    )
+    return FullTextService(repo, **{**options, **overrides})
+
+
+def get(s3, key):
+    return s3.get_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+
+
+@pytest.mark.asyncio
+async def test_pdfs_stream_to_bronze_and_text_is_extracted(stub, s3):
+    repo = S3Repository()
+    upload_part = repo.client.upload_part
+    parts = []
+    repo.client.upload_part = lambda **kwargs: parts.append(kwargs["Key"]) or (
+        upload_part(**kwargs)
+    )
+    articles = [article(f"2401.0000{i}", stub) for i in range(1, 5)]
+    articles.append(articles[0].model_copy(update={"id": "nolink", "pdf_link": None}))
+    fulltext = service(repo)
+
+    fulltext.submit(articles)
+    result = await fulltext.drain()
+
+    assert result.stored == 2
+    assert result.bytes == len(SMALL_PDF) + len(LARGE_PDF)
+    # HTML no lugar do PDF e 404: falham sem derrubar os demais
+    assert sorted(result.failed) == ["2401.00003", "2401.00004"]
+    assert get(s3, "fulltext/2401.00002.pdf")["Body"].read() == LARGE_PDF
+    assert get(s3, "fulltext/2401.00002.pdf")["ContentType"] == "application/pdf"
+    # Arquivo maior que a parte: upload em várias partes, nunca inteiro em memória
+    assert parts.count("fulltext/2401.00002.pdf") == math.ceil(
+        len(LARGE_PDF) / (64 * 1024)
+    )
+    text = get(s3, "fulltext/2401.00001.txt")
+    assert text["Body"].read().decode("utf-8") == "Quantum surface codes"
+    assert text["Metadata"]["pages"] == "1"
+    # Falhas abortam o multipart: nem objeto parcial nem upload pendente
+    uploads = s3.list_multipart_uploads(Bucket=settings.S3_BUCKET_NAME)
+    assert not uploads.get("Uploads")
+    listed = s3.list_objects_v2(Bucket=settings.S3_BUCKET_NAME)["Contents"]
+    assert "fulltext/2401.00003.pdf" not in {obj["Key"] for obj in listed}
+    assert stub.max_active <= 2
+
+
+@pytest.mark.asyncio
+async def test_articles_with_extracted_text_are_skipped(stub, s3):
+    repo = S3Repository()
+    articles = [article("2401.00001", stub)]
+
+    first = service(repo)
+    first.submit(articles)
+    await first.drain()
+    second = service(repo)
+    second.submit(articles)
+    result = await second.drain()
+
+    assert result.skipped == 1 and result.stored == 0
+    assert stub.requests == ["/pdf/2401.00001"]
+    # PDFs e textos ficam fora da contagem de artigos do Bronze
+    assert await repo.update_stats() == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_concurrent_requests():
+    now = [100.0]
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    limiter = RateLimiter(3.0, clock=lambda: now[0])
+    with patch("app.core.rate_limit.asyncio.sleep", fake_sleep):
+        await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+        now[0] += 10.0
+        await limiter.acquire()
+
+    # A primeira passa direto; as concorrentes entram na fila, 3s cada
+    assert waits == [3.0, 6.0]
@@ -52,6 +52,62 @@ async def test_ingestion_success_flow(mock_sleep):
 
     assert filename == "1234.5678.json"
     assert payload["ingestion_source"] == "arxiv_html"
+    # Manifesto de contagem atualizado uma vez ao fim da execução
+    mock_repo.update_stats.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_uploads_are_not_counted_as_ingested(mock_sleep):
+    from prometheus_client import REGISTRY
+
+    def ingested():
+        return REGISTRY.get_sample_value("ingestion_articles_total") or 0.0
+
+    articles = [MagicMock(id=str(i)) for i in range(3)]
+    mock_scraper = AsyncMock()
+    mock_scraper.fetch_articles.return_value = articles
+    mock_repo = AsyncMock()
+    # O 2º upload falha (save_json loga e devolve False)
+    mock_repo.save_json.side_effect = [True, False, True]
+    before = ingested()
+
+    service = IngestionService(repository=mock_repo, scraper=mock_scraper)
+    await service.run(query="test", max_results=3)
+
+    assert ingested() - before == 2
+    mock_scraper.fetch_articles.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_anti_ban_pause_happens_outside_page_spans(mock_sleep):
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    # Duas páginas cheias: uma pausa entre elas
+    mock_scraper = AsyncMock()
+    mock_scraper.fetch_articles.return_value = [MagicMock(id=str(i)) for i in range(50)]
+    # Cada pausa registra quantos spans de página já tinham terminado
+    ended_at_sleep = []
+    mock_sleep.side_effect = lambda _: ended_at_sleep.append(
+        len(exporter.get_finished_spans())
+    )
+
+    service = IngestionService(repository=AsyncMock(), scraper=mock_scraper)
+    with patch("app.services.ingestion_service.tracer", provider.get_tracer("test")):
+        await service.run(query="test", max_results=100)
+
+    spans = exporter.get_finished_spans()
+    assert [s.name for s in spans] == ["ingestion.page", "ingestion.page"]
+    assert [s.attributes["arxiv.start"] for s in spans] == [0, 50]
+    # A página 1 já estava fechada quando a pausa começou
+    assert ended_at_sleep == [1]
 
 
 @pytest.mark.asyncio
@@ -66,3 +122,27 @@ async def test_ingestion_scraper_failure(mock_sleep):
     # Deve propagar a exceção
     with pytest.raises(Exception):
         await service.run(query="test")
+
+
+@pytest.mark.asyncio
+async def test_ingestion_hands_pages_to_fulltext_and_drains_on_failure(mock_sleep):
+    from app.services.fulltext_service import FullTextResult
+
+    fake_article = MagicMock()
+    fake_article.id = "1"
+    fake_article.model_dump.return_value = {"id": "1"}
+    page = [fake_article] * 50
+    mock_scraper = AsyncMock()
+    # Segunda página falha: os PDFs da primeira ainda são esperados
+    mock_scraper.fetch_articles.side_effect = [page, Exception("Scraper Failed")]
+    fulltext = MagicMock()
+    fulltext.drain = AsyncMock(return_value=FullTextResult(stored=50))
+
+    service = IngestionService(
+        repository=AsyncMock(), scraper=mock_scraper, fulltext=fulltext
+    )
+    with pytest.raises(Exception):
+        await service.run(query="test", max_results=100)
+
+    fulltext.submit.assert_called_once_with(page)
+    fulltext.drain.assert_awaited_once()
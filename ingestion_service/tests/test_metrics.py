@@ -0,0 +1,40 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from app.main import app
+from app.scrapers.arxiv_scraper import ArxivScraper
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_exposes_stage_histograms():
+    client = TestClient(app)
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert "ingestion_stage_seconds" in response.text
+    assert "ingestion_http_requests_in_flight" in response.text
+
+
+@pytest.mark.asyncio
+@patch("app.scrapers.arxiv_scraper.asyncio.sleep", new_callable=AsyncMock)
+@patch("app.scrapers.arxiv_scraper.httpx.AsyncClient")
+async def test_scraper_records_fetch_and_rate_limit(mock_client_cls, mock_sleep):
+    mock_client = AsyncMock()
+    mock_response = MagicMock()
+    mock_response.status_code = 429
+    mock_client.__aenter__.return_value = mock_client
+    mock_client.get.return_value = mock_response
+    mock_client_cls.return_value = mock_client
+
+    fetches = sample("ingestion_stage_seconds_count", stage="fetch")
+    rate_limited = sample("ingestion_arxiv_rate_limited_total")
+
+    with pytest.raises(RuntimeError):
+        await ArxivScraper().fetch_articles("test", 1)
+
+    assert sample("ingestion_stage_seconds_count", stage="fetch") == fetches + 1
+    assert sample("ingestion_arxiv_rate_limited_total") == rate_limited + 1
@@ -10,10 +10,76 @@ async def test_save_json_calls_put_object(mock_boto):
     repo = S3Repository()
 
     data = {"key": "value"}
-    await repo.save_json("test.json", data)
+    assert await repo.save_json("test.json", data) is True
 
     mock_client.put_object.assert_called_once()
     call_args = mock_client.put_object.call_args[1]
     assert call_args["Bucket"] == "arxiv-bronze"
     assert call_args["Key"] == "test.json"
-    assert b'{\n  "key": "value"\n}' in call_args["Body"]
+    assert call_args["Body"] == b'{"key":"value"}'
+    assert call_args["ContentType"] == "application/json"
+
+    # Erro de upload: logado e sinalizado ao chamador (não conta como ingerido)
+    mock_client.put_object.side_effect = Exception("S3 down")
+    assert await repo.save_json("test.json", data) is False
+
+
+@pytest.mark.asyncio
+@patch("boto3.client")
+async def test_save_json_with_msgpack_sets_content_type(mock_boto):
+    from app.core.codecs import codec_for
+    from app.core.config import settings
+
+    mock_client = mock_boto.return_value
+    with patch.object(settings, "SERIALIZATION_FORMAT", "msgpack"):
+        repo = S3Repository()
+
+    data = {"article_data": {"id": "1", "title": "Física"}}
+    await repo.save_json("1.json", data)
+
+    call_args = mock_client.put_object.call_args[1]
+    assert call_args["ContentType"] == "application/vnd.msgpack"
+    assert codec_for(call_args["ContentType"]).decode(call_args["Body"]) == data
+
+
+@pytest.mark.asyncio
+@patch("boto3.client")
+async def test_update_stats_counts_every_page_and_skips_manifest(mock_boto):
+    from app.core.config import settings
+
+    mock_client = mock_boto.return_value
+    mock_client.get_paginator.return_value.paginate.return_value = [
+        {"Contents": [{"Key": f"{i}.json"} for i in range(1000)]},
+        {"Contents": [{"Key": "1000.json"}, {"Key": settings.STATS_KEY}]},
+        # Objetos do Processing (dead-letter, leases) e textos completos
+        {
+            "Contents": [
+                {"Key": f"{settings.DEAD_LETTER_PREFIX}7.json"},
+                {"Key": f"{settings.LEASE_PREFIX}8.json"},
+                {"Key": f"{settings.FULLTEXT_PREFIX}9.pdf"},
+            ]
+        },
+    ]
+    repo = S3Repository()
+
+    assert await repo.update_stats() == 1001
+    call_args = mock_client.put_object.call_args[1]
+    assert call_args["Key"] == settings.STATS_KEY
+    assert b'"count": 1001' in call_args["Body"]
+
+
+@pytest.mark.asyncio
+@patch("boto3.client")
+async def test_save_json_propagates_trace_context_in_metadata(mock_boto):
+    from opentelemetry.sdk.trace import TracerProvider
+
+    tracer = TracerProvider().get_tracer("test")
+    mock_client = mock_boto.return_value
+    repo = S3Repository()
+
+    with patch("app.repositories.s3_repository.tracer", tracer):
+        await repo.save_json("test.json", {"key": "value"})
+
+    metadata = mock_client.put_object.call_args[1]["Metadata"]
+    version, trace_id, span_id, flags = metadata["traceparent"].split("-")
+    assert version == "00" and len(trace_id) == 32 and len(span_id) == 16
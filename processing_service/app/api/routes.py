@@ -1,19 +1,38 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from typing import Annotated
-from app.infrastructure.s3_repository import S3Repository
-from app.infrastructure.regex_cleaner import RegexCleaner
-from app.infrastructure.bert_embedder import BERTEmbedder
 from app.services.processor_service import ProcessingService
+from app.infrastructure.memory_event_queue import InMemoryEventQueue
+from app.infrastructure.s3_events import parse_object_created_events
+from app.core.config import settings
 
 router = APIRouter()
 
 
 # Dependency Factory
-def get_processor_service():
-    repo = S3Repository()
-    cleaner = RegexCleaner()
-    embedder = BERTEmbedder()
-    return ProcessingService(repo, cleaner, embedder)
+def get_processor_service(request: Request) -> ProcessingService:
+    # Instâncias compartilhadas, criadas uma única vez no lifespan (app/main.py)
+    container = request.app.state.container
+    if not container.is_ready:
+        raise HTTPException(status_code=503, detail="Modelo ainda carregando.")
+    return container.service
+
+
+@router.get("/health", status_code=200)
+def health_check():
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def readiness_check(request: Request):
+    status = request.app.state.container.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+@router.get("/metrics")
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 @router.post("/process_batch")
@@ -24,9 +43,25 @@ async def process_batch(
     files = (
         await service.repo.list_unprocessed_files()
     )  # Acesso direto ao repo injetado
-    count = 0
-    for f in files[:limit]:
-        await service.process_one_file(f)
-        count += 1
+    # Falhas por arquivo não abortam o lote (retry com back-off / dead-letter)
+    result = await service.process_keys(files, limit=limit)
+
+    return {
+        "status": "ok",
+        "processed": result.processed,
+        "failed": result.failed,
+        "dead_lettered": result.dead_lettered,
+        "deferred": len(result.deferred),
+    }
+
+
+@router.post("/events/minio", status_code=202)
+async def minio_bucket_notification(request: Request, payload: dict):
+    # Alvo do webhook de notificação do MinIO (stand-in local do S3 -> SQS)
+    queue = request.app.state.container.events
+    if not isinstance(queue, InMemoryEventQueue):
+        raise HTTPException(status_code=404, detail="EVENT_SOURCE=memory desativado.")
 
-    return {"status": "ok", "processed": count}
+    events = parse_object_created_events(payload, settings.S3_BUCKET_BRONZE)
+    queue.publish(events)
+    return {"status": "accepted", "queued": len(events)}
@@ -11,10 +11,52 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION: str = "us-east-1"
     MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # Versão da limpeza textual gravada na Silver junto com MODEL_NAME.
+    # Incremente ao alterar o RegexCleaner para que o backfill reprocesse a Silver.
+    CLEANER_VERSION: str = "regex-v1"
+    # Formato dos objetos da Silver: "json" (orjson compacto) | "msgpack" (binário,
+    # embedding em float32). A leitura aceita ambos, pelo Content-Type.
+    SERIALIZATION_FORMAT: str = "json"
     
     # Feature Flag para rodar como Job (Batch) ao iniciar
     RUN_ON_STARTUP: bool = False
 
+    # Modo consumidor de eventos ObjectCreated do Bronze
+    # "none" (desligado) | "memory" (webhook do MinIO) | "sqs" (S3 -> SQS na AWS)
+    EVENT_SOURCE: str = "none"
+    SQS_QUEUE_URL: Optional[str] = None
+    SQS_ENDPOINT: Optional[str] = None
+    EVENT_BATCH_SIZE: int = 16
+    EVENT_BATCH_WAIT_SECONDS: float = 2.0
+
+    # Orçamento de tentativas por arquivo do Bronze (back-off exponencial)
+    # Esgotado o orçamento, o objeto é movido para DEAD_LETTER_PREFIX no Bronze
+    RETRY_MAX_ATTEMPTS: int = 5
+    RETRY_BASE_SECONDS: float = 2.0
+    RETRY_MAX_SECONDS: float = 300.0
+    DEAD_LETTER_PREFIX: str = "dead-letter/"
+
+    # Leases por chave do Bronze para vários workers em polling (ECS com N tasks)
+    # Objetos LEASE_PREFIX<chave> no Bronze criados com escrita condicional
+    LEASES_ENABLED: bool = False
+    LEASE_PREFIX: str = "_leases/"
+    LEASE_TTL_SECONDS: float = 300.0
+    LEASE_RENEW_SECONDS: float = 60.0
+    # Dono dos leases (padrão: hostname-pid)
+    WORKER_ID: Optional[str] = None
+
+    # PDFs e textos completos gravados pela Ingestão (PDF_ENABLED) no Bronze
+    FULLTEXT_PREFIX: str = "fulltext/"
+
+    # Tracing (OpenTelemetry): "none" (no-op) | "file" (JSON Lines) | "otlp"
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE: str = "traces-processing.jsonl"
+
+    # Manifesto de contagem por bucket (lido pelo Frontend no lugar de listar tudo)
+    STATS_KEY: str = "_stats/counts.json"
+    # Intervalo mínimo entre recontagens da Silver após lotes processados
+    STATS_REFRESH_SECONDS: float = 60.0
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
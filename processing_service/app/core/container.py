@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import EVENT_QUEUE_DEPTH
+from app.domain.ports import EventSourceProtocol
+from app.infrastructure.bert_embedder import BERTEmbedder
+from app.infrastructure.memory_event_queue import InMemoryEventQueue
+from app.infrastructure.regex_cleaner import RegexCleaner
+from app.infrastructure.s3_lease_store import S3LeaseStore
+from app.infrastructure.s3_repository import S3Repository
+from app.infrastructure.sqs_event_source import SQSEventSource
+from app.services.processor_service import ProcessingService
+
+
+def build_event_source() -> Optional[EventSourceProtocol]:
+    """Seleciona a fonte de eventos ObjectCreated conforme EVENT_SOURCE."""
+    if settings.EVENT_SOURCE == "memory":
+        return InMemoryEventQueue()
+    if settings.EVENT_SOURCE == "sqs":
+        return SQSEventSource()
+    return None
+
+
+class ServiceContainer:
+    """
+    Mantém as dependências pesadas do serviço com escopo de aplicação.
+
+    Repositório (boto3 + checagem de buckets), cleaner e embedder (tokenizer +
+    modelo) são criados uma única vez no `lifespan` e compartilhados por todas
+    as requisições, em vez de serem reconstruídos a cada `POST /process_batch`.
+    """
+
+    WARMUP_TEXT = "warm up inference"
+
+    def __init__(self):
+        self.service: Optional[ProcessingService] = None
+        # Criada antes do modelo: eventos recebidos durante o startup ficam na fila
+        self.events: Optional[EventSourceProtocol] = build_event_source()
+        if isinstance(self.events, InMemoryEventQueue):
+            # Lido apenas no scrape do /metrics, sem custo no caminho quente
+            EVENT_QUEUE_DEPTH.set_function(self.events.qsize)
+        self.model_loaded: bool = False
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._done = asyncio.Event()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.service is not None
+
+    async def start(self) -> None:
+        """Constrói as dependências e executa uma inferência de aquecimento."""
+        started = time.perf_counter()
+        try:
+            # Construtores bloqueiam (I/O de rede e disco), então rodam fora do loop
+            repo = await asyncio.to_thread(S3Repository)
+            cleaner = RegexCleaner()
+            embedder = await asyncio.to_thread(BERTEmbedder)
+
+            # Warm-up: a primeira inferência paga alocações e lazy-init do PyTorch
+            await asyncio.to_thread(embedder.generate_embedding, self.WARMUP_TEXT)
+            self.model_loaded = True
+
+            # Leases só com vários workers em polling (um único worker não disputa chaves)
+            leases = S3LeaseStore(repo.s3) if settings.LEASES_ENABLED else None
+            self.service = ProcessingService(repo, cleaner, embedder, leases=leases)
+            self.load_seconds = time.perf_counter() - started
+            logger.info(
+                f"Modelo {settings.MODEL_NAME} carregado e aquecido "
+                f"em {self.load_seconds:.2f}s."
+            )
+        except Exception as e:
+            # Não relança: a falha fica visível no /ready em vez de derrubar a task
+            self.error = str(e)
+            logger.error(f"Falha ao inicializar dependências: {e}")
+        finally:
+            self._done.set()
+
+    async def wait_ready(self) -> ProcessingService:
+        await self._done.wait()
+        if self.service is None:
+            raise RuntimeError(f"Dependências indisponíveis: {self.error}")
+        return self.service
+
+    def status(self) -> dict:
+        return {
+            "ready": self.is_ready,
+            "model_name": settings.MODEL_NAME,
+            "model_loaded": self.model_loaded,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
@@ -0,0 +1,62 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets cobrem desde leituras rápidas no MinIO até lotes de inferência em CPU
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+STAGE_SECONDS = Histogram(
+    "processing_stage_seconds",
+    "Duração de cada etapa do processamento Bronze -> Silver.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+# Filhos pré-resolvidos: evita o lookup de labels no caminho quente
+GET_SECONDS = STAGE_SECONDS.labels(stage="get")
+CLEAN_SECONDS = STAGE_SECONDS.labels(stage="clean")
+EMBED_SECONDS = STAGE_SECONDS.labels(stage="embed")
+PUT_SECONDS = STAGE_SECONDS.labels(stage="put")
+
+EMBED_BATCH_SIZE = Histogram(
+    "processing_embed_batch_size",
+    "Quantidade de textos por forward pass do modelo.",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+ARTICLES_PROCESSED = Counter(
+    "processing_articles_total", "Artigos persistidos na camada Silver."
+)
+ARTICLES_SKIPPED = Counter(
+    "processing_articles_skipped_total", "Artigos ignorados por já existirem na Silver."
+)
+
+PROCESSING_FAILURES = Counter(
+    "processing_failures_total", "Falhas ao processar arquivos do Bronze."
+)
+PROCESSING_RETRIES = Counter(
+    "processing_retries_total", "Novas tentativas de arquivos que já falharam."
+)
+DEAD_LETTERED = Counter(
+    "processing_dead_lettered_total", "Arquivos movidos para o dead-letter do Bronze."
+)
+
+LEASES_CLAIMED = Counter(
+    "processing_leases_claimed_total", "Leases de chaves do Bronze obtidos."
+)
+LEASES_RECLAIMED = Counter(
+    "processing_leases_reclaimed_total",
+    "Leases expirados (worker que caiu) retomados por outro worker.",
+)
+LEASE_CONFLICTS = Counter(
+    "processing_lease_conflicts_total",
+    "Chaves puladas por estarem com lease válido de outro worker.",
+)
+LEASES_LOST = Counter(
+    "processing_leases_lost_total",
+    "Leases perdidos na renovação ou na liberação (expiraram e foram retomados).",
+)
+
+EVENT_QUEUE_DEPTH = Gauge(
+    "processing_event_queue_depth", "Eventos ObjectCreated aguardando processamento."
+)
+IN_FLIGHT_REQUESTS = Gauge(
+    "processing_http_requests_in_flight", "Requisições HTTP em andamento na API."
+)
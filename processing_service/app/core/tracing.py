@@ -0,0 +1,84 @@
+import os
+import threading
+from functools import lru_cache
+from typing import Optional, Sequence
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from app.core.config import settings
+
+SERVICE_NAME = "processing-service"
+
+# Tracer proxy: no-op até configure_tracing instalar um provider
+tracer = trace.get_tracer(SERVICE_NAME)
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Um span por linha (JSON do SDK) em `path`, para análise offline (jq, pandas)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def build_exporter(name: str, path: str) -> Optional[SpanExporter]:
+    """TRACING_EXPORTER: "none" (padrão), "file" (TRACING_FILE) ou "otlp"."""
+    if name == "none":
+        return None
+    if name == "file":
+        # {pid} separa os arquivos quando há vários processos
+        return JsonLinesSpanExporter(path.format(pid=os.getpid()))
+    if name == "otlp":
+        # Dependência opcional (opentelemetry-exporter-otlp-proto-http);
+        # destino em OTEL_EXPORTER_OTLP_ENDPOINT
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter()
+    raise ValueError(f"TRACING_EXPORTER inválido: '{name}' (none | file | otlp).")
+
+
+@lru_cache(maxsize=1)
+def configure_tracing() -> Optional[TracerProvider]:
+    """Instala o provider global (uma vez por processo); com "none" os spans seguem no-op."""
+    exporter = build_exporter(settings.TRACING_EXPORTER, settings.TRACING_FILE)
+    if exporter is None:
+        return None
+    provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def inject_context(metadata: dict) -> dict:
+    """Grava o contexto do span atual (traceparent) no metadata de um objeto S3."""
+    propagate.inject(metadata)
+    return metadata
+
+
+def link_producer(metadata: dict) -> None:
+    """
+    Liga o span atual ao span que gravou o objeto (traceparent no metadata).
+
+    O processamento roda em outro trace (lote, evento), então a relação com a
+    ingestão que produziu o arquivo é um link, não um pai: um lote de N
+    arquivos aponta para os N saves do Bronze.
+    """
+    producer = trace.get_current_span(propagate.extract(metadata)).get_span_context()
+    if producer.is_valid:
+        trace.get_current_span().add_link(producer, {"link.kind": "bronze.producer"})
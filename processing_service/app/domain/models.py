@@ -11,6 +11,9 @@ class ArticleAttributes(BaseModel):
     embedding: Optional[List[float]] = None
     categories: List[str]
     published: datetime
+    # Versões que produziram cleaned_summary/embedding (None = registro legado)
+    model_name: Optional[str] = None
+    cleaner_version: Optional[str] = None
     # Outros campos herdados do raw...
 
     # Validator opcional para garantir dimensão correta do modelo (ex: MiniLM = 384)
@@ -18,3 +21,33 @@ class ArticleAttributes(BaseModel):
     # def check_embedding_dim(cls, v):
     #     if v and len(v) != 384: raise ValueError("Invalid embedding dimension")
     #     return v
+
+
+class ObjectCreatedEvent(BaseModel):
+    """Notificação de novo objeto no Bronze (MinIO webhook ou S3 -> SQS)."""
+
+    key: str
+    # Identificador para confirmar o consumo (ex: ReceiptHandle do SQS)
+    receipt: Optional[str] = None
+
+
+class Lease(BaseModel):
+    """Posse temporária de uma chave do Bronze por um worker (ver S3LeaseStore)."""
+
+    key: str
+    owner: str
+    # Epoch (relógio do worker); depois disso outro worker pode retomar a chave
+    expires_at: float
+    # ETag do objeto de lease: renovações só valem se ninguém o retomou
+    etag: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    """Resultado de um lote: falhas individuais não interrompem o restante."""
+
+    processed: int = 0
+    # Falharam mas ainda têm orçamento de tentativas
+    failed: List[str] = []
+    dead_lettered: List[str] = []
+    # Em back-off, não tentados neste lote
+    deferred: List[str] = []
@@ -1,5 +1,5 @@
-from typing import Protocol, List, Any
-from app.domain.models import ArticleAttributes
+from typing import Protocol, List, Any, Optional
+from app.domain.models import ArticleAttributes, Lease, ObjectCreatedEvent
 
 
 class RepositoryProtocol(Protocol):
@@ -7,6 +7,17 @@ class RepositoryProtocol(Protocol):
     async def save_processed_article(self, article: ArticleAttributes) -> None: ...
     async def list_unprocessed_files(self) -> List[str]: ...
     async def exists_in_silver(self, article_id: str) -> bool: ...
+    async def list_silver_page(
+        self, start_after: Optional[str], page_size: int
+    ) -> List[str]: ...
+    async def get_silver_metadata(self, key: str) -> dict: ...
+    async def get_processed_article(self, key: str) -> ArticleAttributes: ...
+    async def move_to_dead_letter(
+        self, file_key: str, error: str, attempts: int
+    ) -> None: ...
+
+    async def update_silver_stats(self) -> int: ...
+    async def update_bronze_stats(self) -> int: ...
 
 
 class CleanerProtocol(Protocol):
@@ -15,3 +26,20 @@ class CleanerProtocol(Protocol):
 
 class EmbedderProtocol(Protocol):
     def generate_embedding(self, text: str) -> List[float]: ...
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]: ...
+
+
+class LeaseStoreProtocol(Protocol):
+    async def claim(self, keys: List[str], limit: int) -> List[Lease]: ...
+    async def renew(self, leases: List[Lease]) -> List[Lease]: ...
+    async def release(self, leases: List[Lease]) -> None: ...
+
+
+class EventSourceProtocol(Protocol):
+    async def receive(
+        self, max_events: int, wait_seconds: float
+    ) -> List[ObjectCreatedEvent]: ...
+    async def ack(self, events: List[ObjectCreatedEvent]) -> None: ...
+    async def retry_later(
+        self, events: List[ObjectCreatedEvent], delay_seconds: float
+    ) -> None: ...
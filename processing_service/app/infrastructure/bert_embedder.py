@@ -11,10 +11,14 @@ class BERTEmbedder(EmbedderProtocol):
         self.model = AutoModel.from_pretrained(settings.MODEL_NAME)
 
     def generate_embedding(self, text: str) -> list[float]:
+        return self.generate_embeddings([text])[0]
+
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
         # WARN: Em multi-thread (asyncio.gather), o modelo compartilhado pode sofrer race conditions.
         # Se escalar, usar thread-local storage ou locks.
+        # Lote inteiro em um único forward pass (padding + máscara no pooling)
         inputs = self.tokenizer(
-            text, return_tensors="pt", padding=True, truncation=True, max_length=512
+            texts, return_tensors="pt", padding=True, truncation=True, max_length=512
         )
         with torch.no_grad():
             outputs = self.model(**inputs)
@@ -29,4 +33,4 @@ class BERTEmbedder(EmbedderProtocol):
 
         mean_pooled = sum_embeddings / sum_mask
         # Normalização (opcional, bom para similaridade de cosseno)
-        return mean_pooled[0].tolist()
+        return mean_pooled.tolist()
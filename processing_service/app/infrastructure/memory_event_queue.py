@@ -0,0 +1,54 @@
+import asyncio
+from typing import List
+from app.domain.ports import EventSourceProtocol
+from app.domain.models import ObjectCreatedEvent
+
+
+class InMemoryEventQueue(EventSourceProtocol):
+    """
+    Stand-in local para a fila de eventos (alimentado pelo webhook do MinIO).
+
+    Não há persistência: eventos pendentes se perdem ao reiniciar o processo.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def publish(self, events: List[ObjectCreatedEvent]) -> None:
+        for event in events:
+            self._queue.put_nowait(event)
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def receive(
+        self, max_events: int, wait_seconds: float
+    ) -> List[ObjectCreatedEvent]:
+        # Bloqueia até o primeiro evento e então agrega o lote por até wait_seconds
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=wait_seconds)
+        except asyncio.TimeoutError:
+            return []
+
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait_seconds
+        while len(batch) < max_events:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def ack(self, events: List[ObjectCreatedEvent]) -> None:
+        # Eventos saem da fila no receive; nada a confirmar
+        return None
+
+    async def retry_later(
+        self, events: List[ObjectCreatedEvent], delay_seconds: float
+    ) -> None:
+        # Reenfileira após o back-off sem bloquear o consumidor
+        asyncio.get_running_loop().call_later(delay_seconds, self.publish, events)
@@ -0,0 +1,39 @@
+from typing import List, Optional
+from urllib.parse import unquote_plus
+from app.domain.models import ObjectCreatedEvent
+from app.core.config import settings
+
+
+def parse_object_created_events(
+    payload: dict, bucket: str, receipt: Optional[str] = None
+) -> List[ObjectCreatedEvent]:
+    """
+    Extrai as chaves criadas de uma notificação no formato S3 Event.
+
+    MinIO (webhook) e S3 (via SQS) usam o mesmo envelope `Records[]`; o
+    eventName vem como `s3:ObjectCreated:Put` no MinIO e `ObjectCreated:Put`
+    no S3. Eventos de outros buckets ou tipos (ex: s3:TestEvent) são ignorados,
+    assim como objetos que não são artigos (dead-letter, leases, textos completos
+    e manifesto de contagem).
+    """
+    events = []
+    for record in payload.get("Records", []):
+        if "ObjectCreated" not in record.get("eventName", ""):
+            continue
+        s3_info = record.get("s3", {})
+        if s3_info.get("bucket", {}).get("name") != bucket:
+            continue
+        # As chaves chegam URL-encoded (espaços viram '+')
+        key = unquote_plus(s3_info.get("object", {}).get("key", ""))
+        if key and not (
+            key.startswith(
+                (
+                    settings.DEAD_LETTER_PREFIX,
+                    settings.LEASE_PREFIX,
+                    settings.FULLTEXT_PREFIX,
+                )
+            )
+            or key == settings.STATS_KEY
+        ):
+            events.append(ObjectCreatedEvent(key=key, receipt=receipt))
+    return events
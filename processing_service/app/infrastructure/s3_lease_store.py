@@ -0,0 +1,167 @@
+import asyncio
+import os
+import random
+import socket
+import time
+from typing import Callable, List, Optional
+from botocore.exceptions import ClientError
+from app.domain.models import Lease
+from app.domain.ports import LeaseStoreProtocol
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import (
+    LEASE_CONFLICTS,
+    LEASES_CLAIMED,
+    LEASES_LOST,
+    LEASES_RECLAIMED,
+)
+
+# Escrita condicional rejeitada: outro worker criou, retomou ou removeu o lease
+_CONFLICT_CODES = {"PreconditionFailed", "ConditionalRequestConflict", "NoSuchKey"}
+
+
+def _is_conflict(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in _CONFLICT_CODES
+
+
+class S3LeaseStore(LeaseStoreProtocol):
+    """
+    Leases de chaves do Bronze como objetos `LEASE_PREFIX<chave>`, com escrita condicional.
+
+    * claim: PUT com `If-None-Match: *`, então só um worker cria o lease. Se ele já
+      existe e expirou (worker que caiu) ou é do próprio worker, o PUT usa
+      `If-Match` no ETag lido, e só um dos concorrentes consegue retomá-lo;
+    * renew: PUT com `If-Match` no ETag do próprio lease. Se falhar, o lease
+      expirou e foi retomado: o trabalho pode duplicar, mas a Silver é idempotente;
+    * release: DELETE com `If-Match` no ETag do próprio lease ao concluir a
+      chave. Se o lease expirou e foi retomado, o DELETE falha e o lease do
+      outro worker continua valendo.
+
+    Escritas condicionais são suportadas pelo S3 e pelo MinIO. A expiração usa
+    o relógio dos workers (sincronizados por NTP); o TTL deve ser bem maior
+    que a defasagem entre eles.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: Optional[str] = None,
+        prefix: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        owner: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.s3 = s3_client
+        self.bucket = bucket or settings.S3_BUCKET_BRONZE
+        self.prefix = prefix or settings.LEASE_PREFIX
+        self.ttl_seconds = ttl_seconds or settings.LEASE_TTL_SECONDS
+        self.owner = (
+            owner or settings.WORKER_ID or f"{socket.gethostname()}-{os.getpid()}"
+        )
+        self.clock = clock
+
+    def lease_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def claim(self, keys: List[str], limit: int) -> List[Lease]:
+        """Tenta obter leases até `limit` chaves; as que estão com outros ficam de fora."""
+        # Ordem embaralhada: workers concorrentes disputam chaves diferentes primeiro
+        candidates = random.sample(keys, len(keys))
+        claimed: List[Lease] = []
+        while candidates and len(claimed) < limit:
+            chunk = candidates[: limit - len(claimed)]
+            candidates = candidates[len(chunk) :]
+            leases = await asyncio.gather(
+                *(asyncio.to_thread(self._claim_one, key) for key in chunk)
+            )
+            claimed += [lease for lease in leases if lease is not None]
+        LEASES_CLAIMED.inc(len(claimed))
+        return claimed
+
+    async def renew(self, leases: List[Lease]) -> List[Lease]:
+        """Estende os leases por mais um TTL; devolve só os que continuam deste worker."""
+        renewed = await asyncio.gather(
+            *(asyncio.to_thread(self._renew_one, lease) for lease in leases)
+        )
+        return [lease for lease in renewed if lease is not None]
+
+    async def release(self, leases: List[Lease]) -> None:
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._release_one, lease) for lease in leases),
+            return_exceptions=True,
+        )
+        for lease, result in zip(leases, results):
+            if isinstance(result, Exception):
+                # Não é fatal: o lease expira sozinho após o TTL
+                logger.warning(f"Falha ao liberar o lease de {lease.key}: {result}")
+
+    def _new_lease(self, key: str) -> Lease:
+        return Lease(
+            key=key, owner=self.owner, expires_at=self.clock() + self.ttl_seconds
+        )
+
+    def _put(self, lease: Lease, **condition) -> Lease:
+        response = self.s3.put_object(
+            Bucket=self.bucket,
+            Key=self.lease_key(lease.key),
+            Body=lease.model_dump_json(exclude={"etag"}),
+            ContentType="application/json",
+            **condition,
+        )
+        return lease.model_copy(update={"etag": response["ETag"]})
+
+    def _claim_one(self, key: str) -> Optional[Lease]:
+        try:
+            return self._put(self._new_lease(key), IfNoneMatch="*")
+        except ClientError as e:
+            if not _is_conflict(e):
+                raise
+
+        # Já existe um lease: só pode ser retomado se expirou ou é deste worker
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=self.lease_key(key))
+        except ClientError as e:
+            if _is_conflict(e):
+                return None  # liberado entre as chamadas: a próxima listagem decide
+            raise
+        current = Lease.model_validate_json(response["Body"].read())
+        expired = current.expires_at <= self.clock()
+        if not expired and current.owner != self.owner:
+            LEASE_CONFLICTS.inc()
+            return None
+
+        try:
+            lease = self._put(self._new_lease(key), IfMatch=response["ETag"])
+        except ClientError as e:
+            if not _is_conflict(e):
+                raise
+            LEASE_CONFLICTS.inc()
+            return None
+        if current.owner != self.owner:
+            LEASES_RECLAIMED.inc()
+            logger.warning(
+                f"Lease expirado de {key} (worker {current.owner}) retomado por {self.owner}."
+            )
+        return lease
+
+    def _release_one(self, lease: Lease) -> None:
+        try:
+            self.s3.delete_object(
+                Bucket=self.bucket, Key=self.lease_key(lease.key), IfMatch=lease.etag
+            )
+        except ClientError as e:
+            if not _is_conflict(e):
+                raise
+            # Já perdido: apagar sem condição removeria o lease vivo de outro worker
+            LEASES_LOST.inc()
+            logger.warning(f"Lease de {lease.key} já era de outro worker ao liberar.")
+
+    def _renew_one(self, lease: Lease) -> Optional[Lease]:
+        try:
+            return self._put(self._new_lease(lease.key), IfMatch=lease.etag)
+        except ClientError as e:
+            if not _is_conflict(e):
+                raise
+        LEASES_LOST.inc()
+        logger.warning(f"Lease de {lease.key} perdido: expirou e foi retomado.")
+        return None
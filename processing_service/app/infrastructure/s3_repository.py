@@ -1,9 +1,13 @@
+import asyncio
 import json
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional
 import boto3
 from app.domain.ports import RepositoryProtocol
 from app.domain.models import ArticleAttributes
+from app.core.codecs import codec_for, get_codec
 from app.core.config import settings
+from app.core.tracing import inject_context, link_producer, tracer
 
 
 class S3Repository(RepositoryProtocol):
@@ -15,6 +19,8 @@ class S3Repository(RepositoryProtocol):
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             region_name=settings.AWS_REGION,
         )
+        # Formato de escrita da Silver; a leitura segue o Content-Type de cada objeto
+        self.codec = get_codec(settings.SERIALIZATION_FORMAT)
         self._ensure_buckets_exist()
 
     def _ensure_buckets_exist(self):
@@ -29,17 +35,44 @@ class S3Repository(RepositoryProtocol):
                 except Exception as e:
                     print(f"Failed to create bucket {bucket}: {e}")
 
-    async def list_unprocessed_files(self) -> List[str]:
-        # 1. Listar tudo no Bronze (Paginação s3.list_objects_v2 omitida para brevidade)
-        bronze_objs = self.s3.list_objects_v2(Bucket=settings.S3_BUCKET_BRONZE).get(
-            "Contents", []
+    def _span(self, operation: str, bucket: str, key: Optional[str] = None):
+        attributes = {"aws.s3.bucket": bucket}
+        if key:
+            attributes["aws.s3.key"] = key
+        return tracer.start_as_current_span(f"s3.{operation}", attributes=attributes)
+
+    @staticmethod
+    def _is_article(key: str) -> bool:
+        # Dead-letter, leases, textos completos e o manifesto não são artigos
+        return key != settings.STATS_KEY and not key.startswith(
+            (
+                settings.DEAD_LETTER_PREFIX,
+                settings.LEASE_PREFIX,
+                settings.FULLTEXT_PREFIX,
+            )
         )
-        bronze_keys = {obj["Key"] for obj in bronze_objs}
+
+    def _list_all(self, bucket: str) -> List[dict]:
+        # list_objects_v2 devolve no máximo 1.000 chaves por chamada
+        paginator = self.s3.get_paginator("list_objects_v2")
+        with self._span("list_objects", bucket) as span:
+            objects = [
+                obj
+                for page in paginator.paginate(Bucket=bucket)
+                for obj in page.get("Contents", [])
+            ]
+            span.set_attribute("s3.objects", len(objects))
+        return objects
+
+    async def list_unprocessed_files(self) -> List[str]:
+        # 1. Listar tudo no Bronze (paginado)
+        bronze_objs = await asyncio.to_thread(self._list_all, settings.S3_BUCKET_BRONZE)
+        bronze_keys = {
+            obj["Key"] for obj in bronze_objs if self._is_article(obj["Key"])
+        }
 
         # 2. Listar tudo no Silver
-        silver_objs = self.s3.list_objects_v2(Bucket=settings.S3_BUCKET_SILVER).get(
-            "Contents", []
-        )
+        silver_objs = await asyncio.to_thread(self._list_all, settings.S3_BUCKET_SILVER)
         silver_ids = {obj["Key"].replace(".json", "") for obj in silver_objs}
 
         # 3. Set Difference (O(1) lookup)
@@ -53,28 +86,139 @@ class S3Repository(RepositoryProtocol):
         return unprocessed
 
     async def get_raw_article(self, file_key: str) -> dict:
-        response = self.s3.get_object(Bucket=settings.S3_BUCKET_BRONZE, Key=file_key)
-        return json.loads(response["Body"].read())
+        with self._span("get_object", settings.S3_BUCKET_BRONZE, file_key):
+            response = self.s3.get_object(
+                Bucket=settings.S3_BUCKET_BRONZE, Key=file_key
+            )
+            body = response["Body"].read()
+        # Fora do span do GET: o link fica no span do processamento do arquivo
+        link_producer(response.get("Metadata", {}))
+        return codec_for(response.get("ContentType")).decode(body)
 
     async def save_processed_article(self, article: ArticleAttributes) -> None:
         key = f"{article.id}.json"
-        self.s3.put_object(
-            Bucket=settings.S3_BUCKET_SILVER,
-            Key=key,
-            Body=article.model_dump_json(indent=2),
-            ContentType="application/json",
+        # Versões também no metadata do objeto: o backfill detecta registros
+        # desatualizados com HEAD, sem baixar o vetor inteiro
+        metadata = {}
+        if article.model_name:
+            metadata["model-name"] = article.model_name
+        if article.cleaner_version:
+            metadata["cleaner-version"] = article.cleaner_version
+        with self._span("put_object", settings.S3_BUCKET_SILVER, key):
+            self.s3.put_object(
+                Bucket=settings.S3_BUCKET_SILVER,
+                Key=key,
+                Body=self.codec.encode(article.model_dump(mode="json")),
+                ContentType=self.codec.content_type,
+                Metadata=inject_context(metadata),
+            )
+
+    async def list_silver_page(
+        self, start_after: Optional[str], page_size: int = 1000
+    ) -> List[str]:
+        # Página ordenada por chave; StartAfter permite retomar de um checkpoint
+        params = {"Bucket": settings.S3_BUCKET_SILVER, "MaxKeys": page_size}
+        if start_after:
+            params["StartAfter"] = start_after
+        response = await asyncio.to_thread(self.s3.list_objects_v2, **params)
+        return [
+            obj["Key"]
+            for obj in response.get("Contents", [])
+            if obj["Key"] != settings.STATS_KEY
+        ]
+
+    async def get_silver_metadata(self, key: str) -> dict:
+        response = await asyncio.to_thread(
+            self.s3.head_object, Bucket=settings.S3_BUCKET_SILVER, Key=key
         )
+        return response.get("Metadata", {})
+
+    async def get_processed_article(self, key: str) -> ArticleAttributes:
+        with self._span("get_object", settings.S3_BUCKET_SILVER, key):
+            response = await asyncio.to_thread(
+                self.s3.get_object, Bucket=settings.S3_BUCKET_SILVER, Key=key
+            )
+            body = response["Body"].read()
+        record = codec_for(response.get("ContentType")).decode(body)
+        return ArticleAttributes.model_validate(record)
 
     async def exists_in_silver(self, article_id: str) -> bool:
         # Esta implementação é O(1) se o bucket for pequeno, mas O(N) para listar tudo.
         # A list_unprocessed_files já faz uma checagem mais eficiente para o batch.
         # Para checagem individual, pode-se tentar get_object e capturar ClientError.
+        key = f"{article_id}.json"
         try:
-            self.s3.head_object(
-                Bucket=settings.S3_BUCKET_SILVER, Key=f"{article_id}.json"
-            )
+            with self._span("head_object", settings.S3_BUCKET_SILVER, key):
+                self.s3.head_object(Bucket=settings.S3_BUCKET_SILVER, Key=key)
             return True
         except self.s3.exceptions.ClientError as e:
             if e.response["Error"]["Code"] == "404":
                 return False
             raise  # Re-raise other errors
+
+    async def update_silver_stats(self) -> int:
+        """
+        Recontagem paginada da Silver gravada em STATS_KEY.
+
+        O Frontend lê esse manifesto em vez de listar o bucket a cada interação.
+        """
+        return await self._update_stats(settings.S3_BUCKET_SILVER)
+
+    async def update_bronze_stats(self) -> int:
+        """
+        Recontagem dos artigos do Bronze gravada em STATS_KEY (mesmas exclusões
+        da Ingestão): o dead-letter tira artigos do Bronze entre as ingestões.
+        """
+        return await self._update_stats(settings.S3_BUCKET_BRONZE)
+
+    async def _update_stats(self, bucket: str) -> int:
+        def count() -> int:
+            paginator = self.s3.get_paginator("list_objects_v2")
+            return sum(
+                1
+                for page in paginator.paginate(Bucket=bucket)
+                for obj in page.get("Contents", [])
+                if self._is_article(obj["Key"])
+            )
+
+        with self._span("update_stats", bucket) as span:
+            total = await asyncio.to_thread(count)
+            span.set_attribute("s3.objects", total)
+        manifest = {
+            "count": total,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "writer": "processing",
+        }
+        await asyncio.to_thread(
+            self.s3.put_object,
+            Bucket=bucket,
+            Key=settings.STATS_KEY,
+            Body=json.dumps(manifest),
+            ContentType="application/json",
+        )
+        return total
+
+    async def move_to_dead_letter(
+        self, file_key: str, error: str, attempts: int
+    ) -> None:
+        # Copia o objeto original intacto para o prefixo de dead-letter com o erro
+        # no metadata (S3 exige ASCII e limita o metadata a 2 KB) e remove do Bronze
+        dead_letter_key = f"{settings.DEAD_LETTER_PREFIX}{file_key}"
+        safe_error = " ".join(error.encode("ascii", "replace").decode("ascii").split())
+        with self._span("move_to_dead_letter", settings.S3_BUCKET_BRONZE, file_key):
+            # REPLACE também descarta o Content-Type, que define o codec do objeto
+            head = await asyncio.to_thread(
+                self.s3.head_object, Bucket=settings.S3_BUCKET_BRONZE, Key=file_key
+            )
+            await asyncio.to_thread(
+                self.s3.copy_object,
+                Bucket=settings.S3_BUCKET_BRONZE,
+                Key=dead_letter_key,
+                CopySource={"Bucket": settings.S3_BUCKET_BRONZE, "Key": file_key},
+                Metadata={"error": safe_error[:1024], "attempts": str(attempts)},
+                MetadataDirective="REPLACE",
+                ContentType=head.get("ContentType", "application/json"),
+            )
+            await asyncio.to_thread(
+                self.s3.delete_object, Bucket=settings.S3_BUCKET_BRONZE, Key=file_key
+            )
@@ -0,0 +1,80 @@
+import asyncio
+import json
+from typing import List
+import boto3
+from app.domain.ports import EventSourceProtocol
+from app.domain.models import ObjectCreatedEvent
+from app.infrastructure.s3_events import parse_object_created_events
+from app.core.config import settings
+from app.core.logger import logger
+
+# Limite do SQS por chamada de ReceiveMessage
+SQS_MAX_MESSAGES = 10
+# VisibilityTimeout máximo aceito pelo SQS (12h)
+SQS_MAX_VISIBILITY_SECONDS = 43200
+
+
+class SQSEventSource(EventSourceProtocol):
+    """Consome notificações S3 ObjectCreated do Bronze entregues numa fila SQS."""
+
+    def __init__(self):
+        self.sqs = boto3.client(
+            "sqs",
+            endpoint_url=settings.SQS_ENDPOINT,
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION,
+        )
+        self.queue_url = settings.SQS_QUEUE_URL
+
+    async def receive(
+        self, max_events: int, wait_seconds: float
+    ) -> List[ObjectCreatedEvent]:
+        # Long polling: a chamada bloqueia até chegar mensagem ou expirar o wait
+        response = await asyncio.to_thread(
+            self.sqs.receive_message,
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=min(max_events, SQS_MAX_MESSAGES),
+            WaitTimeSeconds=int(wait_seconds),
+        )
+
+        events = []
+        for message in response.get("Messages", []):
+            receipt = message["ReceiptHandle"]
+            try:
+                parsed = parse_object_created_events(
+                    json.loads(message["Body"]), settings.S3_BUCKET_BRONZE, receipt
+                )
+            except (ValueError, TypeError) as e:
+                logger.error(f"Mensagem SQS inválida descartada: {e}")
+                parsed = []
+
+            if parsed:
+                events.extend(parsed)
+            else:
+                # s3:TestEvent ou mensagem irrelevante: remove da fila
+                await self._delete(receipt)
+        return events
+
+    async def ack(self, events: List[ObjectCreatedEvent]) -> None:
+        # Uma mensagem pode carregar vários Records; confirma cada uma só uma vez
+        for receipt in {e.receipt for e in events if e.receipt}:
+            await self._delete(receipt)
+
+    async def retry_later(
+        self, events: List[ObjectCreatedEvent], delay_seconds: float
+    ) -> None:
+        # Back-off nativo do SQS: a mensagem volta a ficar visível após o delay
+        timeout = min(int(delay_seconds), SQS_MAX_VISIBILITY_SECONDS)
+        for receipt in {e.receipt for e in events if e.receipt}:
+            await asyncio.to_thread(
+                self.sqs.change_message_visibility,
+                QueueUrl=self.queue_url,
+                ReceiptHandle=receipt,
+                VisibilityTimeout=timeout,
+            )
+
+    async def _delete(self, receipt: str) -> None:
+        await asyncio.to_thread(
+            self.sqs.delete_message, QueueUrl=self.queue_url, ReceiptHandle=receipt
+        )
@@ -1,19 +1,30 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.api.routes import router, get_processor_service
+from app.core.container import ServiceContainer
+from app.core.metrics import IN_FLIGHT_REQUESTS
+from app.core.tracing import configure_tracing
+from app.api.routes import router
+from app.services.event_consumer import EventConsumer
 import asyncio
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # Dependências criadas uma única vez; o carregamento do modelo roda em
+    # background para o /health responder enquanto o /ready reporta o progresso.
+    configure_tracing()
+    container = ServiceContainer()
+    app.state.container = container
+    startup_task = asyncio.create_task(container.start())
+
     if settings.RUN_ON_STARTUP:
         print("🚀 RUN_ON_STARTUP=True. Iniciando Job de Processamento...")
-        service = get_processor_service()
-        
+
         async def run_batch_loop():
+             service = await container.wait_ready()
              # Processa em loops até acabar (ou um limite alto)
              total_processed = 0
              while True:
@@ -21,19 +32,37 @@ async def lifespan(app: FastAPI):
                  if not files:
                      print("✅ Nenhum arquivo novo para processar.")
                      break
-                 
-                 # Processa lote de 10
-                 for f in files[:10]:
-                     await service.process_one_file(f)
-                     total_processed += 1
-                 
+
+                 # Processa lote de 10 (chaves em back-off não ocupam o lote)
+                 result = await service.process_keys(files, limit=10)
+                 total_processed += result.processed
+
                  print(f"🔄 Lote processado. Total até agora: {total_processed}")
                  await asyncio.sleep(1) # Breve pausa
-        
+
         asyncio.create_task(run_batch_loop())
 
+    consumer_task = None
+    if container.events is not None:
+        print(f"📬 EVENT_SOURCE={settings.EVENT_SOURCE}. Consumindo eventos do Bronze...")
+
+        async def run_consumer():
+            service = await container.wait_ready()
+            consumer = EventConsumer(
+                service,
+                container.events,
+                batch_size=settings.EVENT_BATCH_SIZE,
+                batch_wait_seconds=settings.EVENT_BATCH_WAIT_SECONDS,
+            )
+            await consumer.run_forever()
+
+        consumer_task = asyncio.create_task(run_consumer())
+
     yield
     # Shutdown
+    for task in (startup_task, consumer_task):
+        if task is not None and not task.done():
+            task.cancel()
 
 
 app = FastAPI(
@@ -49,4 +78,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def track_in_flight_requests(request: Request, call_next):
+    with IN_FLIGHT_REQUESTS.track_inprogress():
+        return await call_next(request)
+
+
 app.include_router(router)
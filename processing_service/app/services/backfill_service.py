@@ -0,0 +1,175 @@
+from app.domain.ports import RepositoryProtocol, CleanerProtocol, EmbedderProtocol
+from app.domain.models import ArticleAttributes
+from app.core.config import settings
+from app.core.logger import logger
+from typing import List, Optional
+from pathlib import Path
+import asyncio
+import json
+
+
+class BackfillService:
+    """
+    Re-embedding incremental da Silver após troca de MODEL_NAME/CLEANER_VERSION.
+
+    Percorre a Silver em páginas ordenadas por chave, identifica registros
+    desatualizados via HEAD (metadata `model-name`/`cleaner-version`) e
+    reprocessa apenas esses, com I/O concorrente e embeddings em lote.
+    O checkpoint guarda a última chave concluída para retomar a execução.
+    Registros legados (sem metadata de versão) são tratados como desatualizados.
+    """
+
+    def __init__(
+        self,
+        repo: RepositoryProtocol,
+        cleaner: CleanerProtocol,
+        embedder: EmbedderProtocol,
+        checkpoint_path: Optional[str] = None,
+        concurrency: int = 32,
+        batch_size: int = 32,
+        page_size: int = 1000,
+    ):
+        self.repo = repo
+        self.cleaner = cleaner
+        self.embedder = embedder
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @property
+    def target(self) -> dict:
+        return {
+            "model_name": settings.MODEL_NAME,
+            "cleaner_version": settings.CLEANER_VERSION,
+        }
+
+    def is_stale(self, metadata: dict) -> bool:
+        return (
+            metadata.get("model-name") != settings.MODEL_NAME
+            or metadata.get("cleaner-version") != settings.CLEANER_VERSION
+        )
+
+    async def run(self) -> dict:
+        checkpoint = self._load_checkpoint()
+        start_after = checkpoint.get("start_after")
+        stats = {
+            "scanned": checkpoint.get("scanned", 0),
+            "reembedded": checkpoint.get("reembedded", 0),
+        }
+        if start_after:
+            logger.info(f"Retomando backfill após a chave '{start_after}'.")
+
+        while True:
+            keys = await self.repo.list_silver_page(start_after, self.page_size)
+            if not keys:
+                break
+
+            stale = await self._find_stale(keys)
+            for i in range(0, len(stale), self.batch_size):
+                await self._reembed(stale[i : i + self.batch_size])
+
+            stats["scanned"] += len(keys)
+            stats["reembedded"] += len(stale)
+            start_after = keys[-1]
+            self._save_checkpoint({**stats, "start_after": start_after})
+            logger.info(
+                f"Backfill: {stats['scanned']} verificados, "
+                f"{stats['reembedded']} re-embedados."
+            )
+
+        # Concluído: próxima execução recomeça do início
+        self._clear_checkpoint()
+        return stats
+
+    async def _find_stale(self, keys: List[str]) -> List[str]:
+        async def check(key: str) -> bool:
+            async with self._semaphore:
+                return self.is_stale(await self.repo.get_silver_metadata(key))
+
+        flags = await asyncio.gather(*(check(k) for k in keys))
+        return [k for k, stale in zip(keys, flags) if stale]
+
+    async def _reembed(self, keys: List[str]) -> None:
+        async def load(key: str) -> ArticleAttributes:
+            async with self._semaphore:
+                return await self.repo.get_processed_article(key)
+
+        articles = await asyncio.gather(*(load(k) for k in keys))
+
+        # Reaplica a limpeza a partir do summary original (CLEANER_VERSION pode ter mudado)
+        cleaned = await asyncio.to_thread(
+            lambda: [self.cleaner.clean_text(a.summary) for a in articles]
+        )
+        embeddings = await asyncio.to_thread(self.embedder.generate_embeddings, cleaned)
+
+        async def save(article: ArticleAttributes, text: str, embedding: List[float]):
+            updated = article.model_copy(
+                update={"cleaned_summary": text, "embedding": embedding, **self.target}
+            )
+            async with self._semaphore:
+                await self.repo.save_processed_article(updated)
+
+        await asyncio.gather(
+            *(save(a, t, e) for a, t, e in zip(articles, cleaned, embeddings))
+        )
+
+    def _load_checkpoint(self) -> dict:
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return {}
+        checkpoint = json.loads(self.checkpoint_path.read_text())
+        # Checkpoint de outra versão alvo não vale para esta execução
+        if checkpoint.get("target") != self.target:
+            logger.info("Checkpoint de outra versão alvo ignorado.")
+            return {}
+        return checkpoint
+
+    def _save_checkpoint(self, state: dict) -> None:
+        if not self.checkpoint_path:
+            return
+        # Escrita atômica: arquivo temporário + rename
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({**state, "target": self.target}))
+        tmp.replace(self.checkpoint_path)
+
+    def _clear_checkpoint(self) -> None:
+        if self.checkpoint_path and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+
+
+# Permite rodar como comando standalone:
+# python -m app.services.backfill_service --concurrency 64 --checkpoint backfill.json
+if __name__ == "__main__":
+    import argparse
+    from app.infrastructure.s3_repository import S3Repository
+    from app.infrastructure.regex_cleaner import RegexCleaner
+    from app.infrastructure.bert_embedder import BERTEmbedder
+
+    async def main():
+        parser = argparse.ArgumentParser()
+        parser.add_argument(
+            "--concurrency", type=int, default=32, help="Max concurrent S3 calls"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=32, help="Texts per forward pass"
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default="backfill_checkpoint.json",
+            help="Progress file used to resume an interrupted run",
+        )
+        args = parser.parse_args()
+
+        service = BackfillService(
+            S3Repository(),
+            RegexCleaner(),
+            BERTEmbedder(),
+            checkpoint_path=args.checkpoint,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+        )
+        print(f"Starting backfill to {service.target}...")
+        stats = await service.run()
+        print(f"Done. {stats}")
+
+    asyncio.run(main())
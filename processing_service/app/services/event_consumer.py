@@ -0,0 +1,73 @@
+from app.domain.ports import EventSourceProtocol
+from app.services.processor_service import ProcessingService
+from app.core.logger import logger
+import asyncio
+
+
+class EventConsumer:
+    """
+    Processa artigos novos a partir de notificações ObjectCreated do Bronze.
+
+    Substitui o polling (listar Bronze + Silver a cada lote) por uma fila de
+    eventos: cada lote recebido vira um único lote de embeddings.
+    """
+
+    def __init__(
+        self,
+        service: ProcessingService,
+        source: EventSourceProtocol,
+        batch_size: int = 16,
+        batch_wait_seconds: float = 2.0,
+    ):
+        self.service = service
+        self.source = source
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self._stopped = False
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    async def run_once(self) -> int:
+        events = await self.source.receive(self.batch_size, self.batch_wait_seconds)
+        if not events:
+            return 0
+
+        # Dedup preservando a ordem (o mesmo objeto pode ser sobrescrito no lote)
+        keys = list(dict.fromkeys(e.key for e in events))
+        result = await self.service.process_files(keys)
+
+        # Falhas com orçamento restante voltam para a fila após o back-off.
+        # Uma mensagem SQS pode agrupar vários objetos: se qualquer um falhou,
+        # a mensagem inteira é reentregue (os já salvos são pulados na Silver).
+        failed_keys = set(result.failed)
+        retry_receipts = {
+            e.receipt for e in events if e.key in failed_keys and e.receipt
+        }
+        retry = [
+            e for e in events if e.key in failed_keys or e.receipt in retry_receipts
+        ]
+        done = [e for e in events if e not in retry]
+
+        # Só confirma após persistir no Silver ou mover para o dead-letter
+        await self.source.ack(done)
+        if retry:
+            delay = max(self.service.retries.delay_for(k) for k in failed_keys)
+            await self.source.retry_later(retry, delay)
+
+        logger.info(
+            f"Lote de eventos processado: {result.processed}/{len(keys)} artigos "
+            f"({len(result.failed)} em retry, {len(result.dead_lettered)} no dead-letter)."
+        )
+        return result.processed
+
+    async def run_forever(self) -> None:
+        logger.info("Consumidor de eventos do Bronze iniciado.")
+        while not self._stopped:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Falha ao processar lote de eventos: {e}")
+                await asyncio.sleep(self.batch_wait_seconds)
@@ -1,7 +1,31 @@
-from app.domain.ports import RepositoryProtocol, CleanerProtocol, EmbedderProtocol
-from app.domain.models import ArticleAttributes
+from app.domain.ports import (
+    RepositoryProtocol,
+    CleanerProtocol,
+    EmbedderProtocol,
+    LeaseStoreProtocol,
+)
+from app.domain.models import ArticleAttributes, BatchResult, Lease
+from app.core.config import settings
 from app.core.logger import logger
+from app.core.tracing import tracer
+from app.core.metrics import (
+    ARTICLES_PROCESSED,
+    ARTICLES_SKIPPED,
+    CLEAN_SECONDS,
+    DEAD_LETTERED,
+    EMBED_BATCH_SIZE,
+    EMBED_SECONDS,
+    GET_SECONDS,
+    PROCESSING_FAILURES,
+    PROCESSING_RETRIES,
+    PUT_SECONDS,
+)
+from app.services.retry_tracker import RetryTracker
 import asyncio
+import time
+from opentelemetry import trace
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 
 class ProcessingService:
@@ -10,41 +34,288 @@ class ProcessingService:
         repo: RepositoryProtocol,
         cleaner: CleanerProtocol,
         embedder: EmbedderProtocol,
+        retries: Optional[RetryTracker] = None,
+        leases: Optional[LeaseStoreProtocol] = None,
     ):
         self.repo = repo
         self.cleaner = cleaner
         self.embedder = embedder
+        self.retries = retries or RetryTracker(
+            max_attempts=settings.RETRY_MAX_ATTEMPTS,
+            base_seconds=settings.RETRY_BASE_SECONDS,
+            max_seconds=settings.RETRY_MAX_SECONDS,
+        )
+        # Com vários workers em polling, cada chave é processada por quem tem o lease
+        self.leases = leases
+        self._stats_published_at: Optional[float] = None
 
     async def process_one_file(self, file_key: str):
+        # Span por arquivo: get/clean/embed/put como filhos e link para a ingestão
+        with tracer.start_as_current_span(
+            "processing.process_one_file", attributes={"aws.s3.key": file_key}
+        ):
+            prepared = await self._load_and_clean(file_key)
+            if prepared is None:
+                return
+            article_data, cleaned_summary = prepared
+
+            # 3. Embedding (CPU Bound & Heavy - Transformers bloqueia fortemente o loop)
+            # Importante: asyncio.to_thread roda em thread separada, liberando o loop do FastAPI
+            with EMBED_SECONDS.time():
+                embedding = await asyncio.to_thread(
+                    self.embedder.generate_embedding, cleaned_summary
+                )
+            EMBED_BATCH_SIZE.observe(1)
+
+            await self._save(article_data, cleaned_summary, embedding)
+
+    async def process_keys(self, file_keys: List[str], limit: int) -> BatchResult:
+        """
+        Modo polling: processa até `limit` chaves fora de back-off.
+
+        Falhas são isoladas por arquivo: o lote continua, a chave entra em
+        back-off exponencial e, esgotado o orçamento, vai para o dead-letter.
+
+        Com `leases`, só as chaves cujo lease este worker obteve são processadas
+        (as demais estão com outros workers). Os leases são renovados durante o
+        lote e liberados ao final; chaves que falharam mantêm o lease até o TTL,
+        então o back-off vale também para os outros workers.
+        """
+        with tracer.start_as_current_span(
+            "processing.process_keys",
+            attributes={
+                "processing.candidates": len(file_keys),
+                "processing.limit": limit,
+            },
+        ) as span:
+            result = await self._process_keys(file_keys, limit)
+            span.set_attribute("processing.processed", result.processed)
+            span.set_attribute("processing.failed", len(result.failed))
+        return result
+
+    async def _process_keys(self, file_keys: List[str], limit: int) -> BatchResult:
+        result = BatchResult()
+        due = self.retries.due(file_keys)
+        due_set = set(due)
+        result.deferred = [k for k in file_keys if k not in due_set]
+
+        if self.leases is None:
+            await self._process_each(due[:limit], result)
+        else:
+            leases = await self.leases.claim(due, limit)
+            async with self._renewing(leases) as held:
+                await self._process_each([lease.key for lease in leases], result)
+            failed = set(result.failed)
+            await self.leases.release(
+                [lease for lease in held.values() if lease.key not in failed]
+            )
+
+        await self._publish_stats(result)
+        return result
+
+    async def _process_each(self, file_keys: List[str], result: BatchResult) -> None:
+        for file_key in file_keys:
+            self._count_retry(file_key)
+            try:
+                await self.process_one_file(file_key)
+            except Exception as e:
+                await self._handle_failure(file_key, e, result)
+                continue
+            self.retries.clear(file_key)
+            result.processed += 1
+
+    @asynccontextmanager
+    async def _renewing(self, leases: List[Lease]) -> AsyncIterator[Dict[str, Lease]]:
+        """Renova os leases a cada LEASE_RENEW_SECONDS enquanto o bloco roda."""
+        held = {lease.key: lease for lease in leases}
+
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(settings.LEASE_RENEW_SECONDS)
+                try:
+                    renewed = await self.leases.renew(list(held.values()))
+                except Exception as e:
+                    logger.warning(f"Falha ao renovar leases: {e}")
+                    continue
+                # Perdidos (retomados por outro worker) saem do conjunto
+                held.clear()
+                held.update((lease.key, lease) for lease in renewed)
+
+        task = asyncio.create_task(heartbeat()) if held else None
+        try:
+            yield held
+        finally:
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+
+    async def process_files(self, file_keys: List[str]) -> BatchResult:
+        """
+        Processa vários arquivos com um único forward pass do modelo.
+
+        Usado pelo modo consumidor de eventos: leitura e limpeza por arquivo,
+        embedding em lote (amortiza o custo do Transformer) e persistência.
+        Falhas individuais não interrompem o lote (ver `process_keys`).
+        """
+        # Um span por lote: cada arquivo lido ganha um link para a sua ingestão
+        with tracer.start_as_current_span(
+            "processing.process_files", attributes={"processing.files": len(file_keys)}
+        ) as span:
+            result = await self._process_files(file_keys)
+            await self._publish_stats(result)
+            span.set_attribute("processing.processed", result.processed)
+            span.set_attribute("processing.failed", len(result.failed))
+        return result
+
+    async def _process_files(self, file_keys: List[str]) -> BatchResult:
+        result = BatchResult()
+        pending = []
+        for file_key in file_keys:
+            self._count_retry(file_key)
+            try:
+                prepared = await self._load_and_clean(file_key)
+            except Exception as e:
+                await self._handle_failure(file_key, e, result)
+                continue
+            if prepared is None:
+                self.retries.clear(file_key)
+                continue
+            pending.append((file_key, *prepared))
+
+        if not pending:
+            return result
+
+        try:
+            with EMBED_SECONDS.time():
+                embeddings = await asyncio.to_thread(
+                    self.embedder.generate_embeddings,
+                    [cleaned for _, _, cleaned in pending],
+                )
+        except Exception as e:
+            for file_key, _, _ in pending:
+                await self._handle_failure(file_key, e, result)
+            return result
+        EMBED_BATCH_SIZE.observe(len(pending))
+
+        for (file_key, article_data, cleaned_summary), embedding in zip(
+            pending, embeddings
+        ):
+            try:
+                await self._save(article_data, cleaned_summary, embedding)
+            except Exception as e:
+                await self._handle_failure(file_key, e, result)
+                continue
+            self.retries.clear(file_key)
+            result.processed += 1
+
+        return result
+
+    async def _publish_stats(self, result: BatchResult) -> None:
+        # Dead-letter tira artigos do Bronze: refaz o manifesto de lá (escrito
+        # pela Ingestão só ao fim de cada execução) para o Frontend não contá-los
+        if result.dead_lettered:
+            try:
+                await self.repo.update_bronze_stats()
+            except Exception as e:
+                logger.warning(
+                    f"Falha ao atualizar o manifesto de contagem do Bronze: {e}"
+                )
+
+        # Recontagem da Silver no máximo a cada STATS_REFRESH_SECONDS, e só
+        # quando o lote gravou algo; falha aqui não afeta o processamento
+        now = time.monotonic()
+        if not result.processed or (
+            self._stats_published_at is not None
+            and now - self._stats_published_at < settings.STATS_REFRESH_SECONDS
+        ):
+            return
+        self._stats_published_at = now
+        try:
+            await self.repo.update_silver_stats()
+        except Exception as e:
+            logger.warning(f"Falha ao atualizar o manifesto de contagem da Silver: {e}")
+
+    def _count_retry(self, file_key: str) -> None:
+        if self.retries.attempts(file_key):
+            PROCESSING_RETRIES.inc()
+
+    async def _handle_failure(
+        self, file_key: str, error: Exception, result: BatchResult
+    ) -> None:
+        PROCESSING_FAILURES.inc()
+        message = f"{type(error).__name__}: {error}"
+        attempts = self.retries.record_failure(file_key, message)
+
+        if not self.retries.exhausted(file_key):
+            delay = self.retries.delay_for(file_key)
+            logger.warning(
+                f"Falha ao processar {file_key} (tentativa {attempts}/"
+                f"{self.retries.max_attempts}). Nova tentativa em {delay:.0f}s: {message}"
+            )
+            result.failed.append(file_key)
+            return
+
+        try:
+            await self.repo.move_to_dead_letter(file_key, message, attempts)
+        except Exception as move_error:
+            logger.error(f"Falha ao mover {file_key} para o dead-letter: {move_error}")
+            result.failed.append(file_key)
+            return
+
+        self.retries.clear(file_key)
+        DEAD_LETTERED.inc()
+        logger.error(
+            f"Arquivo {file_key} movido para o dead-letter após {attempts} tentativas: {message}"
+        )
+        result.dead_lettered.append(file_key)
+
+    async def _load_and_clean(self, file_key: str) -> Optional[Tuple[dict, str]]:
         # 0. Check de Idempotência (Evita reprocessamento)
         article_id = file_key.replace(".json", "")  # ou extrair do conteúdo
         if await self.repo.exists_in_silver(article_id):
+            ARTICLES_SKIPPED.inc()
             logger.info(f"Artigo {article_id} já processado. Pulando.")
-            return
+            return None
 
         logger.info(f"Processando arquivo: {file_key}")
 
         # 1. Leitura Bronze
-        raw_data = await self.repo.get_raw_article(file_key)
+        with GET_SECONDS.time():
+            raw_data = await self.repo.get_raw_article(file_key)
+        # Início do relógio de freshness (scrape -> searchable) no trace
+        if "ingestion_timestamp" in raw_data:
+            trace.get_current_span().set_attribute(
+                "article.ingestion_timestamp", str(raw_data["ingestion_timestamp"])
+            )
         article_data = raw_data.get("article_data", {})
+        # Valida antes da inferência: arquivo malformado falha sem gastar o modelo
+        ArticleAttributes.model_validate(article_data)
 
         # 2. Limpeza (CPU Bound - não bloquear loop)
         raw_summary = article_data.get("summary", "")
-        cleaned_summary = await asyncio.to_thread(self.cleaner.clean_text, raw_summary)
-
-        # 3. Embedding (CPU Bound & Heavy - Transformers bloqueia fortemente o loop)
-        # Importante: asyncio.to_thread roda em thread separada, liberando o loop do FastAPI
-        embedding = await asyncio.to_thread(
-            self.embedder.generate_embedding, cleaned_summary
-        )
+        with CLEAN_SECONDS.time():
+            cleaned_summary = await asyncio.to_thread(
+                self.cleaner.clean_text, raw_summary
+            )
+        return article_data, cleaned_summary
 
+    async def _save(
+        self, article_data: dict, cleaned_summary: str, embedding: List[float]
+    ) -> None:
         # 4. Montagem Objeto Silver
         article_silver = ArticleAttributes(
-            **article_data, cleaned_summary=cleaned_summary, embedding=embedding
+            **article_data,
+            cleaned_summary=cleaned_summary,
+            embedding=embedding,
+            model_name=settings.MODEL_NAME,
+            cleaner_version=settings.CLEANER_VERSION,
         )
 
         # 5. Persistência Silver
-        await self.repo.save_processed_article(article_silver)
+        with PUT_SECONDS.time():
+            await self.repo.save_processed_article(article_silver)
+        ARTICLES_PROCESSED.inc()
         logger.info(f"Artigo {article_silver.id} salvo na Silver.")
 
 
@@ -54,6 +325,8 @@ if __name__ == "__main__":
     from app.infrastructure.s3_repository import S3Repository
     from app.infrastructure.regex_cleaner import RegexCleaner
     from app.infrastructure.bert_embedder import BERTEmbedder
+    from app.infrastructure.s3_lease_store import S3LeaseStore
+    from app.core.tracing import configure_tracing
 
     async def main():
         parser = argparse.ArgumentParser()
@@ -62,12 +335,17 @@ if __name__ == "__main__":
         )
         args = parser.parse_args()
 
-        service = ProcessingService(S3Repository(), RegexCleaner(), BERTEmbedder())
+        configure_tracing()
+        repo = S3Repository()
+        leases = S3LeaseStore(repo.s3) if settings.LEASES_ENABLED else None
+        service = ProcessingService(repo, RegexCleaner(), BERTEmbedder(), leases=leases)
         files = await service.repo.list_unprocessed_files()
 
         print(f"Starting batch processing of {min(args.limit, len(files))} files...")
-        for f in files[: args.limit]:
-            await service.process_one_file(f)
-        print("Done.")
+        result = await service.process_keys(files, limit=args.limit)
+        print(
+            f"Done. processed={result.processed} failed={len(result.failed)} "
+            f"dead_lettered={len(result.dead_lettered)}"
+        )
 
     asyncio.run(main())
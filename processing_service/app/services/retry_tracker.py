@@ -0,0 +1,61 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass
+class _Attempt:
+    count: int
+    next_attempt_at: float
+    last_error: str
+
+
+class RetryTracker:
+    """
+    Orçamento de tentativas por chave do Bronze com back-off exponencial.
+
+    Mantido em memória com escopo de aplicação: uma chave que falha só volta a
+    ser tentada após `base_seconds * 2^(n-1)` (limitado a `max_seconds`) e,
+    ao atingir `max_attempts`, deve ser movida para o dead-letter.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_seconds: float = 2.0,
+        max_seconds: float = 300.0,
+    ):
+        self.max_attempts = max_attempts
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self._attempts: Dict[str, _Attempt] = {}
+
+    def record_failure(self, key: str, error: str, now: Optional[float] = None) -> int:
+        now = time.monotonic() if now is None else now
+        count = self.attempts(key) + 1
+        delay = min(self.base_seconds * 2 ** (count - 1), self.max_seconds)
+        self._attempts[key] = _Attempt(count, now + delay, error)
+        return count
+
+    def clear(self, key: str) -> None:
+        self._attempts.pop(key, None)
+
+    def attempts(self, key: str) -> int:
+        attempt = self._attempts.get(key)
+        return attempt.count if attempt else 0
+
+    def exhausted(self, key: str) -> bool:
+        return self.attempts(key) >= self.max_attempts
+
+    def delay_for(self, key: str, now: Optional[float] = None) -> float:
+        """Segundos restantes até a próxima tentativa permitida (0 = já pode)."""
+        attempt = self._attempts.get(key)
+        if attempt is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(attempt.next_attempt_at - now, 0.0)
+
+    def due(self, keys: List[str], now: Optional[float] = None) -> List[str]:
+        """Filtra as chaves fora do período de back-off, preservando a ordem."""
+        now = time.monotonic() if now is None else now
+        return [k for k in keys if self.delay_for(k, now) == 0.0]
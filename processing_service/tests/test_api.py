@@ -0,0 +1,64 @@
+# tests/test_api.py
+import time
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+def wait_startup(client, attempts=100):
+    # O modelo carrega em background; aguarda o término do startup
+    for _ in range(attempts):
+        response = client.get("/ready")
+        if response.status_code == 200 or response.json()["error"]:
+            return response
+        time.sleep(0.01)
+    return response
+
+
+@patch("app.core.container.BERTEmbedder")
+@patch("app.core.container.RegexCleaner")
+@patch("app.core.container.S3Repository")
+def test_dependencies_built_once_and_shared(
+    mock_repo_cls, mock_cleaner_cls, mock_embedder_cls
+):
+    mock_repo = mock_repo_cls.return_value
+    mock_repo.list_unprocessed_files = AsyncMock(return_value=[])
+    mock_embedder_cls.return_value.generate_embedding = Mock(return_value=[0.0])
+
+    with TestClient(app) as client:
+        ready = wait_startup(client)
+        assert ready.status_code == 200
+        assert ready.json()["model_loaded"] is True
+
+        # Várias requisições reutilizam as mesmas instâncias
+        for _ in range(3):
+            assert client.post("/process_batch").status_code == 200
+
+    mock_repo_cls.assert_called_once()
+    mock_embedder_cls.assert_called_once()
+    # Warm-up executado no startup
+    mock_embedder_cls.return_value.generate_embedding.assert_called_once()
+
+
+@patch("app.core.container.BERTEmbedder", side_effect=OSError("model not found"))
+@patch("app.core.container.S3Repository")
+def test_readiness_reports_failed_model_load(mock_repo_cls, mock_embedder_cls):
+    with TestClient(app) as client:
+        ready = wait_startup(client)
+        assert ready.status_code == 503
+        assert "model not found" in ready.json()["error"]
+
+        assert client.get("/health").status_code == 200
+        assert client.post("/process_batch").status_code == 503
+
+
+@patch("app.core.container.BERTEmbedder")
+@patch("app.core.container.S3Repository")
+def test_metrics_endpoint_exposes_stage_histograms(mock_repo_cls, mock_embedder_cls):
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    for stage in ("get", "clean", "embed", "put"):
+        assert f'processing_stage_seconds_count{{stage="{stage}"}}' in response.text
+    assert "processing_http_requests_in_flight" in response.text
@@ -0,0 +1,115 @@
+# tests/test_backfill.py
+import json
+import pytest
+import boto3
+from unittest.mock import Mock, patch
+from moto import mock_aws
+from app.core.config import settings
+from app.domain.models import ArticleAttributes
+from app.infrastructure.s3_repository import S3Repository
+from app.services.backfill_service import BackfillService
+
+
+@pytest.fixture
+def s3_mock():
+    with mock_aws():
+        with patch.object(settings, "S3_ENDPOINT", None):
+            s3 = boto3.client("s3", region_name="us-east-1")
+            s3.create_bucket(Bucket=settings.S3_BUCKET_BRONZE)
+            s3.create_bucket(Bucket=settings.S3_BUCKET_SILVER)
+            yield s3
+
+
+def make_article(article_id, **versions):
+    return ArticleAttributes(
+        id=article_id,
+        title="T",
+        summary=f"Summary {article_id}",
+        cleaned_summary="old",
+        embedding=[0.0],
+        categories=["cs.AI"],
+        published="2024-01-01",
+        **versions,
+    )
+
+
+def make_embedder():
+    embedder = Mock()
+    embedder.generate_embeddings.side_effect = lambda texts: [[1.0] for _ in texts]
+    return embedder
+
+
+@pytest.mark.asyncio
+async def test_backfill_reembeds_only_stale_records(s3_mock):
+    repo = S3Repository()
+    current = {
+        "model_name": settings.MODEL_NAME,
+        "cleaner_version": settings.CLEANER_VERSION,
+    }
+    await repo.save_processed_article(make_article("a", **current))
+    await repo.save_processed_article(
+        make_article("b", **{**current, "model_name": "old-model"})
+    )
+    # Registro legado, sem metadata de versão
+    s3_mock.put_object(
+        Bucket=settings.S3_BUCKET_SILVER,
+        Key="c.json",
+        Body=make_article("c").model_dump_json(),
+    )
+
+    cleaner = Mock()
+    cleaner.clean_text.side_effect = lambda text: text.lower()
+    embedder = make_embedder()
+
+    stats = await BackfillService(repo, cleaner, embedder).run()
+
+    assert stats == {"scanned": 3, "reembedded": 2}
+    embedder.generate_embeddings.assert_called_once_with(["summary b", "summary c"])
+    for key in ("b.json", "c.json"):
+        article = await repo.get_processed_article(key)
+        assert article.embedding == [1.0]
+        assert article.model_name == settings.MODEL_NAME
+        assert await repo.get_silver_metadata(key) == {
+            "model-name": settings.MODEL_NAME,
+            "cleaner-version": settings.CLEANER_VERSION,
+        }
+    assert (await repo.get_processed_article("a.json")).embedding == [0.0]
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_from_checkpoint(s3_mock, tmp_path):
+    repo = S3Repository()
+    for article_id in ("a", "b", "c"):
+        await repo.save_processed_article(
+            make_article(article_id, model_name="old-model")
+        )
+    checkpoint = tmp_path / "backfill.json"
+
+    # Primeira execução falha no segundo lote (simula interrupção)
+    embedder = make_embedder()
+    embedder.generate_embeddings.side_effect = [[[1.0]], RuntimeError("OOM")]
+    service = BackfillService(
+        repo,
+        Mock(clean_text=str),
+        embedder,
+        checkpoint_path=str(checkpoint),
+        page_size=1,
+    )
+    with pytest.raises(RuntimeError):
+        await service.run()
+    assert json.loads(checkpoint.read_text())["start_after"] == "a.json"
+
+    # Retomada processa apenas o que faltou e remove o checkpoint ao concluir
+    embedder = make_embedder()
+    service = BackfillService(
+        repo,
+        Mock(clean_text=str),
+        embedder,
+        checkpoint_path=str(checkpoint),
+        page_size=1,
+    )
+    stats = await service.run()
+
+    assert stats == {"scanned": 3, "reembedded": 3}
+    assert embedder.generate_embeddings.call_count == 2
+    assert not checkpoint.exists()
@@ -0,0 +1,111 @@
+# tests/test_events.py
+import json
+import pytest
+import boto3
+from unittest.mock import AsyncMock, patch
+from moto import mock_aws
+from app.core.config import settings
+from app.domain.models import BatchResult, ObjectCreatedEvent
+from app.infrastructure.s3_events import parse_object_created_events
+from app.infrastructure.memory_event_queue import InMemoryEventQueue
+from app.infrastructure.sqs_event_source import SQSEventSource
+from app.services.event_consumer import EventConsumer
+
+
+def make_notification(*keys, bucket=None, event_name="s3:ObjectCreated:Put"):
+    return {
+        "Records": [
+            {
+                "eventName": event_name,
+                "s3": {
+                    "bucket": {"name": bucket or settings.S3_BUCKET_BRONZE},
+                    "object": {"key": key},
+                },
+            }
+            for key in keys
+        ]
+    }
+
+
+def test_parse_filters_bucket_and_event_type():
+    payload = make_notification("2401.00001.json", "my+paper.json")
+    payload["Records"] += make_notification("x.json", bucket="other")["Records"]
+    payload["Records"] += make_notification(
+        "y.json", event_name="s3:ObjectRemoved:Delete"
+    )["Records"]
+
+    events = parse_object_created_events(payload, settings.S3_BUCKET_BRONZE)
+
+    # Chave URL-encoded é decodificada ('+' -> espaço)
+    assert [e.key for e in events] == ["2401.00001.json", "my paper.json"]
+
+
+def test_parse_ignores_dead_letter_fulltext_and_stats_objects():
+    payload = make_notification(
+        "2401.00001.json",
+        f"{settings.DEAD_LETTER_PREFIX}2401.00002.json",
+        f"{settings.FULLTEXT_PREFIX}2401.00001.pdf",
+        f"{settings.FULLTEXT_PREFIX}2401.00001.txt",
+        settings.STATS_KEY,
+    )
+
+    events = parse_object_created_events(payload, settings.S3_BUCKET_BRONZE)
+
+    assert [e.key for e in events] == ["2401.00001.json"]
+
+
+@pytest.mark.asyncio
+async def test_memory_queue_batches_up_to_max_events():
+    queue = InMemoryEventQueue()
+    queue.publish([ObjectCreatedEvent(key=f"{i}.json") for i in range(5)])
+
+    batch = await queue.receive(max_events=3, wait_seconds=0.05)
+    assert [e.key for e in batch] == ["0.json", "1.json", "2.json"]
+
+    batch = await queue.receive(max_events=3, wait_seconds=0.05)
+    assert len(batch) == 2
+
+    assert await queue.receive(max_events=3, wait_seconds=0.01) == []
+
+
+@pytest.mark.asyncio
+async def test_consumer_dedups_keys_and_acks_after_processing():
+    queue = InMemoryEventQueue()
+    queue.publish([ObjectCreatedEvent(key=k) for k in ["a.json", "b.json", "a.json"]])
+    service = AsyncMock()
+    service.process_files.return_value = BatchResult(processed=2)
+
+    consumer = EventConsumer(service, queue, batch_size=10, batch_wait_seconds=0.01)
+    assert await consumer.run_once() == 2
+
+    service.process_files.assert_awaited_once_with(["a.json", "b.json"])
+
+
+@pytest.mark.asyncio
+async def test_sqs_source_receives_and_deletes_messages():
+    with mock_aws(), patch.object(settings, "SQS_ENDPOINT", None):
+        sqs = boto3.client("sqs", region_name="us-east-1")
+        queue_url = sqs.create_queue(QueueName="bronze-events")["QueueUrl"]
+        sqs.send_message(
+            QueueUrl=queue_url,
+            MessageBody=json.dumps(make_notification("1.json", "2.json")),
+        )
+        # Mensagem de teste enviada pelo S3 ao configurar a notificação
+        sqs.send_message(QueueUrl=queue_url, MessageBody='{"Event": "s3:TestEvent"}')
+
+        with patch.object(settings, "SQS_QUEUE_URL", queue_url):
+            source = SQSEventSource()
+            events = await source.receive(max_events=10, wait_seconds=0)
+            assert sorted(e.key for e in events) == ["1.json", "2.json"]
+
+            await source.ack(events)
+
+        attrs = sqs.get_queue_attributes(
+            QueueUrl=queue_url,
+            AttributeNames=[
+                "ApproximateNumberOfMessages",
+                "ApproximateNumberOfMessagesNotVisible",
+            ],
+        )["Attributes"]
+        assert attrs["ApproximateNumberOfMessages"] == "0"
+        assert attrs["ApproximateNumberOfMessagesNotVisible"] == "0"
@@ -0,0 +1,140 @@
+# tests/test_leases.py
+import asyncio
+import json
+import threading
+import pytest
+import boto3
+from unittest.mock import Mock, patch
+from moto import mock_aws
+from app.core.config import settings
+from app.infrastructure.s3_lease_store import S3LeaseStore
+from app.infrastructure.s3_repository import S3Repository
+from app.services.processor_service import ProcessingService
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def s3_mock():
+    with mock_aws():
+        with patch.object(settings, "S3_ENDPOINT", None):
+            s3 = boto3.client("s3", region_name="us-east-1")
+            s3.create_bucket(Bucket=settings.S3_BUCKET_BRONZE)
+            s3.create_bucket(Bucket=settings.S3_BUCKET_SILVER)
+            yield s3
+
+
+def store(s3, owner, clock):
+    return S3LeaseStore(s3, ttl_seconds=60, owner=owner, clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_claim_is_exclusive_between_workers(s3_mock):
+    clock = Clock()
+    a, b = store(s3_mock, "a", clock), store(s3_mock, "b", clock)
+    keys = [f"{i}.json" for i in range(10)]
+
+    claimed_a = await a.claim(keys, limit=6)
+    claimed_b = await b.claim(keys, limit=6)
+
+    keys_a = {lease.key for lease in claimed_a}
+    keys_b = {lease.key for lease in claimed_b}
+    assert len(keys_a) == 6 and len(keys_b) == 4
+    assert not keys_a & keys_b
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed_and_old_owner_loses_renewal(s3_mock):
+    clock = Clock()
+    crashed, survivor = store(s3_mock, "crashed", clock), store(s3_mock, "ok", clock)
+    [lease] = await crashed.claim(["1.json"], limit=1)
+
+    assert await survivor.claim(["1.json"], limit=1) == []
+    clock.now += 61
+    [reclaimed] = await survivor.claim(["1.json"], limit=1)
+
+    assert reclaimed.owner == "ok"
+    assert await crashed.renew([lease]) == []
+    assert len(await survivor.renew([reclaimed])) == 1
+    body = s3_mock.get_object(Bucket=settings.S3_BUCKET_BRONZE, Key="_leases/1.json")
+    assert json.loads(body["Body"].read())["owner"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_release_of_lost_lease_keeps_the_new_owners_lease(s3_mock):
+    clock = Clock()
+    slow, other = store(s3_mock, "slow", clock), store(s3_mock, "other", clock)
+    [lost] = await slow.claim(["1.json"], limit=1)
+    clock.now += 61
+    [current] = await other.claim(["1.json"], limit=1)
+
+    await slow.release([lost])
+
+    # Sem o DELETE condicional, um terceiro worker pegaria a chave aqui
+    assert await store(s3_mock, "third", clock).claim(["1.json"], limit=1) == []
+    await other.release([current])
+    listed = s3_mock.list_objects_v2(Bucket=settings.S3_BUCKET_BRONZE)
+    assert "Contents" not in listed
+
+
+@pytest.mark.asyncio
+async def test_workers_split_bronze_without_duplicated_inference(s3_mock):
+    for i in range(12):
+        article = {
+            "id": str(i),
+            "title": f"Paper {i}",
+            "summary": f"Summary {i}",
+            "categories": ["cs.AI"],
+            "published": "2024-01-01",
+        }
+        s3_mock.put_object(
+            Bucket=settings.S3_BUCKET_BRONZE,
+            Key=f"{i}.json",
+            Body=json.dumps({"article_data": article}),
+        )
+
+    clock = Clock()
+    embedded = []
+    # O S3 aplica a escrita condicional atomicamente; o moto não, entre threads
+    put_lock = threading.Lock()
+
+    def worker(name):
+        repo = S3Repository()
+        put_object = repo.s3.put_object
+
+        def atomic_put(**kwargs):
+            with put_lock:
+                return put_object(**kwargs)
+
+        repo.s3.put_object = atomic_put
+        embedder = Mock()
+        embedder.generate_embedding.side_effect = lambda text: (
+            embedded.append(text) or [0.1, 0.2]
+        )
+        cleaner = Mock()
+        cleaner.clean_text.side_effect = lambda text: text
+        return ProcessingService(
+            repo, cleaner, embedder, leases=store(repo.s3, name, clock)
+        )
+
+    workers = [worker("w1"), worker("w2"), worker("w3")]
+    # Rodadas como o loop do RUN_ON_STARTUP: todos listam o mesmo Bronze
+    for _ in range(5):
+        keys = await workers[0].repo.list_unprocessed_files()
+        if not keys:
+            break
+        await asyncio.gather(*(w.process_keys(keys, limit=4) for w in workers))
+
+    # Cada artigo passou pelo modelo exatamente uma vez
+    assert sorted(embedded) == sorted(f"Summary {i}" for i in range(12))
+    # Leases liberados (e ignorados na listagem do Bronze)
+    leases = s3_mock.list_objects_v2(
+        Bucket=settings.S3_BUCKET_BRONZE, Prefix=settings.LEASE_PREFIX
+    )
+    assert leases.get("KeyCount", 0) == 0
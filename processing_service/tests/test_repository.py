@@ -30,3 +30,74 @@ async def test_repo_exists_silver(s3_mock):
     # Cria arquivo fake na silver e verifica
     s3_mock.put_object(Bucket=settings.S3_BUCKET_SILVER, Key="exist.json", Body="{}")
     assert await repo.exists_in_silver("exist") == True
+
+
+@pytest.mark.asyncio
+async def test_update_silver_stats_writes_paginated_count(s3_mock):
+    import json
+
+    for i in range(3):
+        s3_mock.put_object(Bucket=settings.S3_BUCKET_SILVER, Key=f"{i}.json", Body="{}")
+    repo = S3Repository()
+
+    assert await repo.update_silver_stats() == 3
+    # Recontagem não inclui o próprio manifesto
+    assert await repo.update_silver_stats() == 3
+    body = s3_mock.get_object(Bucket=settings.S3_BUCKET_SILVER, Key=settings.STATS_KEY)
+    manifest = json.loads(body["Body"].read())
+    assert manifest["count"] == 3 and manifest["writer"] == "processing"
+    assert settings.STATS_KEY not in await repo.list_silver_page(None)
+
+
+@pytest.mark.asyncio
+async def test_reads_legacy_json_and_msgpack_bronze(s3_mock):
+    import json
+    import msgpack
+
+    article = {"id": "1", "title": "Física", "summary": "S", "categories": ["cs.AI"]}
+    s3_mock.put_object(
+        Bucket=settings.S3_BUCKET_BRONZE,
+        Key="legacy.json",
+        Body=json.dumps({"article_data": article}, ensure_ascii=False, indent=2),
+        ContentType="application/json",
+    )
+    s3_mock.put_object(
+        Bucket=settings.S3_BUCKET_BRONZE,
+        Key="binary.json",
+        Body=msgpack.packb({"article_data": article}),
+        ContentType="application/vnd.msgpack",
+    )
+    repo = S3Repository()
+
+    assert (await repo.get_raw_article("legacy.json"))["article_data"] == article
+    assert (await repo.get_raw_article("binary.json"))["article_data"] == article
+
+
+@pytest.mark.asyncio
+async def test_msgpack_silver_stores_float32_embedding(s3_mock):
+    import numpy as np
+    from app.domain.models import ArticleAttributes
+
+    vector = np.random.default_rng(0).random(384, dtype=np.float32)
+    article = ArticleAttributes(
+        id="1",
+        title="Paper",
+        summary="Summary",
+        embedding=vector.tolist(),
+        categories=["cs.AI"],
+        published="2024-01-01T00:00:00",
+    )
+    with patch.object(settings, "SERIALIZATION_FORMAT", "json"):
+        await S3Repository().save_processed_article(article)
+    json_size = s3_mock.head_object(Bucket=settings.S3_BUCKET_SILVER, Key="1.json")[
+        "ContentLength"
+    ]
+    with patch.object(settings, "SERIALIZATION_FORMAT", "msgpack"):
+        repo = S3Repository()
+        await repo.save_processed_article(article)
+
+    head = s3_mock.head_object(Bucket=settings.S3_BUCKET_SILVER, Key="1.json")
+    assert head["ContentType"] == "application/vnd.msgpack"
+    # 4 bytes por dimensão contra ~20 caracteres por float em JSON
+    assert head["ContentLength"] < json_size / 3
+    assert await repo.get_processed_article("1.json") == article
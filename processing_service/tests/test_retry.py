@@ -0,0 +1,130 @@
+# tests/test_retry.py
+import pytest
+import boto3
+from unittest.mock import AsyncMock, Mock, patch
+from moto import mock_aws
+from app.core.config import settings
+from app.domain.models import BatchResult, ObjectCreatedEvent
+from app.infrastructure.s3_repository import S3Repository
+from app.services.event_consumer import EventConsumer
+from app.services.processor_service import ProcessingService
+from app.services.retry_tracker import RetryTracker
+
+VALID = {
+    "id": "ok",
+    "title": "Test",
+    "summary": "Raw summary",
+    "categories": ["cs.AI"],
+    "published": "2024-01-01",
+}
+
+
+def test_retry_tracker_exponential_backoff():
+    tracker = RetryTracker(max_attempts=3, base_seconds=2, max_seconds=5)
+
+    assert tracker.record_failure("k", "boom", now=0) == 1
+    assert tracker.delay_for("k", now=0) == 2
+    assert tracker.due(["k", "other"], now=1) == ["other"]
+
+    tracker.record_failure("k", "boom", now=2)
+    assert tracker.delay_for("k", now=2) == 4
+    tracker.record_failure("k", "boom", now=6)
+    # Limitado a max_seconds
+    assert tracker.delay_for("k", now=6) == 5
+    assert tracker.exhausted("k")
+
+    tracker.clear("k")
+    assert tracker.due(["k"], now=6) == ["k"]
+
+
+@pytest.mark.asyncio
+async def test_poison_file_does_not_stall_batch_and_is_dead_lettered():
+    mock_repo = AsyncMock()
+    mock_repo.exists_in_silver.return_value = False
+    # "bad.json" não tem campos obrigatórios -> falha de validação
+    mock_repo.get_raw_article.side_effect = lambda key: {
+        "article_data": VALID if key == "ok.json" else {"id": "bad"}
+    }
+    mock_cleaner = Mock()
+    mock_cleaner.clean_text.return_value = "cleaned"
+    mock_embedder = Mock()
+    mock_embedder.generate_embedding.return_value = [0.1]
+
+    retries = RetryTracker(max_attempts=2, base_seconds=0)
+    service = ProcessingService(mock_repo, mock_cleaner, mock_embedder, retries)
+
+    result = await service.process_keys(["bad.json", "ok.json"], limit=10)
+    assert result.processed == 1
+    assert result.failed == ["bad.json"]
+    # Validação falha antes da inferência
+    mock_embedder.generate_embedding.assert_called_once_with("cleaned")
+
+    mock_repo.update_bronze_stats.assert_not_awaited()
+    result = await service.process_keys(["bad.json"], limit=10)
+    assert result.dead_lettered == ["bad.json"]
+    mock_repo.move_to_dead_letter.assert_awaited_once()
+    # O artigo saiu do Bronze: o manifesto de contagem de lá é refeito
+    mock_repo.update_bronze_stats.assert_awaited_once()
+    key, error, attempts = mock_repo.move_to_dead_letter.call_args.args
+    assert key == "bad.json" and attempts == 2
+    assert "ValidationError" in error
+
+
+@pytest.mark.asyncio
+async def test_keys_in_backoff_do_not_take_batch_slots():
+    mock_repo = AsyncMock()
+    mock_repo.exists_in_silver.return_value = True
+    retries = RetryTracker(base_seconds=60)
+    retries.record_failure("bad.json", "boom")
+    service = ProcessingService(mock_repo, Mock(), Mock(), retries)
+
+    result = await service.process_keys(["bad.json", "1.json"], limit=1)
+
+    assert result.deferred == ["bad.json"]
+    assert result.processed == 1
+    mock_repo.get_raw_article.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_consumer_schedules_failed_events_for_retry():
+    source = AsyncMock()
+    source.receive.return_value = [
+        ObjectCreatedEvent(key="ok.json", receipt="r1"),
+        ObjectCreatedEvent(key="bad.json", receipt="r2"),
+    ]
+    service = AsyncMock()
+    service.process_files.return_value = BatchResult(processed=1, failed=["bad.json"])
+    service.retries = RetryTracker(base_seconds=8)
+    service.retries.record_failure("bad.json", "boom")
+
+    await EventConsumer(service, source).run_once()
+
+    acked = source.ack.call_args.args[0]
+    retried, delay = source.retry_later.call_args.args
+    assert [e.key for e in acked] == ["ok.json"]
+    assert [e.key for e in retried] == ["bad.json"]
+    assert 0 < delay <= 8
+
+
+@pytest.mark.asyncio
+async def test_repository_moves_object_to_dead_letter_prefix():
+    with mock_aws(), patch.object(settings, "S3_ENDPOINT", None):
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=settings.S3_BUCKET_BRONZE)
+        s3.create_bucket(Bucket=settings.S3_BUCKET_SILVER)
+        s3.put_object(Bucket=settings.S3_BUCKET_BRONZE, Key="bad.json", Body=b"{oops")
+
+        repo = S3Repository()
+        await repo.move_to_dead_letter("bad.json", "JSONDecodeError: inválido", 5)
+
+        dead_key = f"{settings.DEAD_LETTER_PREFIX}bad.json"
+        head = s3.head_object(Bucket=settings.S3_BUCKET_BRONZE, Key=dead_key)
+        assert head["Metadata"] == {
+            "error": "JSONDecodeError: inv?lido",
+            "attempts": "5",
+        }
+        body = s3.get_object(Bucket=settings.S3_BUCKET_BRONZE, Key=dead_key)["Body"]
+        assert body.read() == b"{oops"
+        # Fora do Bronze ativo, da listagem de pendentes e da contagem
+        assert await repo.list_unprocessed_files() == []
+        assert await repo.update_bronze_stats() == 0
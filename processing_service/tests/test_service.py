@@ -41,3 +41,92 @@ async def test_processing_service_flow():
     saved_article = mock_repo.save_processed_article.call_args[0][0]
     assert saved_article.cleaned_summary == "cleaned summary"
     assert saved_article.embedding == [0.1, 0.2]
+
+
+@pytest.mark.asyncio
+async def test_process_files_embeds_in_single_batch():
+    mock_repo = AsyncMock()
+    mock_cleaner = Mock()
+    mock_embedder = Mock()
+
+    # "2" já está na Silver e deve ser ignorado
+    mock_repo.exists_in_silver.side_effect = lambda article_id: article_id == "2"
+    mock_repo.get_raw_article.side_effect = lambda key: {
+        "article_data": {
+            "id": key.replace(".json", ""),
+            "title": "Test",
+            "summary": f"Summary {key}",
+            "categories": ["cs.AI"],
+            "published": "2024-01-01",
+        }
+    }
+    mock_cleaner.clean_text.side_effect = lambda text: text.lower()
+    mock_embedder.generate_embeddings.return_value = [[0.1], [0.3]]
+
+    service = ProcessingService(mock_repo, mock_cleaner, mock_embedder)
+    result = await service.process_files(["1.json", "2.json", "3.json"])
+
+    assert result.processed == 2
+    mock_embedder.generate_embeddings.assert_called_once_with(
+        ["summary 1.json", "summary 3.json"]
+    )
+    saved = [c.args[0] for c in mock_repo.save_processed_article.call_args_list]
+    assert [(a.id, a.embedding) for a in saved] == [("1", [0.1]), ("3", [0.3])]
+
+
+@pytest.mark.asyncio
+async def test_process_one_file_records_stage_metrics():
+    from prometheus_client import REGISTRY
+
+    def count(stage):
+        return (
+            REGISTRY.get_sample_value(
+                "processing_stage_seconds_count", {"stage": stage}
+            )
+            or 0.0
+        )
+
+    mock_repo = AsyncMock()
+    mock_repo.exists_in_silver.return_value = False
+    mock_repo.get_raw_article.return_value = {
+        "article_data": {
+            "id": "m1",
+            "title": "Test",
+            "summary": "Raw",
+            "categories": ["cs.AI"],
+            "published": "2024-01-01",
+        }
+    }
+    mock_cleaner = Mock()
+    mock_cleaner.clean_text.return_value = "raw"
+    mock_embedder = Mock()
+    mock_embedder.generate_embedding.return_value = [0.1]
+
+    before = {s: count(s) for s in ("get", "clean", "embed", "put")}
+    service = ProcessingService(mock_repo, mock_cleaner, mock_embedder)
+    await service.process_one_file("m1.json")
+
+    assert all(count(s) == before[s] + 1 for s in before)
+
+
+@pytest.mark.asyncio
+async def test_silver_stats_are_published_at_most_once_per_interval():
+    mock_repo = AsyncMock()
+    mock_repo.exists_in_silver.return_value = False
+    mock_repo.get_raw_article.return_value = {
+        "article_data": {
+            "id": "1",
+            "title": "T",
+            "summary": "S",
+            "categories": ["cs.AI"],
+            "published": "2024-01-01",
+        }
+    }
+    mock_embedder = Mock()
+    mock_embedder.generate_embeddings.side_effect = lambda texts: [[0.1]] * len(texts)
+    service = ProcessingService(mock_repo, Mock(clean_text=str), mock_embedder)
+
+    await service.process_files(["1.json"])
+    await service.process_files(["1.json"])
+
+    mock_repo.update_silver_stats.assert_awaited_once()
@@ -0,0 +1,97 @@
+# tests/test_tracing.py
+import json
+import pytest
+import boto3
+from unittest.mock import Mock, patch
+from moto import mock_aws
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from app.core.config import settings
+from app.core.tracing import JsonLinesSpanExporter, build_exporter
+from app.infrastructure.s3_repository import S3Repository
+from app.services.processor_service import ProcessingService
+
+# traceparent gravado pela ingestão no metadata do objeto do Bronze
+INGEST_TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+INGEST_SPAN_ID = "b7ad6b7169203331"
+
+
+@pytest.fixture
+def spans():
+    # Provider local (o global só pode ser instalado uma vez por processo)
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer("test")
+    with patch("app.infrastructure.s3_repository.tracer", tracer), patch(
+        "app.services.processor_service.tracer", tracer
+    ):
+        yield exporter
+
+
+@pytest.fixture
+def s3_mock():
+    with mock_aws():
+        with patch.object(settings, "S3_ENDPOINT", None):
+            s3 = boto3.client("s3", region_name="us-east-1")
+            s3.create_bucket(Bucket=settings.S3_BUCKET_BRONZE)
+            s3.create_bucket(Bucket=settings.S3_BUCKET_SILVER)
+            yield s3
+
+
+@pytest.mark.asyncio
+async def test_processing_span_links_back_to_ingestion(s3_mock, spans):
+    article = {
+        "id": "1",
+        "title": "Paper",
+        "summary": "Summary",
+        "categories": ["cs.AI"],
+        "published": "2024-01-01",
+    }
+    s3_mock.put_object(
+        Bucket=settings.S3_BUCKET_BRONZE,
+        Key="1.json",
+        Body=json.dumps({"article_data": article}),
+        Metadata={"traceparent": f"00-{INGEST_TRACE_ID}-{INGEST_SPAN_ID}-01"},
+    )
+    embedder = Mock()
+    embedder.generate_embedding.return_value = [0.1, 0.2]
+    cleaner = Mock()
+    cleaner.clean_text.side_effect = lambda text: text
+    service = ProcessingService(S3Repository(), cleaner, embedder)
+
+    await service.process_one_file("1.json")
+
+    by_name = {span.name: span for span in spans.get_finished_spans()}
+    root = by_name["processing.process_one_file"]
+    [link] = root.links
+    assert format(link.context.trace_id, "032x") == INGEST_TRACE_ID
+    assert format(link.context.span_id, "016x") == INGEST_SPAN_ID
+    # Chamadas ao S3 como filhas do span do arquivo
+    assert by_name["s3.put_object"].parent.span_id == root.context.span_id
+
+    # A Silver carrega o contexto do processamento, para o próximo elo
+    head = s3_mock.head_object(Bucket=settings.S3_BUCKET_SILVER, Key="1.json")
+    assert format(root.context.trace_id, "032x") in head["Metadata"]["traceparent"]
+
+
+def test_file_exporter_writes_one_json_span_per_line(tmp_path):
+    exporter = build_exporter("file", str(tmp_path / "traces-{pid}.jsonl"))
+    assert isinstance(exporter, JsonLinesSpanExporter)
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer("test")
+
+    with tracer.start_as_current_span("a"):
+        with tracer.start_as_current_span("b"):
+            pass
+
+    [path] = tmp_path.iterdir()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["b", "a"]
+    assert build_exporter("none", "unused") is None
+    with pytest.raises(ValueError):
+        build_exporter("jaeger", "unused")